@@ -0,0 +1,104 @@
+"""partition asset_check_history by check_date (PostgreSQL only)
+
+Revision ID: 7a3f1c9e2b4d
+Revises: 69c4e900891b
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3f1c9e2b4d'
+down_revision: Union[str, Sequence[str], None] = '69c4e900891b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Aylık partition'ların bugünden kaç ay ilerisi önceden oluşturulacak
+MONTHS_AHEAD = 3
+
+INDEXES = (
+    ('ix_asset_check_history_check_date', 'check_date'),
+    ('ix_asset_check_history_id', 'id'),
+    ('ix_asset_check_history_watchlist_item_id', 'watchlist_item_id'),
+)
+
+
+def _next_month(value: date) -> date:
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # SQLite declarative partitioning desteklemiyor
+        return
+
+    for index_name, _ in INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {index_name}')
+    op.execute('ALTER TABLE asset_check_history RENAME TO asset_check_history_old')
+    op.execute('ALTER TABLE asset_check_history_old RENAME CONSTRAINT asset_check_history_pkey TO asset_check_history_old_pkey')
+
+    # Partition key primary key'in parçası olmak zorunda: PK (id, check_date)
+    op.execute(
+        'CREATE TABLE asset_check_history '
+        '(LIKE asset_check_history_old INCLUDING DEFAULTS) '
+        'PARTITION BY RANGE (check_date)'
+    )
+    op.execute('ALTER TABLE asset_check_history ADD CONSTRAINT asset_check_history_pkey PRIMARY KEY (id, check_date)')
+    op.execute(
+        'ALTER TABLE asset_check_history ADD CONSTRAINT asset_check_history_watchlist_item_id_fkey '
+        'FOREIGN KEY (watchlist_item_id) REFERENCES asset_watchlist_items (id)'
+    )
+    for index_name, column in INDEXES:
+        op.execute(f'CREATE INDEX {index_name} ON asset_check_history ({column})')
+
+    # Mevcut verinin en eski ayından itibaren MONTHS_AHEAD ay sonrasına kadar aylık partition'lar
+    today = datetime.now(timezone.utc).date()
+    oldest = bind.execute(sa.text('SELECT min(check_date) FROM asset_check_history_old')).scalar()
+    month = date((oldest or today).year, (oldest or today).month, 1)
+    last = date(today.year, today.month, 1)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        end = _next_month(month)
+        op.execute(
+            f'CREATE TABLE asset_check_history_{month.year:04d}_{month.month:02d} '
+            f'PARTITION OF asset_check_history '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    op.execute('CREATE TABLE asset_check_history_default PARTITION OF asset_check_history DEFAULT')
+
+    op.execute('INSERT INTO asset_check_history SELECT * FROM asset_check_history_old')
+    op.execute('DROP TABLE asset_check_history_old')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute(
+        'CREATE TABLE asset_check_history_plain '
+        '(LIKE asset_check_history INCLUDING DEFAULTS)'
+    )
+    op.execute('INSERT INTO asset_check_history_plain SELECT * FROM asset_check_history')
+    # Partition'lar parent ile birlikte düşer
+    op.execute('DROP TABLE asset_check_history CASCADE')
+    op.execute('ALTER TABLE asset_check_history_plain RENAME TO asset_check_history')
+    op.execute('ALTER TABLE asset_check_history ADD CONSTRAINT asset_check_history_pkey PRIMARY KEY (id)')
+    op.execute(
+        'ALTER TABLE asset_check_history ADD CONSTRAINT asset_check_history_watchlist_item_id_fkey '
+        'FOREIGN KEY (watchlist_item_id) REFERENCES asset_watchlist_items (id)'
+    )
+    for index_name, column in INDEXES:
+        op.execute(f'CREATE INDEX {index_name} ON asset_check_history ({column})')
@@ -0,0 +1,40 @@
+"""add (is_active, name) index on api_sources
+
+Revision ID: a2d5e8f1c604
+Revises: f1c7a2e9b305
+Create Date: 2026-10-16 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2d5e8f1c604'
+down_revision: Union[str, Sequence[str], None] = 'f1c7a2e9b305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('api_sources'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('api_sources')}
+    if 'ix_api_sources_active_name' not in existing:
+        op.create_index('ix_api_sources_active_name', 'api_sources', ['is_active', 'name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('api_sources'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('api_sources')}
+    if 'ix_api_sources_active_name' in existing:
+        op.drop_index('ix_api_sources_active_name', table_name='api_sources')
@@ -0,0 +1,51 @@
+"""add cve_cache lookup and expiry indexes
+
+Revision ID: b7e2c4f9d013
+Revises: a2d5e8f1c604
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4f9d013'
+down_revision: Union[str, Sequence[str], None] = 'a2d5e8f1c604'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('cve_cache'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('cve_cache')}
+    if 'ix_cve_cache_cve_id_cached_at' not in existing:
+        op.create_index('ix_cve_cache_cve_id_cached_at', 'cve_cache', ['cve_id', 'cached_at'], unique=False)
+    if 'ix_cve_cache_expires_at' not in existing:
+        op.create_index(
+            'ix_cve_cache_expires_at',
+            'cve_cache',
+            ['expires_at'],
+            unique=False,
+            postgresql_where=sa.text('expires_at IS NOT NULL'),
+            sqlite_where=sa.text('expires_at IS NOT NULL'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('cve_cache'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('cve_cache')}
+    if 'ix_cve_cache_expires_at' in existing:
+        op.drop_index('ix_cve_cache_expires_at', table_name='cve_cache')
+    if 'ix_cve_cache_cve_id_cached_at' in existing:
+        op.drop_index('ix_cve_cache_cve_id_cached_at', table_name='cve_cache')
@@ -0,0 +1,52 @@
+"""replace alerts.is_read index with partial unread index
+
+Revision ID: b81e4d2f6c3a
+Revises: 7a3f1c9e2b4d
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81e4d2f6c3a'
+down_revision: Union[str, Sequence[str], None] = '7a3f1c9e2b4d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alerts'):
+        # alerts tablosu uygulama açılışında create_all ile oluşturuluyor
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('alerts')}
+    if 'ix_alerts_is_read' in existing:
+        op.drop_index('ix_alerts_is_read', table_name='alerts')
+    if 'ix_alerts_user_unread_partial' not in existing:
+        op.create_index(
+            'ix_alerts_user_unread_partial',
+            'alerts',
+            ['user_id', 'created_at'],
+            unique=False,
+            postgresql_where=sa.text('is_read = false'),
+            sqlite_where=sa.text('is_read = 0'),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alerts'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('alerts')}
+    if 'ix_alerts_user_unread_partial' in existing:
+        op.drop_index('ix_alerts_user_unread_partial', table_name='alerts')
+    if 'ix_alerts_is_read' not in existing:
+        op.create_index('ix_alerts_is_read', 'alerts', ['is_read'], unique=False)
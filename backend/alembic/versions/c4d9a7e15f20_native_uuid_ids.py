@@ -0,0 +1,77 @@
+"""store uuid ids as native uuid columns (PostgreSQL only)
+
+Revision ID: c4d9a7e15f20
+Revises: b81e4d2f6c3a
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Dict, List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d9a7e15f20'
+down_revision: Union[str, Sequence[str], None] = 'b81e4d2f6c3a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# api_sources.id / api_keys.api_source_id UUID değil ("predefined-<name>"), String kalıyor
+UUID_COLUMNS: Dict[str, List[str]] = {
+    'users': ['id'],
+    'api_sources': ['created_by'],
+    'api_keys': ['id', 'user_id'],
+    'cve_cache': ['id'],
+    'ioc_queries': ['id', 'user_id'],
+    'threat_intelligence_data': ['id', 'ioc_query_id'],
+    'reports': ['id', 'user_id'],
+    'asset_watchlist': ['id', 'user_id'],
+    'asset_watchlist_items': ['id', 'watchlist_id'],
+    'asset_check_history': ['id', 'watchlist_item_id'],
+    'alerts': ['id', 'user_id', 'watchlist_id', 'asset_id'],
+}
+
+PRIMARY_KEY_TABLES = [table for table, columns in UUID_COLUMNS.items() if 'id' in columns]
+
+
+def _convert(target_type: str, server_default: str) -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = [table for table in UUID_COLUMNS if inspector.has_table(table)]
+
+    # Tip değişikliği sırasında FK'lar iki tarafın da aynı tipte olmasını ister: önce düşür, sonra geri ekle
+    foreign_keys = []
+    for table in tables:
+        for fk in inspector.get_foreign_keys(table):
+            if any(column in UUID_COLUMNS[table] for column in fk['constrained_columns']):
+                foreign_keys.append((table, fk))
+                op.drop_constraint(fk['name'], table, type_='foreignkey')
+
+    for table in tables:
+        for column in UUID_COLUMNS[table]:
+            if column == 'id':
+                op.execute(f'ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT')
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE {target_type} USING {column}::{target_type}')
+        if table in PRIMARY_KEY_TABLES and server_default:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN id SET DEFAULT {server_default}')
+
+    for table, fk in foreign_keys:
+        op.create_foreign_key(
+            fk['name'], table, fk['referred_table'], fk['constrained_columns'], fk['referred_columns']
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite'ta id'ler String olarak kalıyor
+        return
+    _convert('uuid', 'gen_random_uuid()')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    _convert('varchar', '')
@@ -0,0 +1,71 @@
+"""add cve_daily_stats and cve_cvss_hist materialized views (PostgreSQL only)
+
+Revision ID: c8f3a1d7e295
+Revises: b7e2c4f9d013
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f3a1d7e295'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c4f9d013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DAILY_STATS_SQL = """
+SELECT published_date AS day,
+       count(id) AS total,
+       count(id) FILTER (WHERE cvss_v3_severity = 'CRITICAL'
+                          OR (cvss_v3_severity IS NULL AND cvss_v2_severity = 'HIGH')) AS critical,
+       count(id) FILTER (WHERE cvss_v3_severity = 'HIGH'
+                          OR (cvss_v3_severity IS NULL AND cvss_v2_severity = 'MEDIUM')) AS high
+FROM cve_cache
+WHERE published_date IS NOT NULL
+GROUP BY published_date
+"""
+
+CVSS_HIST_SQL = """
+SELECT bucket, count(*) AS count
+FROM (
+    SELECT CASE
+        WHEN score >= 0.0 AND score <= 2.0 THEN 0
+        WHEN score >= 2.1 AND score <= 4.0 THEN 1
+        WHEN score >= 4.1 AND score <= 6.0 THEN 2
+        WHEN score >= 6.1 AND score <= 8.0 THEN 3
+        WHEN score >= 8.1 AND score <= 10.0 THEN 4
+    END AS bucket
+    FROM (SELECT coalesce(cvss_v3_score, cvss_v2_score) AS score FROM cve_cache) AS scores
+) AS buckets
+WHERE bucket IS NOT NULL
+GROUP BY bucket
+"""
+
+VIEWS = (
+    ('cve_daily_stats', DAILY_STATS_SQL, 'day'),
+    ('cve_cvss_hist', CVSS_HIST_SQL, 'bucket'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        # SQLite'ta dashboard aynı sayaçları cve_cache üzerinden anlık hesaplıyor
+        return
+
+    for name, query, key in VIEWS:
+        op.execute(f'CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS {query}')
+        # REFRESH ... CONCURRENTLY unique index ister
+        op.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS ix_{name}_{key} ON {name} ({key})')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for name, _, _ in VIEWS:
+        op.execute(f'DROP MATERIALIZED VIEW IF EXISTS {name}')
@@ -0,0 +1,47 @@
+"""add (user_id, severity) and (user_id, alert_type) indexes on alerts
+
+Revision ID: d3a8f2b6c917
+Revises: c4d9a7e15f20
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a8f2b6c917'
+down_revision: Union[str, Sequence[str], None] = 'c4d9a7e15f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_alerts_user_severity', ['user_id', 'severity']),
+    ('ix_alerts_user_alert_type', ['user_id', 'alert_type']),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alerts'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('alerts')}
+    for name, columns in INDEXES:
+        if name not in existing:
+            op.create_index(name, 'alerts', columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alerts'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('alerts')}
+    for name, _ in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='alerts')
@@ -0,0 +1,66 @@
+"""add composite and partial indexes for dashboard counters
+
+Revision ID: d9e4b2a6f318
+Revises: c8f3a1d7e295
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e4b2a6f318'
+down_revision: Union[str, Sequence[str], None] = 'c8f3a1d7e295'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index adı, tablo, kolonlar, ek create_index argümanları)
+INDEXES = (
+    (
+        'ix_ioc_queries_user_query_date',
+        'ioc_queries',
+        ['user_id', 'query_date'],
+        {'postgresql_include': ['risk_score', 'ioc_type']},
+    ),
+    (
+        'ix_asset_watchlist_items_active_watchlist',
+        'asset_watchlist_items',
+        ['watchlist_id', 'last_risk_score'],
+        {'postgresql_where': sa.text('is_active = true'), 'sqlite_where': sa.text('is_active = 1')},
+    ),
+    (
+        'ix_api_keys_user_active',
+        'api_keys',
+        ['user_id'],
+        {'postgresql_where': sa.text('is_active = true'), 'sqlite_where': sa.text('is_active = 1')},
+    ),
+    (
+        'ix_cve_cache_published_date',
+        'cve_cache',
+        ['published_date'],
+        {'postgresql_include': ['cvss_v3_severity', 'cvss_v2_severity']},
+    ),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns, options in INDEXES:
+        if not inspector.has_table(table):
+            continue
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns, unique=False, **options)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    for name, table, _, _ in INDEXES:
+        if not inspector.has_table(table):
+            continue
+        if name in {index['name'] for index in inspector.get_indexes(table)}:
+            op.drop_index(name, table_name=table)
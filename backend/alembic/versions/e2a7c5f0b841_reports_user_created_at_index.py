@@ -0,0 +1,40 @@
+"""add (user_id, created_at) index on reports
+
+Revision ID: e2a7c5f0b841
+Revises: d9e4b2a6f318
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c5f0b841'
+down_revision: Union[str, Sequence[str], None] = 'd9e4b2a6f318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('reports'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('reports')}
+    if 'ix_reports_user_created_at' not in existing:
+        op.create_index('ix_reports_user_created_at', 'reports', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('reports'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('reports')}
+    if 'ix_reports_user_created_at' in existing:
+        op.drop_index('ix_reports_user_created_at', table_name='reports')
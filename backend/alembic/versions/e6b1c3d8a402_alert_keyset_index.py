@@ -0,0 +1,40 @@
+"""add (user_id, created_at, id) index on alerts for keyset pagination
+
+Revision ID: e6b1c3d8a402
+Revises: d3a8f2b6c917
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b1c3d8a402'
+down_revision: Union[str, Sequence[str], None] = 'd3a8f2b6c917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alerts'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('alerts')}
+    if 'ix_alerts_user_created_id' not in existing:
+        op.create_index('ix_alerts_user_created_id', 'alerts', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alerts'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('alerts')}
+    if 'ix_alerts_user_created_id' in existing:
+        op.drop_index('ix_alerts_user_created_id', table_name='alerts')
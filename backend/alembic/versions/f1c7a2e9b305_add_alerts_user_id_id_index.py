@@ -0,0 +1,40 @@
+"""add (user_id, id) index on alerts for ownership checks
+
+Revision ID: f1c7a2e9b305
+Revises: e6b1c3d8a402
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7a2e9b305'
+down_revision: Union[str, Sequence[str], None] = 'e6b1c3d8a402'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alerts'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('alerts')}
+    if 'ix_alerts_user_id_id' not in existing:
+        op.create_index('ix_alerts_user_id_id', 'alerts', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('alerts'):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes('alerts')}
+    if 'ix_alerts_user_id_id' in existing:
+        op.drop_index('ix_alerts_user_id_id', table_name='alerts')
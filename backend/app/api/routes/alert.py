@@ -3,6 +3,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.api.routes.auth import get_current_user
@@ -16,6 +17,7 @@ from app.schemas.alert import (
     AlertUpdate,
 )
 from app.schemas.auth import UserResponse
+from app.schemas.types import UUIDStr
 from app.services.alert_service import AlertService
 
 router = APIRouter(prefix="/alerts", tags=["alerts"])
@@ -33,19 +35,28 @@ def list_alerts(
     is_read: Optional[bool] = Query(None, description="Filter by read status"),
     alert_type: Optional[AlertType] = Query(None, description="Filter by alert type"),
     severity: Optional[AlertSeverity] = Query(None, description="Filter by severity"),
-    page: int = Query(1, ge=1, description="Sayfa numarası"),
+    page: int = Query(1, ge=1, description="Sayfa numarası (deprecated: cursor kullanın)"),
     page_size: int = Query(20, ge=1, le=100, description="Sayfa başına kayıt sayısı"),
-) -> AlertListResponse:
+    cursor: Optional[str] = Query(None, description="Önceki yanıttaki next_cursor"),
+    include_total: bool = Query(False, description="Toplam kayıt/sayfa sayısını da hesapla (ek COUNT sorgusu)"),
+) -> ORJSONResponse:
     """List alerts for the current user."""
     alert_service = AlertService(db)
-    return alert_service.list_alerts(
-        user_id=current_user.id,
-        is_read=is_read,
-        alert_type=alert_type,
-        severity=severity,
-        page=page,
-        page_size=page_size,
-    )
+    try:
+        page_data = alert_service.list_alerts_raw(
+            user_id=current_user.id,
+            is_read=is_read,
+            alert_type=alert_type,
+            severity=severity,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    # response_model sadece dokümantasyon için; satırlar pydantic'ten geçmeden serialize edilir
+    return ORJSONResponse(page_data)
 
 
 @router.get(
@@ -70,7 +81,7 @@ def get_alert_stats(
     summary="Alert detayı",
 )
 def get_alert(
-    alert_id: str,
+    alert_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> AlertResponse:
@@ -89,7 +100,7 @@ def get_alert(
     summary="Alert güncelle",
 )
 def update_alert(
-    alert_id: str,
+    alert_id: UUIDStr,
     alert_data: AlertUpdate,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
@@ -109,7 +120,7 @@ def update_alert(
     summary="Alert'i okundu olarak işaretle",
 )
 def mark_alert_as_read(
-    alert_id: str,
+    alert_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> AlertResponse:
@@ -128,7 +139,7 @@ def mark_alert_as_read(
     summary="Alert'i okunmadı olarak işaretle",
 )
 def mark_alert_as_unread(
-    alert_id: str,
+    alert_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> AlertResponse:
@@ -161,7 +172,7 @@ def mark_all_alerts_as_read(
     summary="Alert sil",
 )
 def delete_alert(
-    alert_id: str,
+    alert_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> None:
@@ -1,13 +1,17 @@
 """API Key management endpoints."""
 
-from typing import List
+from datetime import datetime, timezone
+from typing import Iterator, List
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.routes.auth import get_current_user
 from app.core.dependencies import require_role
-from app.db.base import get_db
+from app.db.base import SessionLocal, get_db
+from app.models.api_source import APIKey, UpdateMode
 from app.models.user import UserRole
 from app.schemas.api_key import (
     APIKeyCreate,
@@ -19,6 +23,7 @@ from app.schemas.api_key import (
     APIKeyUpdateNowResponse,
 )
 from app.schemas.auth import UserResponse
+from app.schemas.types import UUIDStr
 from app.services.api_key_service import APIKeyService
 
 router = APIRouter(prefix="/api-keys", tags=["api-keys"])
@@ -32,7 +37,7 @@ async def list_api_keys(
     """List all API keys (user's own keys, or all if admin)."""
     service = APIKeyService(db)
     api_keys = service.list_api_keys(current_user.id)
-    return [APIKeyResponse(**service.to_response(key)) for key in api_keys]
+    return [APIKeyResponse.from_orm_trusted(item) for item in service.to_responses(api_keys)]
 
 
 @router.post(
@@ -50,14 +55,14 @@ async def create_api_key(
     service = APIKeyService(db)
     try:
         api_key = service.create_api_key(current_user.id, api_key_data)
-        return APIKeyResponse(**service.to_response(api_key))
+        return APIKeyResponse.from_orm_trusted(service.to_response(api_key))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{api_key_id}", response_model=APIKeyResponse, summary="Get API key")
 async def get_api_key(
-    api_key_id: str,
+    api_key_id: UUIDStr,
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
     db: Session = Depends(get_db),
 ) -> APIKeyResponse:
@@ -71,7 +76,7 @@ async def get_api_key(
 
 @router.put("/{api_key_id}", response_model=APIKeyResponse, summary="Update API key")
 async def update_api_key(
-    api_key_id: str,
+    api_key_id: UUIDStr,
     api_key_data: APIKeyUpdate,
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
     db: Session = Depends(get_db),
@@ -91,7 +96,7 @@ async def update_api_key(
     summary="Delete API key",
 )
 async def delete_api_key(
-    api_key_id: str,
+    api_key_id: UUIDStr,
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
     db: Session = Depends(get_db),
 ) -> None:
@@ -108,7 +113,7 @@ async def delete_api_key(
     summary="Test API key",
 )
 async def test_api_key(
-    api_key_id: str,
+    api_key_id: UUIDStr,
     test_request: APIKeyTestRequest,
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
     db: Session = Depends(get_db),
@@ -124,7 +129,7 @@ async def test_api_key(
     summary="Update API key data now (manual update)",
 )
 async def update_api_key_now(
-    api_key_id: str,
+    api_key_id: UUIDStr,
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
     db: Session = Depends(get_db),
 ) -> APIKeyUpdateNowResponse:
@@ -140,8 +145,6 @@ async def update_api_key_now(
     # 3. Cache the results
     # 4. Update last_used timestamp
 
-    from datetime import datetime, timezone
-
     api_key.last_used = datetime.now(timezone.utc)
     db.commit()
 
@@ -152,64 +155,85 @@ async def update_api_key_now(
     )
 
 
+def _manual_keys(service: APIKeyService, user_id: str) -> List[APIKey]:
+    """Active API keys of the user that are in manual update mode."""
+    return [
+        key
+        for key in service.list_api_keys(user_id)
+        if key.update_mode == UpdateMode.MANUAL and key.is_active
+    ]
+
+
+def _update_manual_key(db: Session, api_key: APIKey) -> dict:
+    """Run the (placeholder) manual update for one key and return its result row."""
+    try:
+        api_key.last_used = datetime.now(timezone.utc)
+        db.commit()
+        return {
+            "api_key_id": api_key.id,
+            "api_source_id": api_key.api_source_id,
+            "success": True,
+            "message": "Update initiated",
+        }
+    except Exception as e:
+        return {
+            "api_key_id": api_key.id,
+            "api_source_id": api_key.api_source_id,
+            "success": False,
+            "error": str(e),
+        }
+
+
 @router.post(
     "/update-all",
     response_model=APIKeyUpdateAllResponse,
     summary="Update all manual mode API keys",
+    deprecated=True,
 )
 async def update_all_api_keys(
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
     db: Session = Depends(get_db),
 ) -> APIKeyUpdateAllResponse:
-    """Update all API keys in manual mode."""
-    service = APIKeyService(db)
-    api_keys = service.list_api_keys(current_user.id)
-
-    # Filter only manual mode and active keys
-    from app.models.api_source import UpdateMode
+    """Update all API keys in manual mode.
 
-    manual_keys = [
-        key
-        for key in api_keys
-        if key.update_mode == UpdateMode.MANUAL and key.is_active
-    ]
+    Deprecated: use ``/update-all/stream``, which returns results as they complete.
+    """
+    service = APIKeyService(db)
+    manual_keys = _manual_keys(service, current_user.id)
 
-    results = []
-    successful = 0
-    failed = 0
-
-    for api_key in manual_keys:
-        try:
-            # Placeholder for actual update logic
-            from datetime import datetime, timezone
-
-            api_key.last_used = datetime.now(timezone.utc)
-            db.commit()
-
-            results.append(
-                {
-                    "api_key_id": api_key.id,
-                    "api_source_id": api_key.api_source_id,
-                    "success": True,
-                    "message": "Update initiated",
-                }
-            )
-            successful += 1
-        except Exception as e:
-            results.append(
-                {
-                    "api_key_id": api_key.id,
-                    "api_source_id": api_key.api_source_id,
-                    "success": False,
-                    "error": str(e),
-                }
-            )
-            failed += 1
+    results = [_update_manual_key(db, api_key) for api_key in manual_keys]
+    successful = sum(1 for result in results if result["success"])
 
     return APIKeyUpdateAllResponse(
         total=len(manual_keys),
         successful=successful,
-        failed=failed,
+        failed=len(results) - successful,
         results=results,
     )
 
+
+@router.post(
+    "/update-all/stream",
+    response_class=StreamingResponse,
+    summary="Update all manual mode API keys (NDJSON stream)",
+)
+def stream_update_all_api_keys(
+    current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """Update all API keys in manual mode, streaming one JSON line per key as it finishes."""
+    key_ids = [key.id for key in _manual_keys(APIKeyService(db), current_user.id)]
+
+    def _results() -> Iterator[bytes]:
+        # get_db session'ı yanıt gönderilmeden kapanıyor; stream kendi session'ını kullanır
+        stream_db = SessionLocal()
+        try:
+            for key_id in key_ids:
+                api_key = stream_db.get(APIKey, key_id)
+                if api_key is not None:
+                    yield orjson.dumps(_update_manual_key(stream_db, api_key)) + b"\n"
+        finally:
+            stream_db.close()
+
+    return StreamingResponse(_results(), media_type="application/x-ndjson")
+
@@ -31,7 +31,7 @@ async def list_api_sources(
     """List all API sources."""
     service = APISourceService(db)
     api_sources = service.list_api_sources(include_inactive=include_inactive)
-    return [APISourceResponse(**service.to_response(source)) for source in api_sources]
+    return [APISourceResponse.from_orm_trusted(service.to_response(source)) for source in api_sources]
 
 
 @router.post(
@@ -49,7 +49,7 @@ async def create_api_source(
     service = APISourceService(db)
     try:
         api_source = service.create_api_source(current_user.id, api_source_data)
-        return APISourceResponse(**service.to_response(api_source))
+        return APISourceResponse.from_orm_trusted(service.to_response(api_source))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
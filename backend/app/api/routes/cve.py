@@ -1,25 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Union
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.db.base import get_db
-from app.schemas.cve import CVEDetailResponse, CVESearchRequest, CVESearchResponse
+from app.schemas.cve import CVE, CVE_LIST_ADAPTER, CVEDetailResponse, CVESearchRequest, CVESearchResponse
 from app.services.cve_service import CVEService
 
 router = APIRouter(prefix="/cves", tags=["cves"])
 
+# CVE detayları NVD'de nadiren değişiyor; client/proxy 1 saat cache'leyebilir
+CVE_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _cve_etag(cve: CVE) -> str:
+    """Weak ETag derived from NVD last-modified and local cache timestamps."""
+    modified = cve.last_modified_date.timestamp() if cve.last_modified_date else 0
+    cached = cve.cached_at.timestamp() if cve.cached_at else 0
+    return f'W/"{cve.cve_id}-{modified:.0f}-{cached:.0f}-{len(cve.description or "")}"'
+
 
 @router.post(
     "/search",
     response_model=CVESearchResponse,
     summary="CVE arama ve filtreleme",
 )
-def search_cves(
+async def search_cves(
     request: CVESearchRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-) -> CVESearchResponse:
+) -> ORJSONResponse:
     """CVE veritabanında arama yap ve filtrele - NIST NVD API."""
-    cve_service = CVEService(db)
-    return cve_service.search_cves(request)
+    # NVD sonuçlarının DB cache'e yazımı yanıtı bekletmez
+    cve_service = CVEService(db, background_tasks)
+    result = await cve_service.search_cves(request)
+    return ORJSONResponse({
+        **result.model_dump(exclude={"cves"}),
+        "cves": CVE_LIST_ADAPTER.dump_python(result.cves, mode="json"),
+    })
 
 
 @router.get(
@@ -27,17 +46,29 @@ def search_cves(
     response_model=CVEDetailResponse,
     summary="CVE detayı",
 )
-def get_cve(
+async def get_cve(
     cve_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-) -> CVEDetailResponse:
-    """CVE ID ile detay bilgisi getir - NIST NVD API."""
+) -> Union[CVEDetailResponse, Response]:
+    """CVE ID ile detay bilgisi getir - NIST NVD API.
+
+    ETag/If-None-Match destekler; değişmemiş CVE için gövdesiz 304 döner.
+    """
     cve_service = CVEService(db)
-    cve = cve_service.get_cve(cve_id)
+    cve = await cve_service.get_cve(cve_id)
     if not cve:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"CVE not found: {cve_id}",
         )
+
+    etag = _cve_etag(cve)
+    headers = {"ETag": etag, "Cache-Control": CVE_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
     return CVEDetailResponse(cve=cve)
 
@@ -1,6 +1,6 @@
 """Dashboard endpoints."""
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.routes.auth import get_current_user
@@ -19,6 +19,7 @@ router = APIRouter(prefix="/dashboard", tags=["dashboard"])
     summary="Dashboard verileri",
 )
 def get_dashboard(
+    refresh: bool = Query(False, description="Cache'i atlayıp verileri yeniden hesapla"),
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> DashboardResponse:
@@ -27,7 +28,7 @@ def get_dashboard(
     try:
         dashboard_service = DashboardService(db)
         is_admin = current_user.role == "admin"
-        return dashboard_service.get_dashboard(current_user.id, is_admin=is_admin)
+        return dashboard_service.get_dashboard(current_user.id, is_admin=is_admin, refresh=refresh)
     except Exception as e:
         logger.error(f"Dashboard error: {e}", exc_info=True)
         raise
@@ -10,6 +10,7 @@ from app.api.routes.auth import get_current_user
 from app.core.dependencies import require_role
 from app.db.base import get_db
 from app.models.user import UserRole
+from app.schemas import _fast
 from app.schemas.auth import UserResponse
 from app.schemas.ioc import (
     IOCQueryDetailResponse,
@@ -17,6 +18,7 @@ from app.schemas.ioc import (
     IOCQueryRequest,
     IOCQueryResponse,
 )
+from app.schemas.types import UUIDStr
 from app.services.ioc_service import IOCService
 
 router = APIRouter(tags=["ioc"])
@@ -67,10 +69,10 @@ def list_query_history(
     start_date: Optional[datetime] = Query(None, description="Başlangıç tarihi (ISO format)"),
     end_date: Optional[datetime] = Query(None, description="Bitiş tarihi (ISO format)"),
     source: Optional[str] = Query(None, description="API kaynağı filtresi (partial match)"),
-    watchlist_id: Optional[str] = Query(None, description="Watchlist ID filtresi"),
+    watchlist_id: Optional[UUIDStr] = Query(None, description="Watchlist ID filtresi"),
     page: int = Query(1, ge=1, description="Sayfa numarası"),
     page_size: int = Query(20, ge=1, le=100, description="Sayfa başına kayıt sayısı"),
-) -> IOCQueryHistoryListResponse:
+) -> Response:
     """List IOC query history with filters and pagination.
     
     For admin/analyst: Returns all their own IOC queries.
@@ -92,7 +94,9 @@ def list_query_history(
         page=page,
         page_size=page_size,
     )
-    return IOCQueryHistoryListResponse(**result)
+    # Sayfa msgspec Struct'larına çevrilip doğrudan encode ediliyor; response_model yalnızca OpenAPI için
+    page_data = _fast.build_history_page(result)
+    return Response(content=_fast.json_encoder.encode(page_data), media_type="application/json")
 
 
 @router.get(
@@ -102,7 +106,7 @@ def list_query_history(
     summary="IOC sorgu detayı",
 )
 def get_query_detail(
-    query_id: str,
+    query_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
 ) -> IOCQueryDetailResponse:
@@ -129,7 +133,7 @@ def export_query_history(
     start_date: Optional[datetime] = Query(None, description="Başlangıç tarihi (ISO format)"),
     end_date: Optional[datetime] = Query(None, description="Bitiş tarihi (ISO format)"),
     source: Optional[str] = Query(None, description="API kaynağı filtresi (partial match)"),
-    watchlist_id: Optional[str] = Query(None, description="Watchlist ID filtresi"),
+    watchlist_id: Optional[UUIDStr] = Query(None, description="Watchlist ID filtresi"),
 ) -> Response:
     """Export IOC query history as CSV or JSON.
     
@@ -3,6 +3,7 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.api.routes.auth import get_current_user
@@ -18,6 +19,7 @@ from app.schemas.report import (
     ReportShareRequest,
     ReportUpdate,
 )
+from app.schemas.types import UUIDStr
 from app.services.report_service import ReportService
 
 router = APIRouter(prefix="/reports", tags=["reports"])
@@ -52,7 +54,7 @@ def list_reports(
     page: int = Query(1, ge=1, description="Sayfa numarası"),
     page_size: int = Query(20, ge=1, le=100, description="Sayfa başına kayıt sayısı"),
     search: Optional[str] = Query(None, description="Arama terimi (başlık veya açıklama)"),
-) -> ReportListResponse:
+) -> ORJSONResponse:
     """List all reports for the current user. Viewer role cannot access reports."""
     report_service = ReportService(db)
     result = report_service.list_reports(
@@ -62,7 +64,14 @@ def list_reports(
         search=search,
         user_role=current_user.role
     )
-    return ReportListResponse(**result)
+    # Satırlar DB'den geliyor; listeyi validation olmadan kur
+    response = ReportListResponse.model_construct(
+        items=[ReportResponse.from_orm_trusted(item) for item in result["items"]],
+        total=result["total"],
+        page=result["page"],
+        page_size=result["page_size"],
+    )
+    return ORJSONResponse(response.model_dump(mode="json"))
 
 
 @router.get(
@@ -71,7 +80,7 @@ def list_reports(
     summary="Rapor detayı",
 )
 def get_report(
-    report_id: str,
+    report_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
 ) -> ReportResponse:
@@ -80,7 +89,7 @@ def get_report(
     report = report_service.get_report(report_id, current_user.id)
     if not report:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
-    return ReportResponse(**report_service._to_response(report))
+    return ReportResponse.from_orm_trusted(report_service._to_response(report))
 
 
 @router.put(
@@ -89,7 +98,7 @@ def get_report(
     summary="Rapor güncelle",
 )
 def update_report(
-    report_id: str,
+    report_id: UUIDStr,
     payload: ReportUpdate,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
@@ -108,7 +117,7 @@ def update_report(
     summary="Rapor sil",
 )
 def delete_report(
-    report_id: str,
+    report_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
 ) -> None:
@@ -125,7 +134,7 @@ def delete_report(
     status_code=status.HTTP_200_OK,
 )
 def export_report(
-    report_id: str,
+    report_id: UUIDStr,
     export_request: ReportExportRequest,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
@@ -173,7 +182,7 @@ def export_report(
     summary="Raporu kullanıcılarla paylaş",
 )
 def share_report(
-    report_id: str,
+    report_id: UUIDStr,
     share_request: ReportShareRequest,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
@@ -209,7 +218,7 @@ def share_report(
     summary="Raporu kullanıcılarla paylaş",
 )
 def share_report(
-    report_id: str,
+    report_id: UUIDStr,
     share_request: ReportShareRequest,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN, UserRole.ANALYST])),
@@ -10,6 +10,7 @@ from app.core.dependencies import require_role
 from app.db.base import get_db
 from app.models.user import UserRole
 from app.schemas.auth import UserResponse
+from app.schemas.types import UUIDStr
 from app.schemas.user import (
     ChangeRoleRequest,
     UserCreate,
@@ -45,7 +46,7 @@ def list_users(
 
 @router.get("/{user_id}", response_model=UserResponse, summary="Get user by ID")
 def get_user(
-    user_id: str,
+    user_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN])),
 ) -> UserResponse:
@@ -77,7 +78,7 @@ def create_user(
 
 @router.put("/{user_id}", response_model=UserResponse, summary="Update user")
 def update_user(
-    user_id: str,
+    user_id: UUIDStr,
     user_data: UserUpdate,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN])),
@@ -93,7 +94,7 @@ def update_user(
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT, summary="Delete user (soft delete)")
 def delete_user(
-    user_id: str,
+    user_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN])),
 ) -> None:
@@ -112,7 +113,7 @@ def delete_user(
 
 @router.delete("/{user_id}/hard", status_code=status.HTTP_204_NO_CONTENT, summary="Permanently delete user")
 def hard_delete_user(
-    user_id: str,
+    user_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN])),
 ) -> None:
@@ -132,7 +133,7 @@ def hard_delete_user(
 
 @router.put("/{user_id}/activate", response_model=UserResponse, summary="Activate/deactivate user")
 def activate_user(
-    user_id: str,
+    user_id: UUIDStr,
     is_active: bool = Query(..., description="Active status"),
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN])),
@@ -148,7 +149,7 @@ def activate_user(
 
 @router.put("/{user_id}/role", response_model=UserResponse, summary="Change user role")
 def change_user_role(
-    user_id: str,
+    user_id: UUIDStr,
     role_data: ChangeRoleRequest,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(require_role([UserRole.ADMIN])),
@@ -3,12 +3,22 @@ from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
 from app.api.routes.auth import get_current_user
 from app.db.base import get_db
 from app.schemas.auth import UserResponse
-from app.schemas.watchlist import Watchlist, WatchlistCreate, WatchlistListResponse, WatchlistShareRequest
+from app.schemas.watchlist import (
+    CHECK_HISTORY_LIST_ADAPTER,
+    WATCHLIST_LIST_ADAPTER,
+    AssetCheckHistoryListResponse,
+    Watchlist,
+    WatchlistCreate,
+    WatchlistListResponse,
+    WatchlistShareRequest,
+)
+from app.schemas.types import UUIDStr
 from app.services.watchlist_service import WatchlistService
 from app.utils.ioc_detector import detect_ioc_type
 
@@ -19,14 +29,15 @@ router = APIRouter(prefix="/watchlists", tags=["watchlists"])
 def list_watchlists(
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
-) -> WatchlistListResponse:
+) -> ORJSONResponse:
     """List all watchlists for the current user.
     
     For admin/analyst: Returns only their own watchlists.
     For viewer: Returns their own watchlists (if any) + watchlists shared with them.
     """
     watchlist_service = WatchlistService(db)
-    return watchlist_service.list_watchlists(current_user.id, user_role=current_user.role)
+    result = watchlist_service.list_watchlists(current_user.id, user_role=current_user.role)
+    return ORJSONResponse({"watchlists": WATCHLIST_LIST_ADAPTER.dump_python(result.watchlists, mode="json")})
 
 
 @router.post(
@@ -144,7 +155,7 @@ async def create_watchlist(
     summary="Watchlist detayı",
 )
 def get_watchlist(
-    watchlist_id: str,
+    watchlist_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> Watchlist:
@@ -162,7 +173,7 @@ def get_watchlist(
     summary="Watchlist güncelle",
 )
 async def update_watchlist(
-    watchlist_id: str,
+    watchlist_id: UUIDStr,
     name: str = Form(...),
     description: str = Form(None),
     check_interval: int = Form(60),
@@ -292,7 +303,7 @@ async def update_watchlist(
     summary="Watchlist sil",
 )
 def delete_watchlist(
-    watchlist_id: str,
+    watchlist_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> None:
@@ -309,7 +320,7 @@ def delete_watchlist(
     status_code=status.HTTP_200_OK,
 )
 def check_watchlist(
-    watchlist_id: str,
+    watchlist_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> dict:
@@ -342,7 +353,7 @@ def check_all_watchlists(
     status_code=status.HTTP_200_OK,
 )
 def check_watchlist_item(
-    item_id: str,
+    item_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
 ) -> dict:
@@ -360,7 +371,7 @@ def check_watchlist_item(
     status_code=status.HTTP_200_OK,
 )
 async def upload_watchlist_from_file(
-    watchlist_id: str,
+    watchlist_id: UUIDStr,
     file: UploadFile = File(..., description="TXT file with one IOC per line"),
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
@@ -495,7 +506,7 @@ async def upload_watchlist_from_file(
     status_code=status.HTTP_200_OK,
 )
 def export_watchlist(
-    watchlist_id: str,
+    watchlist_id: UUIDStr,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
     format: str = Query("json", regex="^(json)$", description="Export format: json"),
@@ -548,21 +559,23 @@ def export_watchlist(
 
 @router.get(
     "/items/{item_id}/history",
+    response_model=AssetCheckHistoryListResponse,
     summary="Asset kontrol geçmişi",
     status_code=status.HTTP_200_OK,
 )
 def get_asset_check_history(
-    item_id: str,
+    item_id: UUIDStr,
     limit: int = Query(50, ge=1, le=200, description="Maximum number of history entries"),
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
-):
+) -> ORJSONResponse:
     """Get check history for a watchlist asset."""
-    from app.schemas.watchlist import AssetCheckHistoryListResponse
-    
     watchlist_service = WatchlistService(db)
     history = watchlist_service.get_asset_check_history(item_id, current_user.id, limit)
-    return history
+    return ORJSONResponse({
+        "items": CHECK_HISTORY_LIST_ADAPTER.dump_python(history.items, mode="json"),
+        "total": history.total,
+    })
 
 
 @router.put(
@@ -571,7 +584,7 @@ def get_asset_check_history(
     summary="Watchlist'i kullanıcılarla paylaş",
 )
 def share_watchlist(
-    watchlist_id: str,
+    watchlist_id: UUIDStr,
     share_request: WatchlistShareRequest,
     db: Session = Depends(get_db),
     current_user: UserResponse = Depends(get_current_user),
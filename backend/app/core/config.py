@@ -16,10 +16,18 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./threat_intel.db"  # Default SQLite, production'da PostgreSQL
+    database_pool_size: int = 5  # Persistent connections per worker (ignored for SQLite)
+    database_max_overflow: int = 10  # Extra connections allowed above the pool size under bursts
+    dashboard_section_workers: int = 4  # Dashboard sections computed in parallel per worker (one connection each)
+    database_query_cache_size: int = 2000  # Compiled SQL statements cached per engine
+    database_warm_query_cache: bool = True  # Compile the dashboard queries once at startup
 
     # Redis Cache
     redis_url: Optional[str] = "redis://localhost:6379/0"  # Redis connection URL
     redis_enabled: bool = False  # Enable Redis cache (set to True in production)
+    ioc_cache_maxsize: int = 10000  # Max IOC responses kept in the per-worker in-memory cache
+    cve_local_cache_maxsize: int = 4096  # Max CVEs kept in the per-worker in-memory cache (5 min TTL)
+    cve_max_affected_products: int = 1000  # Unique CPE products kept per CVE; the rest are dropped
     
     @field_validator('redis_enabled', mode='before')
     @classmethod
@@ -35,6 +43,11 @@ class Settings(BaseSettings):
     watchlist_scheduler_enabled: bool = False  # Enable automatic watchlist checking (disabled by default to save API quotas)
     watchlist_scheduler_interval_minutes: int = 30  # How often scheduler runs to check watchlists (default: 30 minutes)
     watchlist_scheduler_min_check_interval: int = 60  # Minimum check_interval for watchlists to be automatically checked (default: 60 minutes)
+    check_history_retention_days: int = 90  # Asset check history retention (PostgreSQL: whole monthly partitions are dropped)
+
+    # Alerts
+    alert_mark_read_batch_size: int = 1000  # Rows per batch for bulk alert updates (mark all read, bulk_update_alerts)
+    alert_mark_read_max_seconds: float = 30.0  # Stop batching after this long; the rest is left for the next call (0 = no cap)
 
     # JWT Authentication
     secret_key: str = "your-secret-key-change-in-production"  # Production'da environment variable'dan alınmalı
@@ -54,6 +67,8 @@ class Settings(BaseSettings):
     rate_limit_enabled: bool = True  # Enable rate limiting (set to False to disable)
     rate_limit_per_minute: int = 60  # Requests per minute per IP
     rate_limit_per_hour: int = 1000  # Requests per hour per IP
+    rate_limit_shared_memory: bool = False  # Share counters across uvicorn workers on this host via shared memory
+    rate_limit_shared_memory_name: str = "tip_rate_limit"  # Shared memory segment name
 
     # Security
     security_headers_enabled: bool = True  # Enable security headers
@@ -65,11 +80,7 @@ class Settings(BaseSettings):
         extra = "allow"  # Allow extra fields from .env file
 
 
+@lru_cache
 def get_settings() -> Settings:
     """Return cached settings instance."""
-
-    @lru_cache
-    def _get_settings() -> Settings:
-        return Settings()
-
-    return _get_settings()
+    return Settings()
@@ -1,6 +1,7 @@
 """Encryption utilities for API keys."""
 
 from base64 import b64decode, b64encode
+from functools import lru_cache
 
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
@@ -27,12 +28,17 @@ def _get_encryption_key() -> bytes:
     return b64encode(key)
 
 
+@lru_cache(maxsize=1)
+def _get_fernet() -> Fernet:
+    """Fernet instance built once per process (PBKDF2 derivation is deliberately slow)."""
+    return Fernet(_get_encryption_key())
+
+
 def encrypt_value(value: str) -> str:
     """Encrypt a string value (API key, password, etc.)."""
     if not value:
         return ""
-    key = _get_encryption_key()
-    fernet = Fernet(key)
+    fernet = _get_fernet()
     encrypted = fernet.encrypt(value.encode())
     return encrypted.decode()
 
@@ -42,15 +48,28 @@ def decrypt_value(encrypted_value: str) -> str:
     if not encrypted_value:
         return ""
     try:
-        key = _get_encryption_key()
-        fernet = Fernet(key)
-        decrypted = fernet.decrypt(encrypted_value.encode())
+        decrypted = _get_fernet().decrypt(encrypted_value.encode())
         return decrypted.decode()
     except Exception:
         # If decryption fails, return empty string
         return ""
 
 
+def decrypt_values(encrypted_values: list[str | None]) -> list[str]:
+    """Decrypt several values with one cipher; same per-item semantics as decrypt_value."""
+    fernet = _get_fernet()
+    decrypted: list[str] = []
+    for encrypted_value in encrypted_values:
+        if not encrypted_value:
+            decrypted.append("")
+            continue
+        try:
+            decrypted.append(fernet.decrypt(encrypted_value.encode()).decode())
+        except Exception:
+            decrypted.append("")
+    return decrypted
+
+
 
 
 
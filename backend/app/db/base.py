@@ -1,6 +1,6 @@
 """Database base configuration."""
 
-from sqlalchemy import JSON, create_engine
+from sqlalchemy import JSON, String, Uuid, create_engine, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
@@ -12,19 +12,37 @@ settings = get_settings()
 # SQLite kullanarak hızlı geliştirme yapabiliriz, production'da PostgreSQL kullanılacak
 DATABASE_URL = getattr(settings, "database_url", "sqlite:///./threat_intel.db")
 
+# PostgreSQL'e özgü özellikler (JSONB, partitioning vb.) için dialect bayrağı
+IS_POSTGRESQL = "postgresql" in DATABASE_URL
+
 # JSON type - SQLite için JSON, PostgreSQL için JSONB
 # SQLAlchemy otomatik olarak uygun tipi seçecek
-JSONType = JSONB if "postgresql" in DATABASE_URL else JSON
+JSONType = JSONB if IS_POSTGRESQL else JSON
+
+# UUID id tipi - PostgreSQL'de native 16 byte uuid (Python tarafında yine str),
+# SQLite'ta mevcut veriyle uyumlu olması için String
+UUIDType = Uuid(as_uuid=False) if IS_POSTGRESQL else String
+UUID_SERVER_DEFAULT = text("gen_random_uuid()") if IS_POSTGRESQL else None
 
 # SQLAlchemy 2.0 style base class
 class Base(DeclarativeBase):
     """Base class for all database models."""
     pass
 
+# Dashboard bölümleri paralel çalıştığında tek istek birden fazla bağlantı kullanır
+_pool_options = (
+    {}
+    if "sqlite" in DATABASE_URL
+    else {"pool_size": settings.database_pool_size, "max_overflow": settings.database_max_overflow}
+)
+
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
     echo=False,  # SQL sorgularını logla (development için True yapılabilir)
+    # Derlenmiş SQL cache'i; tekrar eden sorgular yeniden compile edilmez (dashboard tek başına ~40 şekil üretir)
+    query_cache_size=settings.database_query_cache_size,
+    **_pool_options,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,109 @@
+"""Pre-aggregated CVE counters read by the dashboard.
+
+PostgreSQL'de cve_cache üzerinden iki materialized view tutulur:
+cve_daily_stats (yayın günü başına toplam/critical/high) ve cve_cvss_hist
+(CVSS aralığı başına sayı). Dashboard her istekte cve_cache'i taramak yerine bu
+küçük view'ları okur; view'lar scheduler tarafından periyodik olarak yenilenir.
+SQLite'ta materialized view yok: aynı sütunları veren sorgular anlık çalıştırılır.
+"""
+
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import Date, Integer, and_, case, column, func, or_, select, table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import FromClause
+
+from app.db.base import IS_POSTGRESQL, engine as default_engine
+from app.models.cve import CVECache
+
+
+# (etiket, alt sınır, üst sınır) - NVD skorları tek ondalıklı, aralıklar kapalı
+CVSS_BUCKETS = (
+    ("0.0-2.0", 0.0, 2.0),
+    ("2.1-4.0", 2.1, 4.0),
+    ("4.1-6.0", 4.1, 6.0),
+    ("6.1-8.0", 6.1, 8.0),
+    ("8.1-10.0", 8.1, 10.0),
+)
+
+cve_daily_stats = table(
+    "cve_daily_stats",
+    column("day", Date),
+    column("total", Integer),
+    column("critical", Integer),
+    column("high", Integer),
+)
+cve_cvss_hist = table("cve_cvss_hist", column("bucket", Integer), column("count", Integer))
+
+# Critical = CVSS v3 CRITICAL veya (v3 yoksa) v2 HIGH; High = v3 HIGH veya (v3 yoksa) v2 MEDIUM
+_IS_CRITICAL = or_(
+    CVECache.cvss_v3_severity == "CRITICAL",
+    and_(CVECache.cvss_v3_severity.is_(None), CVECache.cvss_v2_severity == "HIGH"),
+)
+_IS_HIGH = or_(
+    CVECache.cvss_v3_severity == "HIGH",
+    and_(CVECache.cvss_v3_severity.is_(None), CVECache.cvss_v2_severity == "MEDIUM"),
+)
+
+
+def _daily_stats_select():
+    return (
+        select(
+            CVECache.published_date.label("day"),
+            func.count().label("total"),
+            func.count(case((_IS_CRITICAL, 1))).label("critical"),
+            func.count(case((_IS_HIGH, 1))).label("high"),
+        )
+        .where(CVECache.published_date.isnot(None))
+        .group_by(CVECache.published_date)
+    )
+
+
+def _cvss_hist_select():
+    # v3 skoru varsa o, yoksa v2
+    score = func.coalesce(CVECache.cvss_v3_score, CVECache.cvss_v2_score)
+    bucket = case(
+        *((and_(score >= low, score <= high), index) for index, (_, low, high) in enumerate(CVSS_BUCKETS))
+    ).label("bucket")
+    return select(bucket, func.count().label("count")).where(bucket.isnot(None)).group_by(bucket)
+
+
+def daily_stats() -> FromClause:
+    """Return the per-day CVE counters (materialized view on PostgreSQL)."""
+    return cve_daily_stats if IS_POSTGRESQL else _daily_stats_select().subquery("cve_daily_stats")
+
+
+def cvss_hist() -> FromClause:
+    """Return the per-bucket CVSS counters (materialized view on PostgreSQL)."""
+    return cve_cvss_hist if IS_POSTGRESQL else _cvss_hist_select().subquery("cve_cvss_hist")
+
+
+_VIEWS = (
+    (cve_daily_stats.name, _daily_stats_select, "day"),
+    (cve_cvss_hist.name, _cvss_hist_select, "bucket"),
+)
+
+
+def ensure_cve_stat_views(bind: Optional[Engine] = None) -> None:
+    """Create the materialized views (and the unique indexes REFRESH CONCURRENTLY needs) if missing."""
+    if not IS_POSTGRESQL:
+        return
+
+    with (bind or default_engine).begin() as conn:
+        for name, build, key in _VIEWS:
+            query = build().compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            conn.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS {query}"))
+            conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{name}_{key} ON {name} ({key})"))
+
+
+def refresh_cve_stat_views(bind: Optional[Engine] = None) -> None:
+    """Recompute the materialized views without blocking dashboard reads."""
+    if not IS_POSTGRESQL:
+        return
+
+    with (bind or default_engine).begin() as conn:
+        for name, _, _ in _VIEWS:
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}"))
+    logger.info("Refreshed CVE stat views")
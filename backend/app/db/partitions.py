@@ -0,0 +1,127 @@
+"""PostgreSQL partition maintenance for asset_check_history.
+
+asset_check_history PostgreSQL'de check_date üzerinden aylık RANGE partition'lara
+bölünür (asset_check_history_yyyy_mm). Retention satır satır DELETE yerine
+süresi dolan partition'ın DROP edilmesiyle yapılır. SQLite'ta tüm fonksiyonlar no-op.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.base import IS_POSTGRESQL, engine as default_engine
+
+
+CHECK_HISTORY_TABLE = "asset_check_history"
+DEFAULT_PARTITION = f"{CHECK_HISTORY_TABLE}_default"
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value: date) -> date:
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Return child partition name for the given month (asset_check_history_yyyy_mm)."""
+    return f"{CHECK_HISTORY_TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+def _relation_exists(conn: Connection, name: str) -> bool:
+    return bool(conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar())
+
+
+def create_month_partition(conn: Connection, month: date) -> None:
+    """Create the monthly partition covering ``month`` if it doesn't exist.
+
+    Rows for that month already sitting in the default partition are moved into
+    the new partition; PostgreSQL refuses to create it while they are there.
+    """
+    start = _month_start(month)
+    end = _next_month(start)
+    name = partition_name(start)
+    if _relation_exists(conn, name):
+        return
+
+    bounds = {"start": start, "end": end}
+    in_range = "check_date >= :start AND check_date < :end"
+    stranded = _relation_exists(conn, DEFAULT_PARTITION) and bool(
+        conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})"), bounds).scalar()
+    )
+    if stranded:
+        # Default'u ayır, aylık partition'ı oluştur, satırları parent üzerinden taşı, default'u geri bağla
+        conn.execute(text(f"ALTER TABLE {CHECK_HISTORY_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+
+    conn.execute(
+        text(
+            f"CREATE TABLE {name} "
+            f"PARTITION OF {CHECK_HISTORY_TABLE} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+    )
+
+    if stranded:
+        moved = conn.execute(
+            text(f"INSERT INTO {CHECK_HISTORY_TABLE} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds
+        ).rowcount
+        conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}"), bounds)
+        conn.execute(text(f"ALTER TABLE {CHECK_HISTORY_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+        logger.info(f"Moved {moved} rows from {DEFAULT_PARTITION} into {name}")
+
+
+def ensure_check_history_partitions(months_ahead: int = 3, bind: Optional[Engine] = None) -> None:
+    """Create partitions for the current month and the next ``months_ahead`` months."""
+    if not IS_POSTGRESQL:
+        return
+
+    month = _month_start(datetime.now(timezone.utc).date())
+    with (bind or default_engine).begin() as conn:
+        for _ in range(months_ahead + 1):
+            create_month_partition(conn, month)
+            month = _next_month(month)
+        # Aralık dışı kalan satırlar için güvenlik ağı
+        conn.execute(
+            text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {CHECK_HISTORY_TABLE} DEFAULT")
+        )
+
+
+def drop_expired_check_history_partitions(retention_days: int, bind: Optional[Engine] = None) -> List[str]:
+    """Drop monthly partitions whose whole range is older than ``retention_days``.
+
+    Returns the names of dropped partitions.
+    """
+    if not IS_POSTGRESQL or retention_days <= 0:
+        return []
+
+    cutoff = datetime.now(timezone.utc).date() - timedelta(days=retention_days)
+    dropped: List[str] = []
+    with (bind or default_engine).begin() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :parent"
+            ),
+            {"parent": CHECK_HISTORY_TABLE},
+        ).scalars().all()
+        for name in rows:
+            suffix = name[len(CHECK_HISTORY_TABLE) + 1:]
+            try:
+                year, month = (int(part) for part in suffix.split("_"))
+            except ValueError:
+                continue  # default partition
+            if _next_month(date(year, month, 1)) <= cutoff:
+                conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+
+    if dropped:
+        logger.info(f"Dropped expired check history partitions: {', '.join(dropped)}")
+    return dropped
@@ -1,10 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
 from app.api.router import api_router
 from app.core.config import get_settings
 from app.db.base import Base, engine
+from app.db.cve_stats import ensure_cve_stat_views
+from app.db.partitions import ensure_check_history_partitions
 from app.middleware.rate_limit import RateLimitMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
 from app.middleware.metrics import MetricsMiddleware
@@ -12,7 +15,12 @@ from app.middleware.error_handler import ErrorHandlerMiddleware
 
 settings = get_settings()
 
-app = FastAPI(title=settings.app_name, version=settings.app_version, docs_url=settings.docs_url)
+app = FastAPI(
+    title=settings.app_name,
+    version=settings.app_version,
+    docs_url=settings.docs_url,
+    default_response_class=ORJSONResponse,
+)
 
 # Error handler middleware (should be first to catch all errors)
 app.add_middleware(ErrorHandlerMiddleware)
@@ -30,6 +38,7 @@ if settings.rate_limit_enabled:
         RateLimitMiddleware,
         requests_per_minute=settings.rate_limit_per_minute,
         requests_per_hour=settings.rate_limit_per_hour,
+        shared_memory_name=settings.rate_limit_shared_memory_name if settings.rate_limit_shared_memory else None,
     )
 
 # CORS middleware - Allow all origins for development
@@ -84,6 +93,17 @@ async def startup_event() -> None:
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables initialized (existing data preserved)")
 
+    # PostgreSQL: asset_check_history aylık partition'lara bölünmüş durumda,
+    # insert'lerin düşeceği partition'ların var olduğundan emin ol (SQLite'ta no-op).
+    # Hata yutulmaz: partition'sız parent tabloya hiçbir history insert'i yazılamaz
+    ensure_check_history_partitions()
+
+    # PostgreSQL: dashboard CVE sayaçlarını okuduğu materialized view'lar (SQLite'ta no-op)
+    try:
+        ensure_cve_stat_views()
+    except Exception as e:
+        logger.warning("Failed to ensure CVE stat views: %s", e)
+
     # Seed predefined API sources (always, if they don't exist)
     try:
         from app.db.seed_predefined_apis import seed_predefined_apis
@@ -118,6 +138,15 @@ async def startup_event() -> None:
     except Exception as e:
         logger.warning("Redis connection test failed: %s. Falling back to in-memory cache.", e)
 
+    # Dashboard sorgularını derleyip engine'in query cache'ine al
+    try:
+        if settings.database_warm_query_cache:
+            from app.services.dashboard_service import warm_dashboard_queries
+            warm_dashboard_queries()
+            logger.info("Dashboard query cache warmed")
+    except Exception as e:
+        logger.warning("Failed to warm dashboard query cache: %s", e)
+
     # Start background scheduler for watchlist monitoring (only if enabled in config)
     # DISABLED BY DEFAULT to prevent API quota exhaustion
     try:
@@ -130,6 +159,14 @@ async def startup_event() -> None:
     except Exception as e:
         logger.warning("Failed to start background scheduler: %s", e)
 
+    # Bakım işleri (check history partition'ları, retention, CVE cache temizliği, CVE stat view'ları)
+    # watchlist scheduler'dan bağımsız, her zaman açık
+    try:
+        from app.services.scheduler import start_maintenance_scheduler
+        start_maintenance_scheduler()
+    except Exception as e:
+        logger.warning("Failed to start maintenance scheduler: %s", e)
+
 
 @app.on_event("shutdown")
 async def shutdown_event() -> None:
@@ -146,6 +183,22 @@ async def shutdown_event() -> None:
                 logger.info("Redis connection closed")
     except Exception as e:
         logger.warning("Failed to close Redis connection: %s", e)
+
+    # Close the shared NVD HTTP client
+    try:
+        from app.services.cve_service import close_nvd_client
+
+        await close_nvd_client()
+    except Exception as e:
+        logger.warning("Failed to close NVD HTTP client: %s", e)
+
+    # Close the shared threat intel API session
+    try:
+        from app.services.dynamic_api_client import close_http_session
+
+        close_http_session()
+    except Exception as e:
+        logger.warning("Failed to close API HTTP session: %s", e)
     
     # Stop background scheduler
     try:
@@ -156,5 +209,12 @@ async def shutdown_event() -> None:
     except Exception as e:
         logger.warning("Failed to stop background scheduler: %s", e)
 
+    try:
+        from app.services.scheduler import stop_maintenance_scheduler
+
+        stop_maintenance_scheduler()
+    except Exception as e:
+        logger.warning("Failed to stop maintenance scheduler: %s", e)
+
 
 app.include_router(api_router, prefix=settings.api_v1_str)
@@ -1,36 +1,27 @@
 """Metrics collection middleware."""
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from typing import Callable
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.utils.monitoring import RequestTimer
 
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    """Collect metrics for all requests."""
-
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Collect metrics for request."""
-        endpoint = request.url.path
-        method = request.method
-        
-        with RequestTimer(endpoint, method):
-            try:
-                response = await call_next(request)
-                return response
-            except Exception as e:
-                # Record error
-                from app.utils.monitoring import metrics_collector
-                metrics_collector.record_request(endpoint, method, 500, 0)
-                raise
-
-
-
-
+class MetricsMiddleware:
+    """Collect metrics for all requests (pure ASGI)."""
 
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Collect metrics for request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        with RequestTimer(scope["path"], scope["method"]) as timer:
 
+            async def send_with_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    timer.status_code = message["status"]
+                await send(message)
 
+            await self.app(scope, receive, send_with_status)
@@ -2,28 +2,52 @@
 
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Callable
+from typing import Optional, Tuple
 
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from fastapi import Request, status
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.config import get_settings
+from app.middleware.shared_counters import SharedRateLimitCounters
 
 settings = get_settings()
 
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware to prevent API abuse."""
-
-    def __init__(self, app, requests_per_minute: int = 60, requests_per_hour: int = 1000):
-        super().__init__(app)
+# Skip rate limiting for health checks, docs, and auth endpoints
+SKIP_PATHS = frozenset({
+    "/api/v1/health",
+    "/api/v1/auth/login",
+    "/docs",
+    "/openapi.json",
+    "/redoc",
+})
+
+
+class RateLimitMiddleware:
+    """Rate limiting middleware to prevent API abuse (pure ASGI)."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests_per_minute: int = 60,
+        requests_per_hour: int = 1000,
+        shared_memory_name: Optional[str] = None,
+    ):
+        self.app = app
         self.requests_per_minute = requests_per_minute
         self.requests_per_hour = requests_per_hour
+        # Limit header değerleri sabit; her response'ta str() ile yeniden üretme
+        self._hdr_limit_minute = str(requests_per_minute)
+        self._hdr_limit_hour = str(requests_per_hour)
         # Store request counts per IP
         self.request_counts: dict[str, list[datetime]] = defaultdict(list)
         # Cleanup old entries periodically
         self._last_cleanup = datetime.now()
+        # Tüm worker'ların ortak gördüğü sayaçlar (verilmezse worker başına in-memory)
+        self.shared_counters: Optional[SharedRateLimitCounters] = (
+            SharedRateLimitCounters(shared_memory_name) if shared_memory_name else None
+        )
 
     def _cleanup_old_entries(self):
         """Remove old request timestamps to prevent memory leaks."""
@@ -54,24 +78,14 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             return forwarded.split(",")[0].strip()
         return request.client.host if request.client else "unknown"
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process request with rate limiting."""
-        # Skip rate limiting for health checks, docs, and auth endpoints
-        skip_paths = [
-            "/api/v1/health",
-            "/api/v1/auth/login",
-            "/docs",
-            "/openapi.json",
-            "/redoc",
-        ]
-        if request.url.path in skip_paths:
-            return await call_next(request)
+    def _hit_local(self, client_ip: str) -> Tuple[int, int, int]:
+        """Record a request in the per-worker history.
 
+        Returns (minute_count, hour_count, status) like SharedRateLimitCounters.hit.
+        """
         # Cleanup old entries periodically
         self._cleanup_old_entries()
 
-        # Get client IP
-        client_ip = self._get_client_ip(request)
         now = datetime.now()
 
         # Get request history for this IP
@@ -83,35 +97,59 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         # Check minute limit
         cutoff_minute = now - timedelta(minutes=1)
-        recent_requests = [ts for ts in request_history if ts > cutoff_minute]
-        if len(recent_requests) >= self.requests_per_minute:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded: {self.requests_per_minute} requests per minute",
-                headers={"Retry-After": "60"},
-            )
+        recent_requests = sum(1 for ts in request_history if ts > cutoff_minute)
+        if recent_requests >= self.requests_per_minute:
+            return recent_requests, len(request_history), 1
 
         # Check hour limit
         if len(request_history) >= self.requests_per_hour:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded: {self.requests_per_hour} requests per hour",
-                headers={"Retry-After": "3600"},
-            )
+            return recent_requests, len(request_history), 2
 
         # Record this request
         request_history.append(now)
-
-        # Process request
-        response = await call_next(request)
-
-        # Add rate limit headers
-        remaining_minute = max(0, self.requests_per_minute - len(recent_requests) - 1)
-        remaining_hour = max(0, self.requests_per_hour - len(request_history))
-        response.headers["X-RateLimit-Limit-Minute"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining-Minute"] = str(remaining_minute)
-        response.headers["X-RateLimit-Limit-Hour"] = str(self.requests_per_hour)
-        response.headers["X-RateLimit-Remaining-Hour"] = str(remaining_hour)
-
-        return response
-
+        return recent_requests + 1, len(request_history), 0
+
+    def _limit_response(self, limited: int) -> JSONResponse:
+        """Build the 429 response for an exceeded minute (1) or hour (2) limit."""
+        if limited == 1:
+            detail = f"Rate limit exceeded: {self.requests_per_minute} requests per minute"
+            retry_after = "60"
+        else:
+            detail = f"Rate limit exceeded: {self.requests_per_hour} requests per hour"
+            retry_after = "3600"
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": detail},
+            headers={"Retry-After": retry_after},
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process request with rate limiting."""
+        if scope["type"] != "http" or scope["path"] in SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        client_ip = self._get_client_ip(Request(scope))
+        if self.shared_counters is not None:
+            minute_count, hour_count, limited = self.shared_counters.hit(
+                client_ip, self.requests_per_minute, self.requests_per_hour
+            )
+        else:
+            minute_count, hour_count, limited = self._hit_local(client_ip)
+
+        if limited:
+            await self._limit_response(limited)(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add rate limit headers
+                MutableHeaders(scope=message).update({
+                    "X-RateLimit-Limit-Minute": self._hdr_limit_minute,
+                    "X-RateLimit-Remaining-Minute": str(max(0, self.requests_per_minute - minute_count)),
+                    "X-RateLimit-Limit-Hour": self._hdr_limit_hour,
+                    "X-RateLimit-Remaining-Hour": str(max(0, self.requests_per_hour - hour_count)),
+                })
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,57 +1,77 @@
 """Security headers middleware."""
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from typing import Callable
+from typing import List, Tuple
 
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add security headers to all responses."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Add security headers to response."""
+def _build_security_headers(environment: str) -> List[Tuple[str, str]]:
+    """Build the security headers for the given environment."""
+    # Security headers
+    headers = [
+        ("X-Content-Type-Options", "nosniff"),
+        ("X-Frame-Options", "DENY"),
+        ("X-XSS-Protection", "1; mode=block"),
+    ]
+
+    # Only add HSTS in production
+    if environment == "production":
+        headers.append(("Strict-Transport-Security", "max-age=31536000; includeSubDomains"))
+
+    # More lenient CSP in development
+    if environment == "development":
+        headers.append((
+            "Content-Security-Policy",
+            "default-src 'self' 'unsafe-inline' 'unsafe-eval' http://localhost:* http://127.0.0.1:*; "
+            "script-src 'self' 'unsafe-inline' 'unsafe-eval' http://localhost:* http://127.0.0.1:*; "
+            "style-src 'self' 'unsafe-inline' http://localhost:* http://127.0.0.1:*; "
+            "img-src 'self' data: https: http:; "
+            "font-src 'self' data: http: https:; "
+            "connect-src 'self' http://localhost:* http://127.0.0.1:* https:; "
+            "frame-ancestors 'none';",
+        ))
+    else:
+        headers.append((
+            "Content-Security-Policy",
+            "default-src 'self'; "
+            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+            "style-src 'self' 'unsafe-inline'; "
+            "img-src 'self' data: https:; "
+            "font-src 'self' data:; "
+            "connect-src 'self' https:; "
+            "frame-ancestors 'none';",
+        ))
+
+    headers.append(("Referrer-Policy", "strict-origin-when-cross-origin"))
+    headers.append((
+        "Permissions-Policy",
+        "geolocation=(), microphone=(), camera=(), "
+        "payment=(), usb=(), magnetometer=(), gyroscope=()",
+    ))
+    return headers
+
+
+class SecurityHeadersMiddleware:
+    """Add security headers to all responses (pure ASGI)."""
+
+    def __init__(self, app: ASGIApp) -> None:
         from app.core.config import get_settings
-        
-        settings = get_settings()
-        response = await call_next(request)
-
-        # Security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        
-        # Only add HSTS in production
-        if settings.environment == "production":
-            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        
-        # More lenient CSP in development
-        if settings.environment == "development":
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'self' 'unsafe-inline' 'unsafe-eval' http://localhost:* http://127.0.0.1:*; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval' http://localhost:* http://127.0.0.1:*; "
-                "style-src 'self' 'unsafe-inline' http://localhost:* http://127.0.0.1:*; "
-                "img-src 'self' data: https: http:; "
-                "font-src 'self' data: http: https:; "
-                "connect-src 'self' http://localhost:* http://127.0.0.1:* https:; "
-                "frame-ancestors 'none';"
-            )
-        else:
-            response.headers["Content-Security-Policy"] = (
-                "default-src 'self'; "
-                "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-                "style-src 'self' 'unsafe-inline'; "
-                "img-src 'self' data: https:; "
-                "font-src 'self' data:; "
-                "connect-src 'self' https:; "
-                "frame-ancestors 'none';"
-            )
-        
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = (
-            "geolocation=(), microphone=(), camera=(), "
-            "payment=(), usb=(), magnetometer=(), gyroscope=()"
-        )
-
-        return response
 
+        self.app = app
+        self.headers = _build_security_headers(get_settings().environment)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Add security headers to response."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in self.headers:
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,86 @@
+"""Cross-worker rate limit counters backed by POSIX shared memory."""
+
+import fcntl
+import os
+import tempfile
+import time
+import zlib
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Tuple
+
+from loguru import logger
+
+
+# Her bucket için iki uint32: (pencere numarası, sayaç)
+_SLOT_WORDS = 2
+_WORD_SIZE = 4
+
+
+class SharedRateLimitCounters:
+    """Fixed-window per-IP counters shared by all workers on a host.
+
+    IP'ler sabit sayıda bucket'a hash'lenir (yaklaşık sayım; nadir IP çakışmaları
+    kabul edilir). Dakika ve saat pencereleri ayrı dizilerde tutulur. Artırma işlemi
+    tüm worker'lar arasında flock ile atomik yapılır.
+    """
+
+    def __init__(self, name: str, buckets: int = 65536) -> None:
+        self.buckets = buckets
+        size = buckets * 2 * _SLOT_WORDS * _WORD_SIZE  # dakika + saat dizileri
+        try:
+            self._shm = SharedMemory(name=name, create=True, size=size)
+            logger.info(f"Created shared rate limit segment '{name}' ({size} bytes)")
+        except FileExistsError:
+            self._shm = SharedMemory(name=name, create=False)
+        # Segment worker'lardan uzun yaşamalı; resource_tracker ilk çıkan worker'da unlink etmesin
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        self._words = self._shm.buf.cast("I")
+        self._lock_fd = os.open(
+            os.path.join(tempfile.gettempdir(), f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o600
+        )
+
+    def _bucket(self, key: str) -> int:
+        # hash() process başına rastgele seed'li; worker'lar arasında sabit bir hash gerekli
+        return zlib.crc32(key.encode()) % self.buckets
+
+    def _touch(self, offset: int, window: int, limit: int) -> Tuple[int, bool]:
+        """Return (count, allowed) for a slot, resetting it when the window rolled over."""
+        words = self._words
+        if words[offset] != window:
+            words[offset] = window
+            words[offset + 1] = 0
+        return words[offset + 1], words[offset + 1] < limit
+
+    def hit(self, key: str, per_minute: int, per_hour: int) -> Tuple[int, int, int]:
+        """Record a request for ``key`` if it is within both limits.
+
+        Returns (minute_count, hour_count, status) where status is 0 when the
+        request was recorded, 1 when the minute limit and 2 when the hour limit is hit.
+        Counts include the current request when it was recorded.
+        """
+        now = int(time.time())
+        bucket = self._bucket(key)
+        minute_offset = bucket * _SLOT_WORDS
+        hour_offset = (self.buckets + bucket) * _SLOT_WORDS
+
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            minute_count, minute_ok = self._touch(minute_offset, now // 60, per_minute)
+            hour_count, hour_ok = self._touch(hour_offset, now // 3600, per_hour)
+            if not minute_ok:
+                return minute_count, hour_count, 1
+            if not hour_ok:
+                return minute_count, hour_count, 2
+            self._words[minute_offset + 1] = minute_count + 1
+            self._words[hour_offset + 1] = hour_count + 1
+            return minute_count + 1, hour_count + 1, 0
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Detach from the segment (does not unlink it)."""
+        self._words.release()
+        self._shm.close()
+        os.close(self._lock_fd)
@@ -4,11 +4,10 @@ from datetime import datetime, timezone
 from enum import Enum
 from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, DateTime, Enum as SQLEnum, ForeignKey, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, Column, DateTime, Enum as SQLEnum, ForeignKey, Index, String, Text, text
 from sqlalchemy.orm import relationship
 
-from app.db.base import Base
+from app.db.base import UUID_SERVER_DEFAULT, Base, UUIDType
 
 
 class AlertType(str, Enum):
@@ -33,16 +32,33 @@ class Alert(Base):
     """Alert model for security notifications."""
 
     __tablename__ = "alerts"
+    __table_args__ = (
+        # Okunmamış alert kutusu (user_id + is_read=false) için sadece okunmamış satırları içeren küçük index
+        Index(
+            "ix_alerts_user_unread_partial",
+            "user_id",
+            "created_at",
+            postgresql_where=text("is_read = false"),
+            sqlite_where=text("is_read = 0"),
+        ),
+        # get_stats GROUP BY kırılımları
+        Index("ix_alerts_user_severity", "user_id", "severity"),
+        Index("ix_alerts_user_alert_type", "user_id", "alert_type"),
+        # list_alerts keyset sayfalaması (created_at DESC, id DESC); B-tree geriye doğru taranabiliyor
+        Index("ix_alerts_user_created_id", "user_id", "created_at", "id"),
+        # Sahiplik kontrolleri (id + user_id) heap'e gitmeden index-only scan ile
+        Index("ix_alerts_user_id_id", "user_id", "id"),
+    )
 
-    id = Column(String, primary_key=True, default=lambda: str(uuid4()), index=True)
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
-    watchlist_id = Column(String, ForeignKey("asset_watchlist.id"), nullable=True)
-    asset_id = Column(String, ForeignKey("asset_watchlist_items.id"), nullable=True)
+    id = Column(UUIDType, primary_key=True, server_default=UUID_SERVER_DEFAULT, default=lambda: str(uuid4()), index=True)
+    user_id = Column(UUIDType, ForeignKey("users.id"), nullable=False, index=True)
+    watchlist_id = Column(UUIDType, ForeignKey("asset_watchlist.id"), nullable=True)
+    asset_id = Column(UUIDType, ForeignKey("asset_watchlist_items.id"), nullable=True)
     alert_type = Column(SQLEnum(AlertType), nullable=False, index=True)
     severity = Column(SQLEnum(AlertSeverity), nullable=False, default=AlertSeverity.MEDIUM)
     title = Column(String(255), nullable=False)
     message = Column(Text, nullable=True)
-    is_read = Column(Boolean, default=False, nullable=False, index=True)
+    is_read = Column(Boolean, default=False, nullable=False)
     metadata_json = Column(Text, nullable=True)  # JSON string for additional data (renamed from metadata to avoid SQLAlchemy conflict)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
@@ -3,11 +3,11 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, String, Text, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db.base import Base, JSONType
+from app.db.base import UUID_SERVER_DEFAULT, Base, JSONType, UUIDType
 
 
 class APIType(str, PyEnum):
@@ -31,6 +31,10 @@ class APISource(Base):
     """API Source model - Threat intelligence API kaynak tanımları."""
 
     __tablename__ = "api_sources"
+    __table_args__ = (
+        # list_api_sources(is_active=True) tam tablo taraması yapmasın
+        Index("ix_api_sources_active_name", "is_active", "name"),
+    )
 
     id = Column(String, primary_key=True, index=True)  # UUID string
     name = Column(String(100), unique=True, nullable=False, index=True)  # API adı (örn: "VirusTotal")
@@ -45,7 +49,7 @@ class APISource(Base):
     response_config = Column(JSONType, nullable=True)  # Response parsing yapılandırması
     rate_limit_config = Column(JSONType, nullable=True)  # Rate limit yapılandırması
     is_active = Column(Boolean, default=True, nullable=False)
-    created_by = Column(String, ForeignKey("users.id"), nullable=True)  # Custom API ise kullanıcı ID
+    created_by = Column(UUIDType, ForeignKey("users.id"), nullable=True)  # Custom API ise kullanıcı ID
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -73,9 +77,18 @@ class APIKey(Base):
     """API Key model - Kullanıcı API key'leri."""
 
     __tablename__ = "api_keys"
-
-    id = Column(String, primary_key=True, index=True)  # UUID string
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    __table_args__ = (
+        # Dashboard aktif API sayacı ve API durum listesi: kullanıcının aktif key'leri
+        Index(
+            "ix_api_keys_user_active",
+            "user_id",
+            postgresql_where=text("is_active = true"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
+
+    id = Column(UUIDType, primary_key=True, server_default=UUID_SERVER_DEFAULT, index=True)  # UUID string
+    user_id = Column(UUIDType, ForeignKey("users.id"), nullable=False, index=True)
     api_source_id = Column(String, ForeignKey("api_sources.id"), nullable=False, index=True)
     api_key = Column(Text, nullable=False)  # Şifrelenmiş API key
     username = Column(Text, nullable=True)  # Şifrelenmiş username (MISP gibi)
@@ -92,5 +105,6 @@ class APIKey(Base):
 
     # Relationships
     # user = relationship("User", back_populates="api_keys")
-    # api_source = relationship("APISource", back_populates="api_keys")
+    # Her zaman selectinload ile yüklenmeli; unutulan bir lazy load N+1'e dönmesin diye raise
+    api_source = relationship("APISource", lazy="raise")
 
@@ -2,18 +2,35 @@
 
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, Float, String, Text
+from sqlalchemy import Column, Date, DateTime, Float, Index, String, Text, text
 from sqlalchemy.sql import func
 
-from app.db.base import Base, JSONType
+from app.db.base import UUID_SERVER_DEFAULT, Base, JSONType, UUIDType
 
 
 class CVECache(Base):
     """CVE Cache model - NIST NVD CVE verileri cache."""
 
     __tablename__ = "cve_cache"
-
-    id = Column(String, primary_key=True, index=True)  # UUID string
+    __table_args__ = (
+        # _check_cache (cve_id + cached_at) heap'e gitmeden index-only scan ile
+        Index("ix_cve_cache_cve_id_cached_at", "cve_id", "cached_at"),
+        # Süresi dolan satırları silen periyodik prune için
+        Index(
+            "ix_cve_cache_expires_at",
+            "expires_at",
+            postgresql_where=text("expires_at IS NOT NULL"),
+            sqlite_where=text("expires_at IS NOT NULL"),
+        ),
+        # Dashboard "son CVE'ler" (published_date DESC) ve stat view yenilemesi için
+        Index(
+            "ix_cve_cache_published_date",
+            "published_date",
+            postgresql_include=["cvss_v3_severity", "cvss_v2_severity"],
+        ),
+    )
+
+    id = Column(UUIDType, primary_key=True, server_default=UUID_SERVER_DEFAULT, index=True)  # UUID string
     cve_id = Column(String(50), unique=True, nullable=False, index=True)  # CVE-2024-1234
     description = Column(Text, nullable=True)  # CVE açıklaması
     cvss_v2_score = Column(Float, nullable=True)  # CVSS v2 skoru
@@ -1,9 +1,14 @@
+import asyncio
 from datetime import datetime, timezone
-from typing import List
+from typing import Dict, List, Tuple
 
 from app.schemas.ioc import IOCQueryRequest, IOCQueryResponse, IOCSourceResult
+from app.services.base_client import BaseThreatClient
 from app.services.client_registry import client_registry
 
+# Singleflight: aynı IOC için eşzamanlı sorgular tek bir upstream çağrısını paylaşır
+_inflight: Dict[Tuple[str, str, Tuple[str, ...]], "asyncio.Future[IOCQueryResponse]"] = {}
+
 
 class IOCQueryModel:
     def __init__(self, payload: IOCQueryRequest) -> None:
@@ -11,7 +16,34 @@ class IOCQueryModel:
         self.sources = payload.sources or client_registry.list_clients()
 
     async def execute(self) -> IOCQueryResponse:
+        key = (self.payload.ioc_type, self.payload.ioc_value, tuple(self.sources))
+        inflight = _inflight.get(key)
+        if inflight is not None:
+            # shield: bekleyen bir caller iptal edilirse paylaşılan sorgu iptal olmasın
+            return await asyncio.shield(inflight)
+
+        future: "asyncio.Future[IOCQueryResponse]" = asyncio.get_running_loop().create_future()
+        _inflight[key] = future
+        try:
+            response = await self._execute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Kimse beklemiyorsa "exception was never retrieved" uyarısını engelle
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            _inflight.pop(key, None)
+
+    async def _execute(self) -> IOCQueryResponse:
         results: List[IOCSourceResult] = []
+        # Lowercase vb. IOC başına bir kez; tüm client'lar paylaşır
+        ctx = BaseThreatClient.query_context(self.payload.ioc_value)
 
         for source_name in self.sources:
             client = client_registry.get(source_name)
@@ -25,7 +57,7 @@ class IOCQueryModel:
                 )
                 continue
 
-            raw = await client.query(self.payload.ioc_type, self.payload.ioc_value)
+            raw = await client.query(self.payload.ioc_type, self.payload.ioc_value, ctx)
             results.append(
                 IOCSourceResult(
                     source=source_name,
@@ -2,20 +2,30 @@
 
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db.base import Base, JSONType
+from app.db.base import UUID_SERVER_DEFAULT, Base, JSONType, UUIDType
 
 
 class IOCQuery(Base):
     """IOC Query model."""
 
     __tablename__ = "ioc_queries"
-
-    id = Column(String, primary_key=True, index=True)  # UUID string
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    __table_args__ = (
+        # Dashboard sayaç/trend/dağılım sorguları (user_id + query_date aralığı); PostgreSQL'de
+        # risk_score ve ioc_type INCLUDE ile index-only scan
+        Index(
+            "ix_ioc_queries_user_query_date",
+            "user_id",
+            "query_date",
+            postgresql_include=["risk_score", "ioc_type"],
+        ),
+    )
+
+    id = Column(UUIDType, primary_key=True, server_default=UUID_SERVER_DEFAULT, index=True)  # UUID string
+    user_id = Column(UUIDType, ForeignKey("users.id"), nullable=False, index=True)
     ioc_type = Column(String(50), nullable=False, index=True)  # ip, domain, url, hash
     ioc_value = Column(String(500), nullable=False, index=True)
     query_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -34,8 +44,8 @@ class ThreatIntelligenceData(Base):
 
     __tablename__ = "threat_intelligence_data"
 
-    id = Column(String, primary_key=True, index=True)  # UUID string
-    ioc_query_id = Column(String, ForeignKey("ioc_queries.id"), nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, server_default=UUID_SERVER_DEFAULT, index=True)  # UUID string
+    ioc_query_id = Column(UUIDType, ForeignKey("ioc_queries.id"), nullable=False, index=True)
     source_api = Column(String(100), nullable=False, index=True)  # VirusTotal, AbuseIPDB, vb.
     raw_data_json = Column(JSONType, nullable=True)  # Ham API yanıtı
     processed_data_json = Column(JSONType, nullable=True)  # İşlenmiş veri
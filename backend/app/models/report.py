@@ -3,11 +3,11 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db.base import Base, JSONType
+from app.db.base import UUID_SERVER_DEFAULT, Base, JSONType, UUIDType
 
 
 class ReportFormat(str, PyEnum):
@@ -22,9 +22,13 @@ class Report(Base):
     """Report model."""
 
     __tablename__ = "reports"
+    __table_args__ = (
+        # Kullanıcının en yeni raporları (dashboard son aktiviteler, rapor listesi): ORDER BY created_at DESC LIMIT
+        Index("ix_reports_user_created_at", "user_id", "created_at"),
+    )
 
-    id = Column(String, primary_key=True, index=True)  # UUID string
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, server_default=UUID_SERVER_DEFAULT, index=True)  # UUID string
+    user_id = Column(UUIDType, ForeignKey("users.id"), nullable=False, index=True)
     title = Column(String(200), nullable=False)  # Rapor başlığı
     description = Column(Text, nullable=True)  # Rapor açıklaması
     content = Column(Text, nullable=True)  # Rapor içeriği (HTML/JSON)
@@ -7,7 +7,7 @@ from sqlalchemy import Boolean, Column, DateTime, Enum, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db.base import Base, JSONType
+from app.db.base import UUID_SERVER_DEFAULT, Base, JSONType, UUIDType
 
 
 class UserRole(str, PyEnum):
@@ -23,7 +23,7 @@ class User(Base):
 
     __tablename__ = "users"
 
-    id = Column(String, primary_key=True, index=True)  # UUID string olarak saklanacak
+    id = Column(UUIDType, primary_key=True, server_default=UUID_SERVER_DEFAULT, index=True)  # UUID string olarak saklanacak
     username = Column(String(50), unique=True, index=True, nullable=False)
     email = Column(String(100), unique=True, index=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
@@ -3,11 +3,11 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.db.base import Base, JSONType
+from app.db.base import IS_POSTGRESQL, UUID_SERVER_DEFAULT, Base, JSONType, UUIDType
 
 
 class RiskThreshold(str, PyEnum):
@@ -32,8 +32,8 @@ class AssetWatchlist(Base):
 
     __tablename__ = "asset_watchlist"
 
-    id = Column(String, primary_key=True, index=True)  # UUID string
-    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, server_default=UUID_SERVER_DEFAULT, index=True)  # UUID string
+    user_id = Column(UUIDType, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(200), nullable=False)  # Watchlist adı
     description = Column(Text, nullable=True)  # Açıklama
     is_active = Column(Boolean, default=True, nullable=False)  # İzleme aktif/pasif
@@ -53,9 +53,19 @@ class AssetWatchlistItem(Base):
     """Asset Watchlist Item model."""
 
     __tablename__ = "asset_watchlist_items"
-
-    id = Column(String, primary_key=True, index=True)  # UUID string
-    watchlist_id = Column(String, ForeignKey("asset_watchlist.id"), nullable=False, index=True)
+    __table_args__ = (
+        # Dashboard yalnızca aktif item'ları sayar (risk dağılımı, watchlist sayaçları)
+        Index(
+            "ix_asset_watchlist_items_active_watchlist",
+            "watchlist_id",
+            "last_risk_score",
+            postgresql_where=text("is_active = true"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
+
+    id = Column(UUIDType, primary_key=True, server_default=UUID_SERVER_DEFAULT, index=True)  # UUID string
+    watchlist_id = Column(UUIDType, ForeignKey("asset_watchlist.id"), nullable=False, index=True)
     ioc_type = Column(String(50), nullable=False, index=True)  # ip, domain, url, hash
     ioc_value = Column(String(500), nullable=False, index=True)  # Asset değeri
     description = Column(Text, nullable=True)  # Asset açıklaması
@@ -68,19 +78,28 @@ class AssetWatchlistItem(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
-    # watchlist = relationship("AssetWatchlist", back_populates="items")
+    # Sahiplik kontrolleri için; her zaman joinedload/selectinload ile yüklenmeli (lazy load N+1'e dönmesin)
+    watchlist = relationship("AssetWatchlist", lazy="raise")
     # check_history = relationship("AssetCheckHistory", back_populates="watchlist_item")
     alerts = relationship("Alert", back_populates="asset", cascade="all, delete-orphan")
 
 
 class AssetCheckHistory(Base):
-    """Asset Check History model."""
+    """Asset Check History model.
+
+    PostgreSQL'de check_date üzerinden aylık RANGE partition olarak tutulur;
+    retention eski partition'ı DROP ederek yapılır (bkz. app.db.partitions).
+    Partition key primary key'e dahil olmak zorunda olduğu için orada PK (id, check_date).
+    """
 
     __tablename__ = "asset_check_history"
+    __table_args__ = ({"postgresql_partition_by": "RANGE (check_date)"},) if IS_POSTGRESQL else ()
 
-    id = Column(String, primary_key=True, index=True)  # UUID string
-    watchlist_item_id = Column(String, ForeignKey("asset_watchlist_items.id"), nullable=False, index=True)
-    check_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, server_default=UUID_SERVER_DEFAULT, index=True)  # UUID string
+    watchlist_item_id = Column(UUIDType, ForeignKey("asset_watchlist_items.id"), nullable=False, index=True)
+    check_date = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True, primary_key=IS_POSTGRESQL
+    )
     risk_score = Column(String(50), nullable=True)  # Risk skoru
     status = Column(Enum(IOCStatus), nullable=True)  # clean, suspicious, malicious
     threat_intelligence_data = Column(JSONType, nullable=True)  # Toplanan tehdit istihbaratı verileri
@@ -0,0 +1,83 @@
+"""msgspec mirrors of hot read-path row types.
+
+Pydantic modelleri OpenAPI şeması ve girdi doğrulaması için kaynak olmaya devam
+eder; buradaki Struct'lar yalnızca büyük liste yanıtlarını kurup encode etmek için.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import msgspec
+
+from app.schemas.base import page_count
+
+
+class IOCSourceResult(msgspec.Struct, frozen=True):
+    """Per-source result shown in history rows (upstream ``raw`` payload omitted)."""
+
+    source: str
+    status: str
+    risk_score: Optional[float] = None
+    description: Optional[str] = None
+
+
+class IOCQueryHistoryItem(msgspec.Struct):
+    id: str
+    ioc_type: str
+    ioc_value: str
+    query_date: Optional[str] = None
+    created_at: Optional[str] = None
+    risk_score: Optional[float] = None
+    status: Optional[str] = None
+    queried_sources: Optional[List[IOCSourceResult]] = None
+
+
+class IOCQueryHistoryPage(msgspec.Struct):
+    items: List[IOCQueryHistoryItem]
+    total: int
+    page: int
+    page_size: int
+    total_pages: int
+
+
+json_encoder = msgspec.json.Encoder()
+
+
+def build_history_page(result: Mapping[str, Any]) -> IOCQueryHistoryPage:
+    """Build a history page from ``IOCService.list_query_history`` output.
+
+    Aynı kaynak sonucu (source, status, risk_score, description) sayfadaki birçok
+    satırda tekrar ediyor; Struct'lar frozen olduğu için tek bir instance paylaşılır.
+    """
+    interned: Dict[Tuple[Any, ...], IOCSourceResult] = {}
+
+    def _source(data: Mapping[str, Any]) -> IOCSourceResult:
+        key = (data.get("source"), data.get("status"), data.get("risk_score"), data.get("description"))
+        cached = interned.get(key)
+        if cached is None:
+            cached = interned[key] = msgspec.convert(data, IOCSourceResult)
+        return cached
+
+    items = [
+        IOCQueryHistoryItem(
+            id=row["id"],
+            ioc_type=row["ioc_type"],
+            ioc_value=row["ioc_value"],
+            query_date=row["query_date"],
+            created_at=row["created_at"],
+            risk_score=row.get("risk_score"),
+            status=row.get("status"),
+            queried_sources=(
+                [_source(source) for source in row["queried_sources"]]
+                if row.get("queried_sources") is not None
+                else None
+            ),
+        )
+        for row in result["items"]
+    ]
+    return IOCQueryHistoryPage(
+        items=items,
+        total=result["total"],
+        page=result["page"],
+        page_size=result["page_size"],
+        total_pages=page_count(result["total"], result["page_size"]),
+    )
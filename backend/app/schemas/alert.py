@@ -6,6 +6,7 @@ from typing import List, Optional
 from pydantic import BaseModel, Field
 
 from app.models.alert import AlertSeverity, AlertType
+from app.schemas.base import TrustedConstructMixin
 
 
 class AlertBase(BaseModel):
@@ -31,7 +32,7 @@ class AlertUpdate(BaseModel):
     is_read: Optional[bool] = None
 
 
-class AlertResponse(AlertBase):
+class AlertResponse(TrustedConstructMixin, AlertBase):
     """Alert response schema."""
 
     id: str
@@ -49,10 +50,12 @@ class AlertListResponse(BaseModel):
     """Alert list response schema."""
 
     items: List[AlertResponse]
-    total: int
+    total: Optional[int] = None  # Only with include_total=true
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    has_next: bool = False
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
 
 
 class AlertStatsResponse(BaseModel):
@@ -1,16 +1,16 @@
 """API Key schemas."""
 
-from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SkipValidation
 
 from app.models.api_source import TestStatus, UpdateMode
+from app.schemas.base import TrustedConstructMixin
 
 
-class APIKeyBase(BaseModel):
-    """Base API Key schema."""
+class APIKeyCreate(BaseModel):
+    """API Key creation schema."""
 
     api_source_id: str = Field(..., description="API Source ID")
     api_key: Optional[str] = Field(None, description="API Key (will be encrypted, optional for APIs that don't require authentication)")
@@ -21,12 +21,6 @@ class APIKeyBase(BaseModel):
     is_active: bool = Field(default=True, description="Is API key active")
 
 
-class APIKeyCreate(APIKeyBase):
-    """API Key creation schema."""
-
-    pass
-
-
 class APIKeyUpdate(BaseModel):
     """API Key update schema."""
 
@@ -38,7 +32,7 @@ class APIKeyUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
-class APIKeyResponse(BaseModel):
+class APIKeyResponse(TrustedConstructMixin, BaseModel):
     """API Key response schema (without sensitive data)."""
 
     id: str
@@ -50,11 +44,11 @@ class APIKeyResponse(BaseModel):
     update_mode: UpdateMode
     is_active: bool
     test_status: TestStatus
-    last_test_date: Optional[datetime] = None
-    last_used: Optional[datetime] = None
+    last_test_date: Optional[str] = None
+    last_used: Optional[str] = None
     rate_limit: Optional[str] = None
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -73,18 +67,25 @@ class APIKeyTestResponse(BaseModel):
     success: bool
     message: str
     test_status: TestStatus
-    response_data: Optional[dict] = None
+    response_data: Optional[SkipValidation[dict]] = None  # Opaque upstream JSON
     error: Optional[str] = None
 
+    class Config:
+        # Seyrek çağrılan endpoint'ler: core schema import yerine ilk kullanımda kurulur
+        defer_build = True
+
 
 class APIKeyUpdateNowResponse(BaseModel):
     """API Key update now response schema."""
 
     success: bool
     message: str
-    updated_data: Optional[dict] = None
+    updated_data: Optional[SkipValidation[dict]] = None  # Opaque upstream JSON
     error: Optional[str] = None
 
+    class Config:
+        defer_build = True
+
 
 class APIKeyUpdateAllResponse(BaseModel):
     """API Key update all response schema."""
@@ -94,6 +95,9 @@ class APIKeyUpdateAllResponse(BaseModel):
     failed: int
     results: list[dict]  # List of update results
 
+    class Config:
+        defer_build = True
+
 
 
 
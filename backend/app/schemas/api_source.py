@@ -1,14 +1,40 @@
 """API Source schemas."""
 
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SkipValidation
 
 from app.models.api_source import APIType, AuthenticationType
+from app.schemas.base import TrustedConstructMixin
 
 
-class APISourceBase(BaseModel):
-    """Base API Source schema."""
+class RequestConfig(BaseModel):
+    """Request template configuration (placeholders: {api_key}, {ioc_type}, {ioc_value}, ...)."""
+
+    method: Optional[str] = Field(None, description="HTTP method (default: GET)")
+    endpoint_template: Optional[str] = Field(None, description="Endpoint path template")
+    # Sayı/bool gibi template olmayan sabit değerler de kabul edilir (ör. {"limit": 100})
+    headers: Optional[dict[str, Any]] = Field(None, description="Header templates")
+    query_params: Optional[dict[str, Any]] = Field(None, description="Query parameter templates")
+    body_template: Optional[SkipValidation[Union[str, dict[str, Any]]]] = Field(None, description="Body template")
+
+    class Config:
+        extra = "allow"
+
+
+class ResponseConfig(BaseModel):
+    """Response parsing configuration (JSONPath expressions)."""
+
+    risk_score_path: Optional[str] = Field(None, description="JSONPath to risk score")
+    status_path: Optional[str] = Field(None, description="JSONPath to status")
+    data_path: Optional[str] = Field(None, description="JSONPath to main data")
+
+    class Config:
+        extra = "allow"
+
+
+class APISourceCreate(BaseModel):
+    """API Source creation schema."""
 
     name: str = Field(..., min_length=1, max_length=100, description="API name (unique identifier)")
     display_name: str = Field(..., min_length=1, max_length=200, description="Display name")
@@ -18,18 +44,12 @@ class APISourceBase(BaseModel):
     documentation_url: Optional[str] = Field(None, max_length=500, description="Documentation URL")
     supported_ioc_types: list[str] = Field(default_factory=list, description="Supported IOC types: ip, domain, url, hash")
     authentication_type: AuthenticationType = Field(..., description="Authentication type")
-    request_config: Optional[dict[str, Any]] = Field(None, description="Request configuration")
-    response_config: Optional[dict[str, Any]] = Field(None, description="Response parsing configuration")
+    request_config: Optional[RequestConfig] = Field(None, description="Request configuration")
+    response_config: Optional[ResponseConfig] = Field(None, description="Response parsing configuration")
     rate_limit_config: Optional[dict[str, Any]] = Field(None, description="Rate limit configuration")
     is_active: bool = Field(default=True, description="Is API source active")
 
 
-class APISourceCreate(APISourceBase):
-    """API Source creation schema."""
-
-    pass
-
-
 class APISourceUpdate(BaseModel):
     """API Source update schema."""
 
@@ -39,13 +59,13 @@ class APISourceUpdate(BaseModel):
     documentation_url: Optional[str] = Field(None, max_length=500)
     supported_ioc_types: Optional[list[str]] = None
     authentication_type: Optional[AuthenticationType] = None
-    request_config: Optional[dict[str, Any]] = None
-    response_config: Optional[dict[str, Any]] = None
+    request_config: Optional[RequestConfig] = None
+    response_config: Optional[ResponseConfig] = None
     rate_limit_config: Optional[dict[str, Any]] = None
     is_active: Optional[bool] = None
 
 
-class APISourceResponse(BaseModel):
+class APISourceResponse(TrustedConstructMixin, BaseModel):
     """API Source response schema."""
 
     id: str
@@ -57,9 +77,10 @@ class APISourceResponse(BaseModel):
     documentation_url: Optional[str] = None
     supported_ioc_types: list[str]
     authentication_type: AuthenticationType
-    request_config: Optional[dict[str, Any]] = None
-    response_config: Optional[dict[str, Any]] = None
-    rate_limit_config: Optional[dict[str, Any]] = None
+    # DB'de saklanan config'ler olduğu gibi döner
+    request_config: Optional[SkipValidation[dict[str, Any]]] = None
+    response_config: Optional[SkipValidation[dict[str, Any]]] = None
+    rate_limit_config: Optional[SkipValidation[dict[str, Any]]] = None
     is_active: bool
     created_by: Optional[str] = None
     created_at: str
@@ -85,9 +106,12 @@ class APISourceTestResponse(BaseModel):
 
     success: bool
     message: str
-    response_data: Optional[dict[str, Any]] = None
+    response_data: Optional[SkipValidation[dict[str, Any]]] = None  # Opaque upstream JSON
     error: Optional[str] = None
 
+    class Config:
+        defer_build = True
+
 
 
 
@@ -2,7 +2,10 @@
 
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, Field
+
+from app.schemas.base import TrustedConstructMixin
+from app.schemas.types import Email
 
 
 class Token(BaseModel):
@@ -33,7 +36,7 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
-class UserResponse(BaseModel):
+class UserResponse(TrustedConstructMixin, BaseModel):
     """User response schema."""
 
     id: str
@@ -52,7 +55,7 @@ class UserProfileUpdate(BaseModel):
     """User profile update request schema."""
 
     full_name: Optional[str] = Field(None, max_length=200)
-    email: Optional[EmailStr] = None
+    email: Optional[Email] = None
 
 
 class ChangePasswordRequest(BaseModel):
@@ -61,3 +64,6 @@ class ChangePasswordRequest(BaseModel):
     current_password: str = Field(..., min_length=6)
     new_password: str = Field(..., min_length=6)
 
+    class Config:
+        defer_build = True
+
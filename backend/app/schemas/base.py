@@ -0,0 +1,33 @@
+"""Shared schema helpers."""
+
+from datetime import datetime
+from typing import Any, Mapping, Optional
+
+
+def page_count(total: int, page_size: int) -> int:
+    """Number of pages needed for ``total`` rows (0 when there are none)."""
+    return -(-total // page_size) if page_size > 0 else 0
+
+
+def iso_timestamp(value: Optional[datetime]) -> Optional[str]:
+    """Format a datetime the way Pydantic serializes it (UTC offset as ``Z``)."""
+    if value is None:
+        return None
+    return value.isoformat().replace("+00:00", "Z")
+
+
+class TrustedConstructMixin:
+    """Mixin for response schemas built from trusted database rows."""
+
+    @classmethod
+    def from_orm_trusted(cls, obj: Any):
+        """Build the model from an ORM row or response dict without validation.
+
+        Sadece DB'den okunan (yazılırken zaten doğrulanmış) veriler için;
+        kullanıcı girdisi için normal constructor kullanılmalı.
+        """
+        if isinstance(obj, Mapping):
+            data = {name: obj[name] for name in cls.model_fields if name in obj}
+        else:
+            data = {name: getattr(obj, name) for name in cls.model_fields if hasattr(obj, name)}
+        return cls.model_construct(_fields_set=set(data), **data)
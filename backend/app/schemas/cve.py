@@ -1,7 +1,10 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, computed_field
+
+from app.schemas.base import page_count
+from app.schemas.types import Severity
 
 
 class CVSSv2(BaseModel):
@@ -37,6 +40,11 @@ class AffectedProduct(BaseModel):
     product: Optional[str] = None
     version: Optional[str] = None
 
+    class Config:
+        # CVE başına yüzlerce üretilebiliyor: immutable, ekstra alan tutulmaz
+        frozen = True
+        extra = "ignore"
+
 
 class CVEBase(BaseModel):
     """CVE temel bilgileri."""
@@ -49,6 +57,9 @@ class CVEBase(BaseModel):
     cvss_v3: Optional[CVSSv3] = None
     cwe_id: Optional[str] = None
     affected_products: List[AffectedProduct] = Field(default_factory=list)
+    truncated_products: bool = Field(
+        default=False, description="affected_products limitte kesildi (NVD'de daha fazla eşleşme var)"
+    )
     references: List[CVEReference] = Field(default_factory=list)
 
 
@@ -66,7 +77,7 @@ class CVESearchRequest(BaseModel):
     keyword: Optional[str] = Field(None, description="Açıklamada keyword arama")
     cvss_v3_min: Optional[float] = Field(None, ge=0.0, le=10.0, description="Minimum CVSS v3 skoru")
     cvss_v3_max: Optional[float] = Field(None, ge=0.0, le=10.0, description="Maximum CVSS v3 skoru")
-    severity: Optional[str] = Field(None, description="Severity filtreleme (LOW, MEDIUM, HIGH, CRITICAL)")
+    severity: Optional[Severity] = Field(None, description="Severity filtreleme (LOW, MEDIUM, HIGH, CRITICAL)")
     year: Optional[int] = Field(None, description="Yıl filtresi (örn: 2024)")
     published_after: Optional[datetime] = Field(None, description="Bu tarihten sonra yayınlananlar")
     published_before: Optional[datetime] = Field(None, description="Bu tarihten önce yayınlananlar")
@@ -80,12 +91,31 @@ class CVESearchResponse(BaseModel):
     total: int
     limit: int
     offset: int
-    total_pages: Optional[int] = None
     cves: List[CVE]
 
+    @computed_field
+    @property
+    def total_pages(self) -> int:
+        # Boş sonuçta da 1 sayfa gösteriliyor
+        return page_count(self.total, self.limit) or 1
+
+
+class CVESearchCacheEntry(BaseModel):
+    """Redis'te tutulan arama sonucu; soft_expires_at sonrası bayat kabul edilir."""
+
+    soft_expires_at: float  # unix timestamp
+    data: CVESearchResponse
+
 
 class CVEDetailResponse(BaseModel):
     """CVE detay yanıtı."""
 
     cve: CVE
 
+    class Config:
+        defer_build = True
+
+
+CVE_LIST_ADAPTER = TypeAdapter(List[CVE])
+AFFECTED_PRODUCT_LIST_ADAPTER = TypeAdapter(List[AffectedProduct])
+CVE_REFERENCE_LIST_ADAPTER = TypeAdapter(List[CVEReference])
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SkipValidation
 
 
 class DashboardStats(BaseModel):
@@ -29,41 +29,36 @@ class RiskDistribution(BaseModel):
     unknown: int = Field(0, description="Unknown risk count")
 
 
-class APIDistribution(BaseModel):
-    """API usage distribution."""
+class APIDistributionSeries(BaseModel):
+    """API usage distribution as parallel arrays (one entry per source)."""
 
-    source: str = Field(..., description="API source name")
-    count: int = Field(0, description="Usage count")
-    percentage: float = Field(0.0, description="Usage percentage")
-
-
-class IOCTypeDistribution(BaseModel):
-    """IOC type distribution."""
+    sources: List[str] = Field(default_factory=list, description="API source names")
+    counts: List[int] = Field(default_factory=list, description="Usage count per source")
+    percentages: List[float] = Field(default_factory=list, description="Usage percentage per source")
 
-    ioc_type: str = Field(..., description="IOC type: ip, domain, url, hash")
-    count: int = Field(0, description="Count")
-    percentage: float = Field(0.0, description="Percentage")
 
+class IOCTypeDistributionSeries(BaseModel):
+    """IOC type distribution as parallel arrays (one entry per type)."""
 
-class QueryTrend(BaseModel):
-    """IOC query trend data."""
+    ioc_types: List[str] = Field(default_factory=list, description="IOC types: ip, domain, url, hash")
+    counts: List[int] = Field(default_factory=list, description="Count per IOC type")
+    percentages: List[float] = Field(default_factory=list, description="Percentage per IOC type")
 
-    date: str = Field(..., description="Date (YYYY-MM-DD)")
-    count: int = Field(0, description="Query count for this date")
 
+class TrendSeries(BaseModel):
+    """Daily trend as parallel arrays; used for IOC query and CVE publication trends."""
 
-class CVETrend(BaseModel):
-    """CVE publication trend data."""
+    dates: List[str] = Field(default_factory=list, description="Dates (YYYY-MM-DD)")
+    counts: List[int] = Field(default_factory=list, description="Count per date")
 
-    date: str = Field(..., description="Date (YYYY-MM-DD)")
-    count: int = Field(0, description="CVE count for this date")
 
+class CVSSDistributionSeries(BaseModel):
+    """CVSS score distribution as parallel arrays (one entry per score range)."""
 
-class CVSSDistribution(BaseModel):
-    """CVSS score distribution."""
-
-    score_range: str = Field(..., description="Score range: 0.0-2.0, 2.1-4.0, 4.1-6.0, 6.1-8.0, 8.1-10.0")
-    count: int = Field(0, description="Count of CVEs in this range")
+    ranges: List[str] = Field(
+        default_factory=list, description="Score ranges: 0.0-2.0, 2.1-4.0, 4.1-6.0, 6.1-8.0, 8.1-10.0"
+    )
+    counts: List[int] = Field(default_factory=list, description="Count of CVEs per range")
 
 
 class RecentActivity(BaseModel):
@@ -72,8 +67,8 @@ class RecentActivity(BaseModel):
     type: str = Field(..., description="Activity type: ioc_query, cve, watchlist, report")
     title: str = Field(..., description="Activity title")
     description: Optional[str] = Field(None, description="Activity description")
-    timestamp: datetime = Field(..., description="Activity timestamp")
-    metadata: Optional[dict] = Field(None, description="Additional metadata")
+    timestamp: str = Field(..., description="Activity timestamp (ISO 8601)")
+    metadata: Optional[SkipValidation[dict]] = Field(None, description="Additional metadata")
 
 
 class WatchlistSummary(BaseModel):
@@ -93,7 +88,7 @@ class APIStatus(BaseModel):
     usage_today: Optional[int] = Field(None, description="Usage today")
     limit: Optional[int] = Field(None, description="Daily limit")
     status: str = Field("unknown", description="Status: active, warning, error")
-    last_used: Optional[datetime] = Field(None, description="Last used time")
+    last_used: Optional[str] = Field(None, description="Last used time (ISO 8601)")
 
 
 class CVESummary(BaseModel):
@@ -111,16 +106,16 @@ class DashboardResponse(BaseModel):
 
     stats: DashboardStats
     risk_distribution: RiskDistribution
-    api_distribution: List[APIDistribution]
-    ioc_type_distribution: List[IOCTypeDistribution]
-    query_trend: List[QueryTrend]
+    api_distribution: APIDistributionSeries
+    ioc_type_distribution: IOCTypeDistributionSeries
+    query_trend: TrendSeries
     recent_activities: List[RecentActivity]
     watchlist_summary: WatchlistSummary
     api_status: List[APIStatus]
     cve_summary: Optional[CVESummary] = Field(None, description="CVE summary information")
-    cve_trend: Optional[List[CVETrend]] = Field(None, description="CVE publication trend (last 7 days)")
-    cvss_distribution: Optional[List[CVSSDistribution]] = Field(None, description="CVSS score distribution")
-    generated_at: datetime = Field(default_factory=lambda: datetime.now())
+    cve_trend: Optional[TrendSeries] = Field(None, description="CVE publication trend (last 7 days)")
+    cvss_distribution: Optional[CVSSDistributionSeries] = Field(None, description="CVSS score distribution")
+    generated_at: datetime = Field(default_factory=datetime.now)
 
 
 class ChartDataRequest(BaseModel):
@@ -129,3 +124,6 @@ class ChartDataRequest(BaseModel):
     chart_type: str = Field(..., description="Chart type: risk_distribution, api_usage, query_trend")
     days: int = Field(default=7, ge=1, le=30, description="Number of days for trend data")
 
+    class Config:
+        defer_build = True
+
@@ -10,3 +10,6 @@ class AppInfo(BaseModel):
     api_prefix: str
     docs_url: str | None
     timestamp: datetime
+
+    class Config:
+        defer_build = True
@@ -1,11 +1,14 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SkipValidation, computed_field
+
+from app.schemas.base import TrustedConstructMixin, page_count
+from app.schemas.types import IOCType
 
 
 class IOCQueryRequest(BaseModel):
-    ioc_type: str = Field(..., description="IOC tipi: ip | domain | url | hash")
+    ioc_type: IOCType = Field(..., description="IOC tipi: ip | domain | url | hash | email | cve")
     ioc_value: str = Field(..., description="IOC değeri")
     sources: Optional[List[str]] = Field(
         default=None,
@@ -13,12 +16,17 @@ class IOCQueryRequest(BaseModel):
     )
 
 
-class IOCSourceResult(BaseModel):
+class IOCSourceResult(TrustedConstructMixin, BaseModel):
     source: str
     status: str
     risk_score: Optional[float] = None
     description: Optional[str] = None
-    raw: Optional[dict] = None
+    raw: Optional[SkipValidation[dict]] = None  # Opaque upstream JSON
+
+    class Config:
+        # Her kaynak için bir tane; cache'ten ve geçmişten toplu üretiliyor
+        frozen = True
+        extra = "ignore"
 
 
 class IOCQueryResponse(BaseModel):
@@ -29,7 +37,7 @@ class IOCQueryResponse(BaseModel):
     queried_at: datetime
 
 
-class IOCQueryHistoryItem(BaseModel):
+class IOCQueryHistoryItem(TrustedConstructMixin, BaseModel):
     """IOC query history item for list view."""
 
     id: str
@@ -37,8 +45,9 @@ class IOCQueryHistoryItem(BaseModel):
     ioc_value: str
     risk_score: Optional[float] = None
     status: Optional[str] = None
-    query_date: datetime
-    created_at: datetime
+    # Servis katmanında bir kez ISO string'e çevriliyor
+    query_date: Optional[str] = None
+    created_at: Optional[str] = None
     queried_sources: Optional[List[IOCSourceResult]] = None  # Sources that reported this risk
 
 
@@ -49,7 +58,12 @@ class IOCQueryHistoryListResponse(BaseModel):
     total: int
     page: int
     page_size: int
-    total_pages: int
+
+    @computed_field
+    @property
+    def total_pages(self) -> int:
+        # total/page_size'dan türetiliyor; input olarak doğrulanmıyor
+        return page_count(self.total, self.page_size)
 
 
 class IOCQueryDetailResponse(BaseModel):
@@ -61,6 +75,6 @@ class IOCQueryDetailResponse(BaseModel):
     risk_score: Optional[float] = None
     status: Optional[str] = None
     query_date: datetime
-    results: dict  # Full results_json from database
-    threat_intelligence_data: List[dict]  # Related threat intelligence data
+    results: SkipValidation[dict]  # Full results_json from database
+    threat_intelligence_data: SkipValidation[List[dict]]  # Related threat intelligence data
     created_at: datetime
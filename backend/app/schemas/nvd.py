@@ -0,0 +1,79 @@
+"""msgspec mirrors of the NIST NVD API v2 CVE response.
+
+Yalnızca CVEService'in okuduğu alanlar tanımlı; geri kalan her şey decode sırasında
+atlanır (sayfa başına ~2k CVE'lik gövdelerde ara dict ağacı kurulmaz).
+"""
+
+from typing import List, Optional
+
+import msgspec
+
+
+class NvdLangString(msgspec.Struct):
+    lang: str = ""
+    value: str = ""
+
+
+class NvdCvssData(msgspec.Struct):
+    vectorString: Optional[str] = None
+    baseScore: Optional[float] = None
+    baseSeverity: Optional[str] = None
+
+
+class NvdCvssMetric(msgspec.Struct):
+    cvssData: NvdCvssData = msgspec.field(default_factory=NvdCvssData)
+    # v2'de severity cvssData dışında, metric seviyesinde
+    baseSeverity: Optional[str] = None
+
+
+class NvdMetrics(msgspec.Struct):
+    cvssMetricV31: List[NvdCvssMetric] = []
+    cvssMetricV30: List[NvdCvssMetric] = []
+    cvssMetricV2: List[NvdCvssMetric] = []
+
+
+class NvdWeakness(msgspec.Struct):
+    description: List[NvdLangString] = []
+
+
+class NvdCpeMatch(msgspec.Struct):
+    criteria: str = ""
+
+
+class NvdNode(msgspec.Struct):
+    cpeMatch: List[NvdCpeMatch] = []
+
+
+class NvdConfiguration(msgspec.Struct):
+    nodes: List[NvdNode] = []
+
+
+class NvdReference(msgspec.Struct):
+    url: str = ""
+    source: str = ""
+    tags: List[str] = []
+
+
+class NvdCve(msgspec.Struct):
+    id: str = ""
+    descriptions: List[NvdLangString] = []
+    published: Optional[str] = None
+    lastModified: Optional[str] = None
+    metrics: NvdMetrics = msgspec.field(default_factory=NvdMetrics)
+    weaknesses: List[NvdWeakness] = []
+    configurations: List[NvdConfiguration] = []
+    references: List[NvdReference] = []
+
+
+class NvdVulnerability(msgspec.Struct):
+    cve: NvdCve = msgspec.field(default_factory=NvdCve)
+
+
+class NvdResponse(msgspec.Struct):
+    # Tek bir bozuk kayıt tüm sayfayı düşürmesin: öğeler ayrı ayrı decode edilir
+    vulnerabilities: List[msgspec.Raw] = []
+    totalResults: Optional[int] = None
+
+
+NVD_RESPONSE_DECODER = msgspec.json.Decoder(NvdResponse)
+NVD_VULNERABILITY_DECODER = msgspec.json.Decoder(NvdVulnerability)
@@ -3,7 +3,10 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field
+
+from app.schemas.base import TrustedConstructMixin, page_count
+from app.schemas.types import ExportFormat, ReportFormat, RiskLevel
 
 
 class ReportCreate(BaseModel):
@@ -14,11 +17,11 @@ class ReportCreate(BaseModel):
     ioc_query_ids: Optional[List[str]] = Field(
         None, description="List of IOC query IDs to include in the report"
     )
-    format: str = Field(default="PDF", description="Report format: PDF, HTML, or JSON")
+    format: ReportFormat = Field(default="PDF", description="Report format: PDF, HTML, or JSON")
     # Filter options for IOC queries
     watchlist_id: Optional[str] = Field(None, description="Filter by watchlist ID")
     ioc_type: Optional[str] = Field(None, description="Filter by IOC type")
-    risk_level: Optional[str] = Field(None, description="Filter by risk level (low, medium, high, critical, unknown)")
+    risk_level: Optional[RiskLevel] = Field(None, description="Filter by risk level (low, medium, high, critical, unknown)")
     start_date: Optional[datetime] = Field(None, description="Filter by start date (ISO format)")
     end_date: Optional[datetime] = Field(None, description="Filter by end date (ISO format)")
     source: Optional[str] = Field(None, description="Filter by API source")
@@ -29,10 +32,10 @@ class ReportUpdate(BaseModel):
 
     title: Optional[str] = Field(None, description="Report title", max_length=200)
     description: Optional[str] = Field(None, description="Report description")
-    format: Optional[str] = Field(None, description="Report format: PDF, HTML, or JSON")
+    format: Optional[ReportFormat] = Field(None, description="Report format: PDF, HTML, or JSON")
 
 
-class ReportResponse(BaseModel):
+class ReportResponse(TrustedConstructMixin, BaseModel):
     """Report response model."""
 
     id: str
@@ -43,8 +46,8 @@ class ReportResponse(BaseModel):
     format: str
     shared_link: Optional[str] = None
     ioc_query_ids: Optional[List[str]] = None
-    created_at: datetime
-    updated_at: datetime
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
 
 
 class ReportListResponse(BaseModel):
@@ -54,21 +57,28 @@ class ReportListResponse(BaseModel):
     total: int
     page: int
     page_size: int
-    total_pages: int
+
+    @computed_field
+    @property
+    def total_pages(self) -> int:
+        return page_count(self.total, self.page_size)
 
 
 class ReportShareRequest(BaseModel):
     """Request schema for sharing report with users."""
     user_ids: List[str] = Field(..., description="List of user IDs to share the report with")
 
+    class Config:
+        defer_build = True
+
 
 class ReportExportRequest(BaseModel):
     """Report export request."""
 
-    format: str = Field(default="PDF", description="Export format: PDF, HTML, JSON, or CSV")
+    format: ExportFormat = Field(default="PDF", description="Export format: PDF, HTML, JSON, or CSV")
     include_raw_data: bool = Field(default=False, description="Include raw IOC data in export")
 
-
-
+    class Config:
+        defer_build = True
 
 
@@ -0,0 +1,40 @@
+"""Shared constrained field types for request schemas.
+
+Her alias bir kez tanımlanır ve tüm alanlarda paylaşılır; servisler zaten
+büyük/küçük harf normalize ettiği için girdi aynı şekilde normalize edilir.
+"""
+
+from typing import Annotated, Literal
+from uuid import UUID
+
+from pydantic import AfterValidator, BeforeValidator, WithJsonSchema
+
+
+def _lower(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+def _upper(value):
+    return value.upper() if isinstance(value, str) else value
+
+
+def _validate_email(value: str) -> str:
+    # EmailStr email-validator'ı model tanımında import ediyor; burada ilk doğrulamaya kadar erteleniyor
+    from pydantic.networks import validate_email
+
+    return validate_email(value)[1]
+
+
+def _canonical_uuid(value: str) -> str:
+    # Native uuid kolonlarına geçersiz literal gitmesin; id'ler DB'deki küçük harfli tireli biçimde
+    return str(UUID(value))
+
+
+IOCType = Annotated[Literal["ip", "domain", "url", "hash", "email", "cve"], BeforeValidator(_lower)]
+Severity = Annotated[Literal["LOW", "MEDIUM", "HIGH", "CRITICAL"], BeforeValidator(_upper)]
+RiskLevel = Annotated[Literal["low", "medium", "high", "critical", "unknown"], BeforeValidator(_lower)]
+ReportFormat = Annotated[Literal["PDF", "HTML", "JSON"], BeforeValidator(_upper)]
+ExportFormat = Annotated[Literal["PDF", "HTML", "JSON", "CSV"], BeforeValidator(_upper)]
+Role = Annotated[Literal["admin", "analyst", "viewer"], BeforeValidator(_lower)]
+Email = Annotated[str, AfterValidator(_validate_email), WithJsonSchema({"type": "string", "format": "email"})]
+UUIDStr = Annotated[str, AfterValidator(_canonical_uuid), WithJsonSchema({"type": "string", "format": "uuid"})]
@@ -2,10 +2,12 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID, uuid4
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SkipValidation, TypeAdapter
 
+from app.schemas.base import TrustedConstructMixin
 
-class WatchlistAsset(BaseModel):
+
+class WatchlistAsset(TrustedConstructMixin, BaseModel):
     id: UUID = Field(default_factory=uuid4)
     ioc_type: str
     ioc_value: str
@@ -28,7 +30,7 @@ class WatchlistCreate(WatchlistBase):
     assets: List[WatchlistAsset] = Field(default_factory=list)
 
 
-class Watchlist(WatchlistBase):
+class Watchlist(TrustedConstructMixin, WatchlistBase):
     id: UUID
     is_active: bool = True
     created_at: datetime
@@ -44,10 +46,10 @@ class WatchlistListResponse(BaseModel):
 class AssetCheckHistory(BaseModel):
     """Asset check history response schema."""
     id: str
-    check_date: datetime
+    check_date: str  # ISO 8601
     risk_score: Optional[str] = None
     status: Optional[str] = None
-    threat_intelligence_data: Optional[dict] = None
+    threat_intelligence_data: Optional[SkipValidation[dict]] = None
     sources_checked: Optional[List[str]] = None
     alert_triggered: bool = False
 
@@ -59,8 +61,15 @@ class WatchlistShareRequest(BaseModel):
     """Request schema for sharing watchlist with users."""
     user_ids: List[str] = Field(..., description="List of user IDs to share the watchlist with")
 
+    class Config:
+        defer_build = True
+
 
 class AssetCheckHistoryListResponse(BaseModel):
     """Asset check history list response."""
     items: List[AssetCheckHistory]
     total: int
+
+
+WATCHLIST_LIST_ADAPTER = TypeAdapter(List[Watchlist])
+CHECK_HISTORY_LIST_ADAPTER = TypeAdapter(List[AssetCheckHistory])
@@ -1,12 +1,16 @@
 """Alert service - alert management and notifications."""
 
+import base64
+import time
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import uuid4
 
-from sqlalchemy import and_, func, or_
+import orjson
+from sqlalchemy import and_, case, func, or_
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models.alert import Alert, AlertSeverity, AlertType
 from app.schemas.alert import (
     AlertCreate,
@@ -15,6 +19,26 @@ from app.schemas.alert import (
     AlertStatsResponse,
     AlertUpdate,
 )
+from app.services.cache import alert_count_cache
+
+# get_stats kırılımlarının anahtarları; enum'lar her çağrıda yeniden gezilmesin
+_SEVERITY_KEYS = tuple(severity.value for severity in AlertSeverity)
+_TYPE_KEYS = tuple(alert_type.value for alert_type in AlertType)
+
+# list_alerts_raw'un seçtiği kolonlar (AlertResponse alanları, metadata ham JSON olarak)
+_RAW_COLUMNS = (
+    Alert.id,
+    Alert.user_id,
+    Alert.watchlist_id,
+    Alert.asset_id,
+    Alert.alert_type,
+    Alert.severity,
+    Alert.title,
+    Alert.message,
+    Alert.metadata_json,
+    Alert.is_read,
+    Alert.created_at,
+)
 
 
 class AlertService:
@@ -29,13 +53,11 @@ class AlertService:
         alert_data: AlertCreate,
     ) -> AlertResponse:
         """Create a new alert."""
-        import json
-
         metadata_json_str = None
         if alert_data.metadata:
             try:
-                metadata_json_str = json.dumps(alert_data.metadata)
-            except (TypeError, ValueError):
+                metadata_json_str = orjson.dumps(alert_data.metadata).decode()
+            except TypeError:
                 metadata_json_str = None
 
         alert = Alert(
@@ -54,6 +76,7 @@ class AlertService:
         self.db.add(alert)
         self.db.commit()
         self.db.refresh(alert)
+        alert_count_cache.invalidate_user(user_id)
         return self._to_response(alert)
 
     def list_alerts(
@@ -64,9 +87,79 @@ class AlertService:
         severity: Optional[AlertSeverity] = None,
         page: int = 1,
         page_size: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
     ) -> AlertListResponse:
-        """List alerts for a user."""
-        query = self.db.query(Alert).filter(Alert.user_id == user_id)
+        """List alerts for a user, newest first.
+
+        ``cursor`` (the previous response's ``next_cursor``) seeks on
+        (created_at, id); ``page`` is the deprecated OFFSET fallback.
+        ``total``/``total_pages`` are only computed when ``include_total`` is set;
+        ``has_next`` is always available. Raises ValueError for a malformed cursor.
+        """
+        alerts, total, total_pages, has_next = self._page_rows(
+            (Alert,), user_id, is_read, alert_type, severity, page, page_size, cursor, include_total
+        )
+        return AlertListResponse(
+            items=[self._to_response(alert) for alert in alerts],
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=total_pages,
+            has_next=has_next,
+            next_cursor=self._encode_cursor(alerts[-1]) if has_next else None,
+        )
+
+    def list_alerts_raw(
+        self,
+        user_id: str,
+        is_read: Optional[bool] = None,
+        alert_type: Optional[AlertType] = None,
+        severity: Optional[AlertSeverity] = None,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = False,
+    ) -> dict:
+        """Same page as ``list_alerts`` as plain dicts, ready for orjson.
+
+        ORM nesnesi ve pydantic modeli kurulmaz; metadata_json zaten JSON olduğu
+        için parse edilmeden orjson.Fragment olarak yanıta gömülür.
+        """
+        rows, total, total_pages, has_next = self._page_rows(
+            _RAW_COLUMNS, user_id, is_read, alert_type, severity, page, page_size, cursor, include_total
+        )
+        items = []
+        for row in rows:
+            item = dict(row._mapping)
+            metadata_json = item.pop("metadata_json")
+            item["metadata"] = orjson.Fragment(metadata_json) if metadata_json else None
+            items.append(item)
+
+        return {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "has_next": has_next,
+            "next_cursor": self._encode_cursor(rows[-1]) if has_next else None,
+        }
+
+    def _page_rows(
+        self,
+        entities: tuple,
+        user_id: str,
+        is_read: Optional[bool],
+        alert_type: Optional[AlertType],
+        severity: Optional[AlertSeverity],
+        page: int,
+        page_size: int,
+        cursor: Optional[str],
+        include_total: bool,
+    ) -> Tuple[list, Optional[int], Optional[int], bool]:
+        """Fetch one page of ``entities`` rows; returns (rows, total, total_pages, has_next)."""
+        query = self.db.query(*entities).filter(Alert.user_id == user_id)
 
         if is_read is not None:
             query = query.filter(Alert.is_read == is_read)
@@ -75,29 +168,58 @@ class AlertService:
         if severity:
             query = query.filter(Alert.severity == severity)
 
-        total = query.count()
-        total_pages = (total + page_size - 1) // page_size if total > 0 else 1
-
-        alerts = (
-            query.order_by(Alert.created_at.desc())
-            .offset((page - 1) * page_size)
-            .limit(page_size)
+        total = None
+        total_pages = None
+        if include_total:
+            # Sayfa gezinirken aynı filtre için COUNT'u tekrar tekrar çalıştırma
+            count_key = (user_id, is_read, alert_type, severity)
+            total = alert_count_cache.get(count_key)
+            if total is None:
+                total = query.count()
+                alert_count_cache.set(count_key, total)
+            total_pages = (total + page_size - 1) // page_size if total > 0 else 1
+
+        if cursor is not None:
+            cursor_created_at, cursor_id = self._decode_cursor(cursor)
+            query = query.filter(
+                or_(
+                    Alert.created_at < cursor_created_at,
+                    and_(Alert.created_at == cursor_created_at, Alert.id < cursor_id),
+                )
+            )
+            offset = 0
+        else:
+            offset = (page - 1) * page_size
+
+        # Bir fazla satır: sonraki sayfa var mı anlamak için
+        rows = (
+            query.order_by(Alert.created_at.desc(), Alert.id.desc())
+            .offset(offset)
+            .limit(page_size + 1)
             .all()
         )
-
-        return AlertListResponse(
-            items=[self._to_response(alert) for alert in alerts],
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages,
-        )
+        return rows[:page_size], total, total_pages, len(rows) > page_size
+
+    @staticmethod
+    def _encode_cursor(alert) -> str:
+        """Opaque keyset cursor for the position after ``alert`` (ORM object or row)."""
+        raw = f"{alert.created_at.isoformat()}|{alert.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        try:
+            created_at, alert_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+            return datetime.fromisoformat(created_at), alert_id
+        except ValueError as e:
+            # binascii.Error ve UnicodeDecodeError da ValueError alt sınıfı
+            raise ValueError("Invalid cursor") from e
 
     def get_alert(self, alert_id: str, user_id: str) -> Optional[AlertResponse]:
         """Get alert by ID."""
         alert = (
             self.db.query(Alert)
-            .filter(and_(Alert.id == alert_id, Alert.user_id == user_id))
+            .filter(Alert.user_id == user_id, Alert.id == alert_id)
             .first()
         )
         return self._to_response(alert) if alert else None
@@ -109,20 +231,16 @@ class AlertService:
         alert_data: AlertUpdate,
     ) -> Optional[AlertResponse]:
         """Update an alert."""
-        alert = (
-            self.db.query(Alert)
-            .filter(and_(Alert.id == alert_id, Alert.user_id == user_id))
-            .first()
-        )
-        if not alert:
-            return None
-
+        owned = self.db.query(Alert).filter(Alert.user_id == user_id, Alert.id == alert_id)
         if alert_data.is_read is not None:
-            alert.is_read = alert_data.is_read
+            # Sahiplik kontrolü UPDATE'in WHERE'inde; önce satırı okumaya gerek yok
+            if not owned.update({"is_read": alert_data.is_read}, synchronize_session=False):
+                return None
+            self.db.commit()
+            alert_count_cache.invalidate_user(user_id)
 
-        self.db.commit()
-        self.db.refresh(alert)
-        return self._to_response(alert)
+        alert = owned.populate_existing().first()
+        return self._to_response(alert) if alert else None
 
     def mark_as_read(self, alert_id: str, user_id: str) -> Optional[AlertResponse]:
         """Mark an alert as read."""
@@ -135,58 +253,119 @@ class AlertService:
     def mark_all_as_read(self, user_id: str) -> int:
         """Mark all alerts as read for a user."""
         from loguru import logger
-        
-        # Get count before update
-        unread_count = (
-            self.db.query(Alert)
-            .filter(and_(Alert.user_id == user_id, Alert.is_read == False))
-            .count()
-        )
-        
-        logger.info(f"Marking all alerts as read for user {user_id}. Unread count: {unread_count}")
-        
-        # Update all unread alerts
-        updated = (
-            self.db.query(Alert)
-            .filter(and_(Alert.user_id == user_id, Alert.is_read == False))
-            .update({"is_read": True}, synchronize_session=False)
+
+        settings = get_settings()
+        batch_size = max(1, settings.alert_mark_read_batch_size)
+        deadline = (
+            time.monotonic() + settings.alert_mark_read_max_seconds
+            if settings.alert_mark_read_max_seconds > 0
+            else None
         )
-        self.db.commit()
+
+        # Tek dev UPDATE yerine id parçaları halinde güncelle; her batch ayrı commit edilir
+        # ki satır kilitleri kısa sürsün
+        updated = 0
+        while True:
+            ids = [
+                row.id
+                for row in self.db.query(Alert.id)
+                .filter(Alert.user_id == user_id, ~Alert.is_read)
+                .limit(batch_size)
+                .all()
+            ]
+            if not ids:
+                break
+            updated += (
+                self.db.query(Alert)
+                .filter(Alert.id.in_(ids))
+                .update({"is_read": True}, synchronize_session=False)
+            )
+            self.db.commit()
+            if len(ids) < batch_size:
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(f"mark_all_as_read for user {user_id} stopped after {updated} alerts (time cap)")
+                break
+
+        alert_count_cache.invalidate_user(user_id)
         
         logger.info(f"Marked {updated} alerts as read for user {user_id}")
         return updated
 
+    def bulk_update_alerts(self, user_id: str, mappings: List[dict]) -> int:
+        """Apply column updates to many alerts of a user without loading ORM objects.
+
+        Each mapping needs the alert ``id`` plus the columns to set, e.g.
+        ``{"id": ..., "is_read": True}``. Alerts not owned by the user are skipped.
+        Returns the number of alerts updated.
+        """
+        batch_size = max(1, get_settings().alert_mark_read_batch_size)
+        updated = 0
+        for start in range(0, len(mappings), batch_size):
+            chunk = mappings[start:start + batch_size]
+            owned = {
+                row.id
+                for row in self.db.query(Alert.id)
+                .filter(Alert.user_id == user_id, Alert.id.in_([m["id"] for m in chunk]))
+                .all()
+            }
+            chunk = [m for m in chunk if m["id"] in owned]
+            if chunk:
+                self.db.bulk_update_mappings(Alert, chunk)
+                self.db.commit()
+                updated += len(chunk)
+
+        alert_count_cache.invalidate_user(user_id)
+        return updated
+
     def delete_alert(self, alert_id: str, user_id: str) -> bool:
         """Delete an alert."""
-        alert = (
+        deleted = (
             self.db.query(Alert)
-            .filter(and_(Alert.id == alert_id, Alert.user_id == user_id))
-            .first()
+            .filter(Alert.user_id == user_id, Alert.id == alert_id)
+            .delete(synchronize_session=False)
         )
-        if not alert:
+        if not deleted:
             return False
 
-        self.db.delete(alert)
         self.db.commit()
+        alert_count_cache.invalidate_user(user_id)
         return True
 
     def get_stats(self, user_id: str) -> AlertStatsResponse:
         """Get alert statistics for a user."""
-        query = self.db.query(Alert).filter(Alert.user_id == user_id)
-
-        total = query.count()
-        unread = query.filter(Alert.is_read == False).count()
+        user_filter = Alert.user_id == user_id
+
+        # Her kova için ayrı COUNT yerine: toplam + okunmamış tek sorguda, kırılımlar GROUP BY ile
+        total, unread = (
+            self.db.query(
+                func.count(Alert.id),
+                func.coalesce(func.sum(case((~Alert.is_read, 1), else_=0)), 0),
+            )
+            .filter(user_filter)
+            .one()
+        )
 
         # By severity
-        by_severity = {}
-        for severity in AlertSeverity:
-            count = query.filter(Alert.severity == severity).count()
+        by_severity = dict.fromkeys(_SEVERITY_KEYS, 0)
+        severity_rows = (
+            self.db.query(Alert.severity, func.count(Alert.id))
+            .filter(user_filter)
+            .group_by(Alert.severity)
+            .all()
+        )
+        for severity, count in severity_rows:
             by_severity[severity.value] = count
 
         # By type
-        by_type = {}
-        for alert_type in AlertType:
-            count = query.filter(Alert.alert_type == alert_type).count()
+        by_type = dict.fromkeys(_TYPE_KEYS, 0)
+        type_rows = (
+            self.db.query(Alert.alert_type, func.count(Alert.id))
+            .filter(user_filter)
+            .group_by(Alert.alert_type)
+            .all()
+        )
+        for alert_type, count in type_rows:
             by_type[alert_type.value] = count
 
         return AlertStatsResponse(
@@ -198,31 +377,30 @@ class AlertService:
 
     def _to_response(self, alert: Alert) -> AlertResponse:
         """Convert Alert model to response schema."""
-        import json
-
         metadata = None
         if alert.metadata_json:
             try:
                 # metadata_json is already a JSON string, parse it
                 if isinstance(alert.metadata_json, str):
-                    metadata = json.loads(alert.metadata_json)
+                    metadata = orjson.loads(alert.metadata_json)
                 else:
                     metadata = alert.metadata_json
-            except (json.JSONDecodeError, TypeError) as e:
+            except (orjson.JSONDecodeError, TypeError) as e:
                 # If parsing fails, return None
                 metadata = None
 
-        return AlertResponse(
-            id=str(alert.id),
-            user_id=str(alert.user_id),
-            watchlist_id=str(alert.watchlist_id) if alert.watchlist_id else None,
-            asset_id=str(alert.asset_id) if alert.asset_id else None,
-            alert_type=alert.alert_type,
-            severity=alert.severity,
-            title=alert.title,
-            message=alert.message,
-            metadata=metadata,
-            is_read=alert.is_read,
-            created_at=alert.created_at,
-        )
+        # UUIDType as_uuid=False: id kolonları zaten str geliyor, str() gerekmiyor
+        return AlertResponse.from_orm_trusted({
+            "id": alert.id,
+            "user_id": alert.user_id,
+            "watchlist_id": alert.watchlist_id,
+            "asset_id": alert.asset_id,
+            "alert_type": alert.alert_type,
+            "severity": alert.severity,
+            "title": alert.title,
+            "message": alert.message,
+            "metadata": metadata,
+            "is_read": alert.is_read,
+            "created_at": alert.created_at,
+        })
 
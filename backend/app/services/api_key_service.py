@@ -2,12 +2,17 @@
 
 from uuid import uuid4
 
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from app.core.encryption import decrypt_value, encrypt_value
+from app.core.encryption import decrypt_value, decrypt_values, encrypt_value
 from app.models.api_source import APISource, APIKey, TestStatus, UpdateMode
 from app.models.user import User
 from app.schemas.api_key import APIKeyCreate, APIKeyUpdate, APIKeyTestRequest, APIKeyTestResponse
+from app.schemas.base import iso_timestamp
+
+# Her API key isteğinde çalışıyor; statement bir kez kurulur, compiled cache hep aynı key'e düşer
+_GET_USER_STMT = select(User).where(User.id == bindparam("id"))
 
 
 class APIKeyService:
@@ -15,15 +20,35 @@ class APIKeyService:
 
     def __init__(self, db: Session) -> None:
         self.db = db
+        # Servis request başına oluşturuluyor; aynı request içinde User tekrar sorgulanmasın
+        self._user_cache: dict[str, User | None] = {}
+
+    def _get_user(self, user_id: str) -> User | None:
+        """Return the user, querying the database at most once per service instance."""
+        if user_id not in self._user_cache:
+            self._user_cache[user_id] = self.db.execute(_GET_USER_STMT, {"id": user_id}).scalar_one_or_none()
+        return self._user_cache[user_id]
+
+    def _with_source(self):
+        """APIKey query with the api_source relationship preloaded."""
+        # Liste için selectinload: APISource JSON kolonlarıyla geniş, JOIN satırları şişirir
+        return self.db.query(APIKey).options(selectinload(APIKey.api_source))
+
+    def _get_with_source(self, api_key_id: str) -> APIKey | None:
+        """Single APIKey with its api_source in one JOINed SELECT."""
+        # populate_existing: identity map'teki instance'ın api_source'u yüklenmemiş olabilir (lazy="raise")
+        return self.db.get(
+            APIKey, api_key_id, options=[joinedload(APIKey.api_source)], populate_existing=True
+        )
 
     def get_api_key(self, api_key_id: str, user_id: str) -> APIKey | None:
         """Get API key by ID (user can only access their own keys, unless admin)."""
-        api_key = self.db.query(APIKey).filter(APIKey.id == api_key_id).first()
+        api_key = self._get_with_source(api_key_id)
         if not api_key:
             return None
 
         # Check if user owns the key or is admin
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = self._get_user(user_id)
         if not user:
             return None
 
@@ -34,14 +59,14 @@ class APIKeyService:
 
     def list_api_keys(self, user_id: str) -> list[APIKey]:
         """List all API keys for a user (admin sees all)."""
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = self._get_user(user_id)
         if not user:
             return []
 
         if user.role.value == "admin":
-            return self.db.query(APIKey).all()
+            return self._with_source().all()
         else:
-            return self.db.query(APIKey).filter(APIKey.user_id == user_id).all()
+            return self._with_source().filter(APIKey.user_id == user_id).all()
 
     def create_api_key(self, user_id: str, api_key_data: APIKeyCreate) -> APIKey:
         """Create a new API key."""
@@ -83,8 +108,8 @@ class APIKeyService:
         )
         self.db.add(api_key)
         self.db.commit()
-        self.db.refresh(api_key)
-        return api_key
+        # refresh() api_source'u yüklemez; commit sonrası ilişkiyle birlikte tekrar oku
+        return self._get_with_source(api_key.id)
 
     def update_api_key(self, api_key_id: str, user_id: str, api_key_data: APIKeyUpdate) -> APIKey:
         """Update an API key."""
@@ -107,8 +132,7 @@ class APIKeyService:
             api_key.is_active = api_key_data.is_active
 
         self.db.commit()
-        self.db.refresh(api_key)
-        return api_key
+        return self._get_with_source(api_key.id)
 
     def delete_api_key(self, api_key_id: str, user_id: str) -> bool:
         """Delete an API key."""
@@ -142,7 +166,7 @@ class APIKeyService:
             )
 
         # Get API source
-        api_source = self.db.query(APISource).filter(APISource.id == api_key.api_source_id).first()
+        api_source = api_key.api_source
         if not api_source:
             return APIKeyTestResponse(
                 success=False,
@@ -183,16 +207,25 @@ class APIKeyService:
 
     def get_decrypted_key(self, api_key_id: str) -> str | None:
         """Get decrypted API key (for internal use only)."""
-        api_key = self.db.query(APIKey).filter(APIKey.id == api_key_id).first()
+        api_key = self.db.get(APIKey, api_key_id)
         if not api_key or not api_key.is_active:
             return None
         return decrypt_value(api_key.api_key)
 
     def to_response(self, api_key: APIKey) -> dict:
-        """Convert APIKey model to response dict."""
-        api_source = self.db.query(APISource).filter(APISource.id == api_key.api_source_id).first()
-        username = decrypt_value(api_key.username) if api_key.username else None
-
+        """Convert APIKey model to response dict (api_source must be preloaded)."""
+        return self.to_responses([api_key])[0]
+
+    def to_responses(self, api_keys: list[APIKey]) -> list[dict]:
+        """Convert several APIKey models, decrypting all usernames in one pass."""
+        usernames = decrypt_values([api_key.username for api_key in api_keys])
+        return [
+            self._format(api_key, username if api_key.username else None)
+            for api_key, username in zip(api_keys, usernames)
+        ]
+
+    def _format(self, api_key: APIKey, username: str | None) -> dict:
+        api_source = api_key.api_source
         return {
             "id": api_key.id,
             "user_id": api_key.user_id,
@@ -200,13 +233,13 @@ class APIKeyService:
             "api_source_name": api_source.display_name if api_source else None,
             "username": username,
             "api_url": api_key.api_url,
-            "update_mode": api_key.update_mode.value,
+            "update_mode": api_key.update_mode,
             "is_active": api_key.is_active,
-            "test_status": api_key.test_status.value,
-            "last_test_date": api_key.last_test_date,
-            "last_used": api_key.last_used,
+            "test_status": api_key.test_status,
+            "last_test_date": iso_timestamp(api_key.last_test_date),
+            "last_used": iso_timestamp(api_key.last_used),
             "rate_limit": api_key.rate_limit,
-            "created_at": api_key.created_at,
-            "updated_at": api_key.updated_at,
+            "created_at": iso_timestamp(api_key.created_at),
+            "updated_at": iso_timestamp(api_key.updated_at),
         }
 
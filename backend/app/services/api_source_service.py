@@ -2,6 +2,7 @@
 
 from uuid import uuid4
 
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.models.api_source import APISource
@@ -9,6 +10,17 @@ from app.models.user import User
 from app.schemas.api_source import APISourceCreate, APISourceUpdate, APISourceTestRequest, APISourceTestResponse
 
 from datetime import datetime, timezone
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+_ACTIVE_SOURCES_STMT = select(APISource).where(APISource.is_active == bindparam("active"))
+
+
+def _dump_config(config: Optional[BaseModel]) -> Optional[dict[str, Any]]:
+    """Convert a config sub-model to the plain dict stored in the JSON column."""
+    return config.model_dump(exclude_unset=True) if config is not None else None
 
 
 class APISourceService:
@@ -19,7 +31,7 @@ class APISourceService:
 
     def get_api_source(self, api_source_id: str) -> APISource | None:
         """Get API source by ID."""
-        return self.db.query(APISource).filter(APISource.id == api_source_id).first()
+        return self.db.get(APISource, api_source_id)
 
     def get_api_source_by_name(self, name: str) -> APISource | None:
         """Get API source by name."""
@@ -27,10 +39,9 @@ class APISourceService:
 
     def list_api_sources(self, include_inactive: bool = False) -> list[APISource]:
         """List all API sources."""
-        query = self.db.query(APISource)
-        if not include_inactive:
-            query = query.filter(APISource.is_active == True)
-        return query.all()
+        if include_inactive:
+            return self.db.query(APISource).all()
+        return list(self.db.execute(_ACTIVE_SOURCES_STMT, {"active": True}).scalars())
 
     def create_api_source(self, user_id: str | None, api_source_data: APISourceCreate) -> APISource:
         """Create a new API source."""
@@ -49,8 +60,8 @@ class APISourceService:
             documentation_url=api_source_data.documentation_url,
             supported_ioc_types=api_source_data.supported_ioc_types,
             authentication_type=api_source_data.authentication_type,
-            request_config=api_source_data.request_config,
-            response_config=api_source_data.response_config,
+            request_config=_dump_config(api_source_data.request_config),
+            response_config=_dump_config(api_source_data.response_config),
             rate_limit_config=api_source_data.rate_limit_config,
             is_active=api_source_data.is_active,
             created_by=user_id,
@@ -80,9 +91,9 @@ class APISourceService:
         if api_source_data.authentication_type is not None:
             api_source.authentication_type = api_source_data.authentication_type
         if api_source_data.request_config is not None:
-            api_source.request_config = api_source_data.request_config
+            api_source.request_config = _dump_config(api_source_data.request_config)
         if api_source_data.response_config is not None:
-            api_source.response_config = api_source_data.response_config
+            api_source.response_config = _dump_config(api_source_data.response_config)
         if api_source_data.rate_limit_config is not None:
             api_source.rate_limit_config = api_source_data.rate_limit_config
         if api_source_data.is_active is not None:
@@ -178,11 +189,11 @@ class APISourceService:
             "name": api_source.name,
             "display_name": api_source.display_name,
             "description": api_source.description,
-            "api_type": api_source.api_type.value,
+            "api_type": api_source.api_type,
             "base_url": api_source.base_url,
             "documentation_url": api_source.documentation_url,
             "supported_ioc_types": api_source.supported_ioc_types or [],
-            "authentication_type": api_source.authentication_type.value,
+            "authentication_type": api_source.authentication_type,
             "request_config": api_source.request_config,
             "response_config": api_source.response_config,
             "rate_limit_config": api_source.rate_limit_config,
@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from bisect import bisect_right
+from typing import Any, Dict, Optional
+
+
+# score >= eşik -> bir üst seviye (bisect_right ile eşik değerinin kendisi üst kovaya düşer)
+_RISK_THRESHOLDS = (0.5, 0.8)
+_RISK_LABELS = ("low", "medium", "high")
 
 
 class BaseThreatClient(ABC):
@@ -9,15 +15,25 @@ class BaseThreatClient(ABC):
         self.name = name
 
     @abstractmethod
-    async def query(self, ioc_type: str, ioc_value: str) -> Dict[str, Any]:
-        """Run query for given IOC and return raw response."""
+    async def query(
+        self, ioc_type: str, ioc_value: str, ctx: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Run query for given IOC and return raw response.
+
+        ``ctx`` is the per-IOC view built once by the caller (see ``query_context``).
+        """
+
+    @staticmethod
+    def query_context(ioc_value: str) -> Dict[str, Any]:
+        """Precomputed IOC views shared by all clients of one fan-out."""
+        return {"ioc_value_lower": ioc_value.lower()}
+
+    @staticmethod
+    def lowered(ioc_value: str, ctx: Optional[Dict[str, Any]]) -> str:
+        return ctx["ioc_value_lower"] if ctx else ioc_value.lower()
 
     @staticmethod
     def normalize_risk(score: float | None) -> str | None:
         if score is None:
             return None
-        if score >= 0.8:
-            return "high"
-        if score >= 0.5:
-            return "medium"
-        return "low"
+        return _RISK_LABELS[bisect_right(_RISK_THRESHOLDS, score)]
@@ -1,32 +1,137 @@
-from datetime import datetime, timedelta, timezone
-from typing import Dict, Tuple
+import threading
+from datetime import timedelta
+from typing import Dict, Hashable, Iterable, Optional, Tuple
 
+from cachetools import TTLCache
+from loguru import logger
+
+from app.core.config import get_settings
 from app.schemas.ioc import IOCQueryResponse
+from app.services.redis_cache import get_redis_client
 
 
 class IOCResponseCache:
-    def __init__(self, ttl_seconds: int = 300) -> None:
+    """Size-bounded TTL cache for IOC query responses (LRU eviction when full)."""
+
+    def __init__(self, ttl_seconds: int = 300, maxsize: int = 10_000) -> None:
         self.ttl = timedelta(seconds=ttl_seconds)
-        self._store: Dict[Tuple[str, str], Tuple[IOCQueryResponse, datetime]] = {}
+        self._store: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        # Sync endpoint'ler threadpool'da çalışıyor; TTLCache thread-safe değil
+        self._lock = threading.RLock()
 
     def _make_key(self, ioc_type: str, ioc_value: str) -> Tuple[str, str]:
         return ioc_type.lower(), ioc_value.lower()
 
     def get(self, ioc_type: str, ioc_value: str) -> IOCQueryResponse | None:
         key = self._make_key(ioc_type, ioc_value)
-        cached = self._store.get(key)
-        if not cached:
-            return None
+        with self._lock:
+            return self._store.get(key)
+
+    def set(self, response: IOCQueryResponse) -> None:
+        key = self._make_key(response.ioc_type, response.ioc_value)
+        with self._lock:
+            self._store[key] = response
+
 
-        response, stored_at = cached
-        if datetime.now(timezone.utc) - stored_at > self.ttl:
-            del self._store[key]
+class RedisIOCResponseCache:
+    """Two-tier IOC response cache: per-worker TTLCache in front of Redis.
+
+    Redis'teki kayıtlar tüm worker'lar arasında paylaşılır ve worker restart'ından
+    sonra da kalır. Redis yoksa veya hata verirse sadece in-process cache kullanılır.
+    """
+
+    def __init__(self, local: IOCResponseCache, ttl_seconds: int = 300) -> None:
+        self.local = local
+        self.ttl_seconds = ttl_seconds
+        self.client = get_redis_client()
+
+    @staticmethod
+    def _redis_key(ioc_type: str, ioc_value: str) -> str:
+        return f"ioc:{ioc_type.lower()}:{ioc_value.lower()}"
+
+    def _load(self, raw: Optional[str]) -> IOCQueryResponse | None:
+        if not raw:
+            return None
+        try:
+            response = IOCQueryResponse.model_validate_json(raw)
+        except ValueError as e:
+            logger.warning(f"Failed to parse cached IOC data: {e}")
             return None
+        self.local.set(response)
         return response
 
+    def get(self, ioc_type: str, ioc_value: str) -> IOCQueryResponse | None:
+        response = self.local.get(ioc_type, ioc_value)
+        if response is not None or not self.client:
+            return response
+
+        try:
+            raw = self.client.get(self._redis_key(ioc_type, ioc_value))
+        except Exception as e:
+            logger.warning(f"Redis get error for IOC {ioc_type}:{ioc_value}: {e}")
+            return None
+        return self._load(raw)
+
+    def get_many(self, iocs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], IOCQueryResponse]:
+        """Look up several (ioc_type, ioc_value) pairs; Redis misses cost one MGET round trip."""
+        found: Dict[Tuple[str, str], IOCQueryResponse] = {}
+        missing = []
+        for ioc_type, ioc_value in iocs:
+            response = self.local.get(ioc_type, ioc_value)
+            if response is not None:
+                found[(ioc_type, ioc_value)] = response
+            else:
+                missing.append((ioc_type, ioc_value))
+
+        if not missing or not self.client:
+            return found
+        try:
+            values = self.client.mget([self._redis_key(*ioc) for ioc in missing])
+        except Exception as e:
+            logger.warning(f"Redis mget error for {len(missing)} IOCs: {e}")
+            return found
+        for ioc, raw in zip(missing, values):
+            response = self._load(raw)
+            if response is not None:
+                found[ioc] = response
+        return found
+
     def set(self, response: IOCQueryResponse) -> None:
-        key = self._make_key(response.ioc_type, response.ioc_value)
-        self._store[key] = (response, datetime.now(timezone.utc))
+        self.local.set(response)
+        if not self.client:
+            return
+        try:
+            self.client.setex(
+                self._redis_key(response.ioc_type, response.ioc_value),
+                self.ttl_seconds,
+                response.model_dump_json(),
+            )
+        except Exception as e:
+            logger.warning(f"Redis set error for IOC {response.ioc_type}:{response.ioc_value}: {e}")
+
+
+class CountCache:
+    """Short-lived, size-bounded cache for COUNT(*) results keyed by (user_id, *filters)."""
+
+    def __init__(self, ttl_seconds: int = 30, maxsize: int = 10_000) -> None:
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self._store: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        # Threadpool endpoint'leri ve scheduler thread'i aynı instance'ı kullanıyor
+        self._lock = threading.RLock()
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[int]:
+        with self._lock:
+            return self._store.get(key)
+
+    def set(self, key: Tuple[Hashable, ...], count: int) -> None:
+        with self._lock:
+            self._store[key] = count
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._store if key[0] == user_id]:
+                self._store.pop(key, None)
 
 
-ioc_cache = IOCResponseCache()
+ioc_cache = RedisIOCResponseCache(IOCResponseCache(maxsize=get_settings().ioc_cache_maxsize))
+alert_count_cache = CountCache()
@@ -1,12 +1,18 @@
-from typing import Any, Dict
+import re
+from typing import Any, Dict, Optional
 
 from app.services.base_client import BaseThreatClient
 
+# "Riskli" octet'ler; her değer için tek bir regex taraması
+_RISKY_OCTETS_RE = re.compile(r"666|999|123")
+
 
 class AbuseIPDBMockClient(BaseThreatClient):
     """AbuseIPDB mock client based on simple keyword heuristics."""
 
-    async def query(self, ioc_type: str, ioc_value: str) -> Dict[str, Any]:
+    async def query(
+        self, ioc_type: str, ioc_value: str, ctx: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         if ioc_type != "ip":
             return {
                 "source": "abuseipdb",
@@ -17,8 +23,7 @@ class AbuseIPDBMockClient(BaseThreatClient):
                 "message": "AbuseIPDB only supports IP indicators",
             }
 
-        risky_octets = {"666", "999", "123"}
-        suspicious = any(octet in ioc_value for octet in risky_octets)
+        suspicious = _RISKY_OCTETS_RE.search(ioc_value) is not None
 
         risk_score = 0.7 if suspicious else 0.1
         status = "reported" if suspicious else "clean"
@@ -1,13 +1,18 @@
-from typing import Any, Dict
+import re
+from typing import Any, Dict, Optional
 
 from app.services.base_client import BaseThreatClient
 
+_KEYWORDS_RE = re.compile(r"pulse|threat")
+
 
 class OTXMockClient(BaseThreatClient):
     """AlienVault OTX mock client."""
 
-    async def query(self, ioc_type: str, ioc_value: str) -> Dict[str, Any]:
-        suspicious = "pulse" in ioc_value.lower() or "threat" in ioc_value.lower()
+    async def query(
+        self, ioc_type: str, ioc_value: str, ctx: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        suspicious = _KEYWORDS_RE.search(self.lowered(ioc_value, ctx)) is not None
 
         risk_score = 0.65 if suspicious else 0.25
         status = "listed" if suspicious else "not_listed"
@@ -1,14 +1,19 @@
-from typing import Any, Dict
+import re
+from typing import Any, Dict, Optional
 
 from app.services.base_client import BaseThreatClient
 
+_KEYWORDS = ("malware", "phish", "botnet")
+_KEYWORDS_RE = re.compile("|".join(_KEYWORDS))
+
 
 class VirusTotalMockClient(BaseThreatClient):
     """Basit bir VirusTotal mock client."""
 
-    async def query(self, ioc_type: str, ioc_value: str) -> Dict[str, Any]:
-        keywords = ["malware", "phish", "botnet"]
-        suspicious = any(keyword in ioc_value.lower() for keyword in keywords)
+    async def query(
+        self, ioc_type: str, ioc_value: str, ctx: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        suspicious = _KEYWORDS_RE.search(self.lowered(ioc_value, ctx)) is not None
 
         if suspicious:
             risk_score = 0.85
@@ -28,6 +33,7 @@ class VirusTotalMockClient(BaseThreatClient):
             "message": message,
             "raw": {
                 "mock": True,
-                "detected_keywords": keywords if suspicious else [],
+                # raw payload cache'lenip serialize ediliyor: modül sabiti paylaşılmasın
+                "detected_keywords": list(_KEYWORDS) if suspicious else [],
             },
         }
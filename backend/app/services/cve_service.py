@@ -1,68 +1,297 @@
 """CVE servisi - NIST NVD API v2 entegrasyonu."""
 
+import asyncio
+import random
+import re
+import threading
 import time
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
 from uuid import uuid4
 
-import requests
+import httpx
+import msgspec
+from cachetools import TTLCache
+from fastapi import BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from loguru import logger
+from sqlalchemy import Row, delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+from app.db.base import IS_POSTGRESQL, SessionLocal
 from app.models.cve import CVECache
 from app.schemas.cve import (
+    AFFECTED_PRODUCT_LIST_ADAPTER,
+    CVE_REFERENCE_LIST_ADAPTER,
     AffectedProduct,
     CVE,
     CVEReference,
+    CVESearchCacheEntry,
     CVESearchRequest,
     CVESearchResponse,
     CVSSv2,
     CVSSv3,
 )
-from app.services.redis_cache import redis_cache
+from app.schemas.nvd import NVD_RESPONSE_DECODER, NVD_VULNERABILITY_DECODER, NvdVulnerability
+from app.services.redis_cache import TokenBucket, redis_cache
+
+settings = get_settings()
+
+NVD_API_BASE_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+
+T = TypeVar("T")
+
+# cpe:2.3:<part>:<vendor>:<product>[:<version>...]
+_CPE_RE = re.compile(r"cpe:2\.3:[aho]:([^:]*):([^:]*)(?::([^:]*))?")
+
+# CVE okuma yolunun ihtiyaç duyduğu kolonlar (raw_data, id, expires_at okunmaz)
+_CACHE_SELECT = select(
+    CVECache.cve_id,
+    CVECache.description,
+    CVECache.cvss_v2_score,
+    CVECache.cvss_v2_severity,
+    CVECache.cvss_v3_score,
+    CVECache.cvss_v3_severity,
+    CVECache.published_date,
+    CVECache.modified_date,
+    CVECache.affected_products,
+    CVECache.references,
+    CVECache.cwe,
+    CVECache.cached_at,
+)
+
+# İki dialect de aynı on_conflict_do_update API'sini sunuyor
+_upsert_insert = pg_insert if IS_POSTGRESQL else sqlite_insert
+# Çakışmada id ve cve_id korunur, geri kalan her şey yenilenir
+_CACHE_UPDATE_COLUMNS = (
+    "description",
+    "cvss_v2_score",
+    "cvss_v2_severity",
+    "cvss_v3_score",
+    "cvss_v3_severity",
+    "published_date",
+    "modified_date",
+    "affected_products",
+    "references",
+    "cwe",
+    "cached_at",
+    "expires_at",
+)
+
+# Tüm istekler tek bir keep-alive havuzunu paylaşır (her çağrıda yeni TCP/TLS handshake yok)
+_nvd_client: Optional[httpx.AsyncClient] = None
+
+# NVD limiti tüm worker'lar için ortak: 30 saniyede 50 istek (Redis token bucket)
+_nvd_bucket = TokenBucket("nvd:rate_limit", rate=50 / 30, burst=50)
+
+# Redis yoksa process-local aralıklandırma (servis request başına oluşturuluyor)
+_rate_limit_lock = asyncio.Lock()
+_last_request_time = 0.0
+
+
+def get_nvd_client() -> httpx.AsyncClient:
+    """Return the shared NVD HTTP client, creating it on first use."""
+    global _nvd_client
+    if _nvd_client is None:
+        _nvd_client = httpx.AsyncClient(
+            base_url=NVD_API_BASE_URL,
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=8),
+        )
+    return _nvd_client
+
+
+async def close_nvd_client() -> None:
+    """Close the shared NVD HTTP client (application shutdown)."""
+    global _nvd_client
+    if _nvd_client is not None:
+        await _nvd_client.aclose()
+        _nvd_client = None
+
+
+# Arka plan yenilemeleri: task referansları GC'ye karşı tutulur, aynı key iki kez yenilenmez
+_background_tasks: Set[asyncio.Task] = set()
+_refreshing_keys: Set[str] = set()
+
+
+# Sık istenen CVE'ler için worker içi cache (Redis round-trip'i de atlanır)
+_local_cves: TTLCache = TTLCache(maxsize=settings.cve_local_cache_maxsize, ttl=300)
+# get_cves_bulk/get_cve async ama _save_many_to_cache background task olarak threadpool'da çalışabiliyor
+_local_cves_lock = threading.RLock()
+
+
+def _local_cve_get(cve_id_upper: str) -> Optional[CVE]:
+    with _local_cves_lock:
+        return _local_cves.get(cve_id_upper)
+
+
+def _local_cve_put(cve: CVE) -> None:
+    with _local_cves_lock:
+        _local_cves[cve.cve_id.upper()] = cve
+
+
+def clear_local_cve_cache() -> None:
+    """Drop every CVE held in this worker's in-memory cache."""
+    with _local_cves_lock:
+        _local_cves.clear()
+
+
+# Devam eden NVD çağrıları (key -> sonuç future'ı); aynı key için gelenler bunu bekler
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+async def _single_flight(key: str, factory: Callable[[], Awaitable[T]]) -> T:
+    """Run ``factory`` once per ``key`` at a time; concurrent callers share its result.
+
+    Kontrol ve kayıt arasında await yok, event loop tek thread: ayrıca lock gerekmiyor.
+    """
+    future = _inflight.get(key)
+    if future is not None:
+        # shield: bekleyen tek bir isteğin iptali ortak future'ı iptal etmesin
+        return await asyncio.shield(future)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await factory()
+    except BaseException as e:
+        future.set_exception(e)
+        future.exception()  # bekleyen yoksa "never retrieved" uyarısı basılmasın
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+def _jittered(seconds: int) -> int:
+    """Spread TTLs by ±10% so entries written together don't expire together."""
+    return int(seconds * random.uniform(0.9, 1.1))
+
+
+def _schedule_search_refresh(request: CVESearchRequest, redis_key: str) -> None:
+    """Refresh a stale search result in the background (at most once per key)."""
+    if redis_key in _refreshing_keys:
+        return
+    _refreshing_keys.add(redis_key)
+    task = asyncio.create_task(_refresh_search(request, redis_key))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _refresh_search(request: CVESearchRequest, redis_key: str) -> None:
+    # İsteğin session'ı yanıtla birlikte kapanıyor; yenileme kendi session'ını açar
+    db = SessionLocal()
+    try:
+        await CVEService(db)._fetch_search(request, redis_key)
+    finally:
+        db.close()
+        _refreshing_keys.discard(redis_key)
 
 
 class CVEService:
     """CVE sorgulama ve arama servisi - NIST NVD API v2."""
 
-    NVD_API_BASE_URL = "https://services.nvd.nist.gov/rest/json/cves/2.0"
+    NVD_API_BASE_URL = NVD_API_BASE_URL
     RATE_LIMIT_DELAY = 0.6  # NIST NVD API rate limit: 50 requests per 30 seconds
-
-    def __init__(self, db: Session) -> None:
+    SEARCH_CACHE_TTL = 3600  # Redis'ten tamamen düşme süresi
+    SEARCH_SOFT_TTL = 900  # Bu süreden sonra sonuç bayat dönülür ve arka planda yenilenir
+    MISS_CACHE_TTL = 300  # NVD'de bulunamayan CVE ID'leri
+    ERROR_MISS_CACHE_TTL = 60  # NVD hata/timeout verdiğinde aynı ID tekrar denenmeden önce
+    BULK_FETCH_CONCURRENCY = 4  # get_cves_bulk'ta aynı anda NVD'ye giden istek sayısı
+    CACHE_WRITE_CHUNK = 50  # cve_cache upsert'ünde statement başına satır
+    MAX_RESPONSE_BYTES = 64 * 1024 * 1024  # 2000 CVE'lik en büyük NVD sayfası bunun çok altında
+
+    def __init__(self, db: Session, background_tasks: Optional[BackgroundTasks] = None) -> None:
         self.db = db
-        self._last_request_time = 0.0
-
-    def _rate_limit(self) -> None:
-        """NIST NVD API rate limiting."""
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
-        if time_since_last_request < self.RATE_LIMIT_DELAY:
-            time.sleep(self.RATE_LIMIT_DELAY - time_since_last_request)
-        self._last_request_time = time.time()
-
-    def _check_cache(self, cve_id: Optional[str] = None) -> Optional[List[CVECache]]:
+        # Verilirse cache yazımları yanıt gönderildikten sonra yapılır
+        self.background_tasks = background_tasks
+        # Session thread-safe değil: threadpool'a giden DB çağrıları sırayla çalışır
+        self._db_lock = asyncio.Lock()
+
+    async def _run_db(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking call that uses ``self.db`` in the threadpool, one at a time."""
+        async with self._db_lock:
+            return await run_in_threadpool(func, *args)
+
+    async def _rate_limit(self) -> None:
+        """NIST NVD API rate limiting (shared across workers via Redis when available)."""
+        global _last_request_time
+        # Redis EVAL senkron: event loop'u bekletmesin
+        wait = await run_in_threadpool(_nvd_bucket.acquire)
+        if wait is not None:
+            if wait > 0:
+                await asyncio.sleep(wait)
+            return
+
+        async with _rate_limit_lock:
+            time_since_last_request = time.monotonic() - _last_request_time
+            if time_since_last_request < self.RATE_LIMIT_DELAY:
+                await asyncio.sleep(self.RATE_LIMIT_DELAY - time_since_last_request)
+            _last_request_time = time.monotonic()
+
+    async def _nvd_get(self, params: dict) -> bytearray:
+        """GET the NVD CVE endpoint with ``params`` after waiting for the rate limit.
+
+        Returns the streamed response body; raises httpx.HTTPStatusError on error statuses.
+        """
+        global _last_request_time
+        await self._rate_limit()
+        async with get_nvd_client().stream("GET", "", params=params) as response:
+            if response.status_code == 429:
+                # NVD'nin istediği bekleme hem ortak bucket'a hem local fallback'e yansıtılır
+                try:
+                    retry_after = float(response.headers.get("Retry-After", 30))
+                except ValueError:
+                    retry_after = 30.0
+                logger.warning(f"NIST NVD API rate limited, backing off {retry_after}s")
+                await run_in_threadpool(_nvd_bucket.penalize, retry_after)
+                _last_request_time = max(_last_request_time, time.monotonic() + retry_after - self.RATE_LIMIT_DELAY)
+            if response.is_error:
+                await response.aread()
+                logger.error(f"NIST NVD API error: {response.status_code} - {response.text[:500]}")
+                response.raise_for_status()
+
+            # Parçalar doğrudan tek buffer'a eklenir (msgspec bytearray'i kopyasız decode ediyor);
+            # beklenmedik büyüklükte bir gövde belleği doldurmadan kesilir
+            body = bytearray()
+            async for chunk in response.aiter_bytes(65536):
+                body += chunk
+                if len(body) > self.MAX_RESPONSE_BYTES:
+                    raise ValueError(f"NIST NVD API response exceeds {self.MAX_RESPONSE_BYTES} bytes")
+            return body
+
+    def _check_cache(self, cve_id: Optional[str] = None) -> Optional[List[Row]]:
         """Check database cache for CVE data."""
         from datetime import timedelta
 
         cache_expiry = datetime.now(timezone.utc) - timedelta(hours=24)  # 24 hour cache
 
         if cve_id:
-            cached = (
-                self.db.query(CVECache)
-                .filter(CVECache.cve_id == cve_id.upper())
-                .filter(CVECache.cached_at >= cache_expiry)
-                .first()
-            )
+            # Core select: ORM entity / identity map yok, satır _cve_from_cache'e doğrudan gider
+            cached = self.db.execute(
+                _CACHE_SELECT.where(CVECache.cve_id == cve_id.upper(), CVECache.cached_at >= cache_expiry)
+                .order_by(CVECache.cached_at.desc())
+                .limit(1)
+            ).first()
             return [cached] if cached else None
         return None
 
-    def _save_to_cache(self, cve: CVE) -> None:
-        """Save CVE data to cache."""
-        from datetime import timedelta
-
-        cached = self.db.query(CVECache).filter(CVECache.cve_id == cve.cve_id.upper()).first()
+    def prune_expired_cache(self) -> int:
+        """Delete cve_cache rows past expires_at; returns the number of rows removed."""
+        result = self.db.execute(delete(CVECache).where(CVECache.expires_at < datetime.now(timezone.utc)))
+        self.db.commit()
+        return result.rowcount
 
-        cache_data = {
+    @staticmethod
+    def _cache_row(cve: CVE) -> dict:
+        """Build the cve_cache column values for ``cve``."""
+        return {
             "cve_id": cve.cve_id.upper(),
             "description": cve.description,
             "cvss_v2_score": cve.cvss_v2.base_score if cve.cvss_v2 else None,
@@ -71,137 +300,158 @@ class CVEService:
             "cvss_v3_severity": cve.cvss_v3.base_severity if cve.cvss_v3 else None,
             "published_date": cve.published_date.date() if cve.published_date else None,
             "modified_date": cve.last_modified_date.date() if cve.last_modified_date else None,
-            "affected_products": [p.dict() for p in cve.affected_products],
-            "references": [r.dict() for r in cve.references],
+            # Liste başına tek dump çağrısı (eleman başına .dict() yerine)
+            "affected_products": AFFECTED_PRODUCT_LIST_ADAPTER.dump_python(cve.affected_products),
+            "references": CVE_REFERENCE_LIST_ADAPTER.dump_python(cve.references),
             "cwe": cve.cwe_id,
         }
 
-        if cached:
-            # Update existing cache
-            for key, value in cache_data.items():
-                setattr(cached, key, value)
-            cached.cached_at = datetime.now(timezone.utc)
-            cached.expires_at = datetime.now(timezone.utc) + timedelta(hours=24)
-        else:
-            # Create new cache entry
-            cached = CVECache(
-                id=str(uuid4()),
-                **cache_data,
-                cached_at=datetime.now(timezone.utc),
-                expires_at=datetime.now(timezone.utc) + timedelta(hours=24),
-            )
-            self.db.add(cached)
+    def _save_many_to_cache(self, cves: List[CVE]) -> None:
+        """Upsert CVE data to cache with chunked INSERT ... ON CONFLICT and a single commit."""
+        from datetime import timedelta
+
+        if not cves:
+            return
 
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(hours=24)
+        # Aynı statement içinde tekrar eden cve_id PostgreSQL'de ON CONFLICT hatası verir
+        rows = {}
+        for cve in cves:
+            row = self._cache_row(cve)
+            row.update(id=str(uuid4()), cached_at=now, expires_at=expires_at)
+            rows[row["cve_id"]] = row
+
+        values = list(rows.values())
         try:
+            # Eski SQLite sürümlerinde statement başına 999 parametre sınırı var (50 satır x 14 kolon)
+            for start in range(0, len(values), self.CACHE_WRITE_CHUNK):
+                stmt = _upsert_insert(CVECache).values(values[start:start + self.CACHE_WRITE_CHUNK])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[CVECache.cve_id],
+                    set_={column: stmt.excluded[column] for column in _CACHE_UPDATE_COLUMNS},
+                )
+                self.db.execute(stmt)
             self.db.commit()
         except Exception as e:
-            logger.error(f"Failed to save CVE to cache: {e}")
+            logger.error(f"Failed to save CVEs to cache: {e}")
             self.db.rollback()
+            return
+
+        # Yeni yazılan veri eski local kopyaların yerine geçsin
+        with _local_cves_lock:
+            for cve_id in rows:
+                _local_cves.pop(cve_id, None)
+
+    def _save_many_in_background(self, cves: List[CVE]) -> None:
+        """Background-task entry point for _save_many_to_cache.
+
+        İsteğin session'ı bu noktada kapanmış olabilir; aynı bind üzerinde yeni bir session açılır.
+        """
+        db = Session(bind=self.db.get_bind(), autoflush=False)
+        try:
+            CVEService(db)._save_many_to_cache(cves)
+        finally:
+            db.close()
+
+    def _save_to_cache(self, cve: CVE) -> None:
+        """Save CVE data to cache."""
+        self._save_many_to_cache([cve])
+
+    def _parse_nvd_response(self, nvd_data: NvdVulnerability, now: Optional[datetime] = None) -> CVE:
+        """Parse one decoded NIST NVD vulnerability to CVE schema.
 
-    def _parse_nvd_response(self, nvd_data: dict) -> CVE:
-        """Parse NIST NVD API response to CVE schema."""
-        cve_item = nvd_data.get("cve", {})
-        cve_id = cve_item.get("id", "")
+        ``now`` is used as cached_at; pass it in to share one timestamp across a page.
+        """
+        cve_item = nvd_data.cve
+        cve_id = cve_item.id
 
         # Description
-        descriptions = cve_item.get("descriptions", [])
-        description = None
-        for desc in descriptions:
-            if desc.get("lang") == "en":
-                description = desc.get("value")
-                break
+        description = next((desc.value for desc in cve_item.descriptions if desc.lang == "en"), None)
 
-        # Dates
+        # Dates (Python 3.11+ fromisoformat trailing "Z"yi doğrudan kabul ediyor)
         published_date = None
         last_modified_date = None
-        if cve_item.get("published"):
+        if cve_item.published:
             try:
-                published_date = datetime.fromisoformat(cve_item["published"].replace("Z", "+00:00"))
+                published_date = datetime.fromisoformat(cve_item.published)
             except Exception:
                 pass
-        if cve_item.get("lastModified"):
+        if cve_item.lastModified:
             try:
-                last_modified_date = datetime.fromisoformat(cve_item["lastModified"].replace("Z", "+00:00"))
+                last_modified_date = datetime.fromisoformat(cve_item.lastModified)
             except Exception:
                 pass
 
         # CVSS v3
         cvss_v3 = None
-        metrics = cve_item.get("metrics", {})
-        cvss_v31 = metrics.get("cvssMetricV31", [])
-        cvss_v30 = metrics.get("cvssMetricV30", [])
-
-        if cvss_v31:
-            cvss_data = cvss_v31[0].get("cvssData", {})
-            cvss_v3 = CVSSv3(
+        metrics = cve_item.metrics
+        if metrics.cvssMetricV31:
+            cvss_data = metrics.cvssMetricV31[0].cvssData
+            cvss_v3 = CVSSv3.model_construct(
                 version="3.1",
-                vector_string=cvss_data.get("vectorString"),
-                base_score=cvss_data.get("baseScore"),
-                base_severity=cvss_data.get("baseSeverity"),
+                vector_string=cvss_data.vectorString,
+                base_score=cvss_data.baseScore,
+                base_severity=cvss_data.baseSeverity,
             )
-        elif cvss_v30:
-            cvss_data = cvss_v30[0].get("cvssData", {})
-            cvss_v3 = CVSSv3(
+        elif metrics.cvssMetricV30:
+            cvss_data = metrics.cvssMetricV30[0].cvssData
+            cvss_v3 = CVSSv3.model_construct(
                 version="3.0",
-                vector_string=cvss_data.get("vectorString"),
-                base_score=cvss_data.get("baseScore"),
-                base_severity=cvss_data.get("baseSeverity"),
+                vector_string=cvss_data.vectorString,
+                base_score=cvss_data.baseScore,
+                base_severity=cvss_data.baseSeverity,
             )
 
         # CVSS v2
         cvss_v2 = None
-        cvss_v2_list = metrics.get("cvssMetricV2", [])
-        if cvss_v2_list:
-            cvss_data = cvss_v2_list[0].get("cvssData", {})
-            base_severity = cvss_v2_list[0].get("baseSeverity")
-            cvss_v2 = CVSSv2(
+        if metrics.cvssMetricV2:
+            cvss_data = metrics.cvssMetricV2[0].cvssData
+            cvss_v2 = CVSSv2.model_construct(
                 version="2.0",
-                vector_string=cvss_data.get("vectorString"),
-                base_score=cvss_data.get("baseScore"),
-                severity=base_severity,
+                vector_string=cvss_data.vectorString,
+                base_score=cvss_data.baseScore,
+                severity=metrics.cvssMetricV2[0].baseSeverity,
             )
 
         # CWE
         cwe_id = None
-        weaknesses = cve_item.get("weaknesses", [])
-        if weaknesses:
-            cwe_list = weaknesses[0].get("description", [])
-            if cwe_list:
-                cwe_id = cwe_list[0].get("value", "")
-
-        # Affected products
-        affected_products = []
-        configurations = cve_item.get("configurations", [])
-        for config in configurations:
-            nodes = config.get("nodes", [])
-            for node in nodes:
-                cpe_match = node.get("cpeMatch", [])
-                for cpe in cpe_match:
-                    cpe_string = cpe.get("criteria", "")
-                    # Parse CPE string: cpe:2.3:a:vendor:product:version
-                    parts = cpe_string.split(":")
-                    if len(parts) >= 5:
-                        affected_products.append(
-                            AffectedProduct(
-                                vendor=parts[3] if len(parts) > 3 else None,
-                                product=parts[4] if len(parts) > 4 else None,
-                                version=parts[5] if len(parts) > 5 else None,
-                            )
-                        )
+        if cve_item.weaknesses and cve_item.weaknesses[0].description:
+            cwe_id = cve_item.weaknesses[0].description[0].value
+
+        # Affected products: aynı CPE birçok node'da tekrar ediyor, model üretmeden önce
+        # (vendor, product, version) üçlüleri sırayı koruyarak tekilleştirilir
+        # Binlerce eşleşmeli CVE'lerde limit dolunca tarama bırakılır
+        max_products = settings.cve_max_affected_products
+        cpe_triples: Dict[Tuple[str, str, Optional[str]], None] = {}
+        truncated_products = False
+        matches = (
+            match.groups()
+            for config in cve_item.configurations
+            for node in config.nodes
+            for cpe in node.cpeMatch
+            if (match := _CPE_RE.match(cpe.criteria))
+        )
+        for triple in matches:
+            if triple in cpe_triples:
+                continue
+            if len(cpe_triples) >= max_products:
+                truncated_products = True
+                break
+            cpe_triples[triple] = None
+        affected_products = [
+            AffectedProduct.model_construct(vendor=vendor, product=product, version=version)
+            for vendor, product, version in cpe_triples
+        ]
 
         # References
-        references = []
-        refs = cve_item.get("references", [])
-        for ref in refs:
-            references.append(
-                CVEReference(
-                    url=ref.get("url", ""),
-                    source=ref.get("source", ""),
-                    tags=ref.get("tags", []),
-                )
-            )
+        references = [
+            CVEReference.model_construct(url=ref.url, source=ref.source, tags=ref.tags)
+            for ref in cve_item.references
+        ]
 
-        return CVE(
+        # Girdi msgspec Struct'larıyla tiplenmiş durumda: pydantic doğrulaması tekrar çalıştırılmaz
+        return CVE.model_construct(
             cve_id=cve_id,
             description=description,
             published_date=published_date,
@@ -210,12 +460,22 @@ class CVEService:
             cvss_v3=cvss_v3,
             cwe_id=cwe_id,
             affected_products=affected_products,
+            truncated_products=truncated_products,
             references=references,
             nvd_url=f"https://nvd.nist.gov/vuln/detail/{cve_id}",
-            cached_at=datetime.now(timezone.utc),
+            cached_at=now or datetime.now(timezone.utc),
         )
 
-    def search_cves(self, request: CVESearchRequest) -> CVESearchResponse:
+    def _iter_parsed(self, vulnerabilities: List[msgspec.Raw]) -> Iterator[CVE]:
+        """Decode and parse raw NVD vulnerabilities one at a time, skipping broken records."""
+        now = datetime.now(timezone.utc)
+        for raw_vuln in vulnerabilities:
+            try:
+                yield self._parse_nvd_response(NVD_VULNERABILITY_DECODER.decode(raw_vuln), now)
+            except Exception as e:
+                logger.warning(f"Failed to parse CVE data: {e}")
+
+    async def search_cves(self, request: CVESearchRequest) -> CVESearchResponse:
         """CVE arama ve filtreleme - NIST NVD API."""
         # Check Redis cache for search results
         cache_key_parts = [
@@ -227,16 +487,24 @@ class CVEService:
             str(request.limit),
         ]
         redis_key = ":".join(filter(None, cache_key_parts))
-        cached_data = redis_cache.get(redis_key)
+        cached_data = await run_in_threadpool(redis_cache.get_bytes, redis_key)
         if cached_data:
             logger.info(f"Redis cache hit for CVE search: {redis_key}")
             try:
-                return CVESearchResponse(**cached_data)
+                # JSON metni doğrudan doğrulanır (json.loads + dict -> model ara adımı yok)
+                entry = CVESearchCacheEntry.model_validate_json(cached_data)
             except Exception as e:
                 logger.warning(f"Failed to parse cached search results: {e}")
-        
-        self._rate_limit()
+            else:
+                if entry.soft_expires_at < time.time():
+                    # Bayat sonuç hemen dönülür, NVD'den yenileme arka planda yapılır
+                    _schedule_search_refresh(request, redis_key)
+                return entry.data
 
+        return await _single_flight(redis_key, lambda: self._fetch_search(request, redis_key))
+
+    async def _fetch_search(self, request: CVESearchRequest, redis_key: str) -> CVESearchResponse:
+        """Run the search against NVD and refresh the Redis entry on success."""
         try:
             # Build API request parameters
             params = {
@@ -282,50 +550,50 @@ class CVEService:
 
             # Make API request
             logger.info(f"NIST NVD API request: {self.NVD_API_BASE_URL} with params: {params}")
-            response = requests.get(self.NVD_API_BASE_URL, params=params, timeout=30)
-            logger.info(f"NIST NVD API response status: {response.status_code}")
-            if response.status_code != 200:
-                logger.error(f"NIST NVD API error: {response.status_code} - {response.text[:500]}")
-            response.raise_for_status()
+            body = await self._nvd_get(params)
 
-            data = response.json()
-            vulnerabilities = data.get("vulnerabilities", [])
+            # Gövde doğrudan typed Struct'lara decode edilir (ara dict ağacı yok)
+            data = NVD_RESPONSE_DECODER.decode(body)
 
             # Parse CVE data
-            cves = []
-            for vuln in vulnerabilities:
-                try:
-                    cve = self._parse_nvd_response(vuln)
-                    cves.append(cve)
-                    # Save to cache
-                    self._save_to_cache(cve)
-                except Exception as e:
-                    logger.warning(f"Failed to parse CVE data: {e}")
-                    continue
+            cves = list(self._iter_parsed(data.vulnerabilities))
+
+            # Sayfanın tamamı tek upsert + tek commit ile cache'e yazılır
+            if self.background_tasks is not None:
+                self.background_tasks.add_task(self._save_many_in_background, cves)
+            else:
+                await self._run_db(self._save_many_to_cache, cves)
 
             # Sort by published_date DESC (newest first)
             cves.sort(key=lambda x: x.published_date or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
 
-            total = data.get("totalResults", len(cves))
-            total_pages = (total + request.limit - 1) // request.limit if total > 0 else 1
+            total = data.totalResults if data.totalResults is not None else len(cves)
 
             response = CVESearchResponse(
                 total=total,
                 limit=request.limit,
                 offset=request.offset,
-                total_pages=total_pages,
                 cves=cves,
             )
             
             # Save to Redis cache (shorter TTL for search results - 1 hour)
             try:
-                redis_cache.set(redis_key, response.dict(), ttl=3600)  # 1 hour
+                entry = CVESearchCacheEntry(
+                    soft_expires_at=time.time() + _jittered(self.SEARCH_SOFT_TTL),
+                    data=response,
+                )
+                await run_in_threadpool(
+                    redis_cache.set_bytes,
+                    redis_key,
+                    entry.model_dump_json().encode(),
+                    ttl=_jittered(self.SEARCH_CACHE_TTL),
+                )
             except Exception as e:
                 logger.warning(f"Failed to save search results to Redis cache: {e}")
             
             return response
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"NIST NVD API request failed: {e}")
             # Fallback to cache if available
             return CVESearchResponse(total=0, limit=request.limit, offset=request.offset, cves=[])
@@ -333,96 +601,181 @@ class CVEService:
             logger.error(f"Error searching CVEs: {e}")
             return CVESearchResponse(total=0, limit=request.limit, offset=request.offset, cves=[])
 
-    def get_cve(self, cve_id: str) -> Optional[CVE]:
+    @staticmethod
+    def _cve_from_cache(cache_entry: Row) -> CVE:
+        """Convert a cve_cache row (see _CACHE_SELECT) to CVE schema."""
+        return CVE(
+            cve_id=cache_entry.cve_id,
+            description=cache_entry.description,
+            published_date=(
+                datetime.combine(cache_entry.published_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+                if cache_entry.published_date
+                else None
+            ),
+            last_modified_date=(
+                datetime.combine(cache_entry.modified_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+                if cache_entry.modified_date
+                else None
+            ),
+            cvss_v2=CVSSv2(
+                version="2.0",
+                base_score=cache_entry.cvss_v2_score,
+                severity=cache_entry.cvss_v2_severity,
+            )
+            if cache_entry.cvss_v2_score
+            else None,
+            cvss_v3=CVSSv3(
+                version="3.1",
+                base_score=cache_entry.cvss_v3_score,
+                base_severity=cache_entry.cvss_v3_severity,
+            )
+            if cache_entry.cvss_v3_score
+            else None,
+            cwe_id=cache_entry.cwe,
+            affected_products=[AffectedProduct(**p) for p in (cache_entry.affected_products or [])],
+            references=[CVEReference(**r) for r in (cache_entry.references or [])],
+            nvd_url=f"https://nvd.nist.gov/vuln/detail/{cache_entry.cve_id}",
+            cached_at=cache_entry.cached_at,
+        )
+
+    async def get_cve(self, cve_id: str) -> Optional[CVE]:
         """CVE ID ile detay getir - NIST NVD API."""
         cve_id_upper = cve_id.upper()
-        
+
+        cve = _local_cve_get(cve_id_upper)
+        if cve is not None:
+            return cve
+
+        cve = await self._resolve_cve(cve_id_upper)
+        if cve is not None:
+            _local_cve_put(cve)
+        return cve
+
+    async def _resolve_cve(self, cve_id_upper: str) -> Optional[CVE]:
+        """Look a CVE up in Redis, then the DB cache, then NVD."""
         # Check Redis cache first
         redis_key = f"cve:{cve_id_upper}"
-        cached_data = redis_cache.get(redis_key)
+        cached_data = await run_in_threadpool(redis_cache.get_bytes, redis_key)
         if cached_data:
             logger.info(f"Redis cache hit for CVE {cve_id_upper}")
             try:
-                # Convert cached dict to CVE schema
-                return CVE(**cached_data)
+                return CVE.model_validate_json(cached_data)
             except Exception as e:
                 logger.warning(f"Failed to parse cached CVE data: {e}")
         
         # Check database cache
-        cached = self._check_cache(cve_id)
+        cached = await self._run_db(self._check_cache, cve_id_upper)
         if cached and cached[0]:
-            cache_entry = cached[0]
-            # Convert cache to CVE schema
-            cve = CVE(
-                cve_id=cache_entry.cve_id,
-                description=cache_entry.description,
-                published_date=(
-                    datetime.combine(cache_entry.published_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-                    if cache_entry.published_date
-                    else None
-                ),
-                last_modified_date=(
-                    datetime.combine(cache_entry.modified_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-                    if cache_entry.modified_date
-                    else None
-                ),
-                cvss_v2=CVSSv2(
-                    version="2.0",
-                    base_score=cache_entry.cvss_v2_score,
-                    severity=cache_entry.cvss_v2_severity,
-                )
-                if cache_entry.cvss_v2_score
-                else None,
-                cvss_v3=CVSSv3(
-                    version="3.1",
-                    base_score=cache_entry.cvss_v3_score,
-                    base_severity=cache_entry.cvss_v3_severity,
-                )
-                if cache_entry.cvss_v3_score
-                else None,
-                cwe_id=cache_entry.cwe,
-                affected_products=[AffectedProduct(**p) for p in (cache_entry.affected_products or [])],
-                references=[CVEReference(**r) for r in (cache_entry.references or [])],
-                nvd_url=f"https://nvd.nist.gov/vuln/detail/{cache_entry.cve_id}",
-                cached_at=cache_entry.cached_at,
-            )
+            cve = self._cve_from_cache(cached[0])
             # Save to Redis cache for faster future access
             try:
-                redis_cache.set(redis_key, cve.dict(), ttl=86400)  # 24 hours
+                await run_in_threadpool(
+                    redis_cache.set_bytes, redis_key, cve.model_dump_json().encode(), ttl=86400  # 24 hours
+                )
             except Exception as e:
                 logger.warning(f"Failed to save CVE to Redis cache: {e}")
             return cve
 
-        # Fetch from API
-        self._rate_limit()
+        return await self._fetch_uncached(cve_id_upper)
+
+    async def get_cves_bulk(self, cve_ids: List[str]) -> Dict[str, Optional[CVE]]:
+        """Resolve many CVE IDs at once: one Redis MGET, one SQL IN query, then bounded NVD fetches.
+
+        Returns a dict keyed by upper-cased CVE ID (None for CVEs NVD doesn't know).
+        """
+        ids = list(dict.fromkeys(cve_id.upper() for cve_id in cve_ids))
+        results: Dict[str, Optional[CVE]] = {}
+        for cve_id in ids:
+            cve = _local_cve_get(cve_id)
+            if cve is not None:
+                results[cve_id] = cve
+        ids = [cve_id for cve_id in ids if cve_id not in results]
+
+        missing = []
+        cached_many = await run_in_threadpool(redis_cache.get_many_bytes, [f"cve:{cve_id}" for cve_id in ids])
+        for cve_id, cached_data in zip(ids, cached_many):
+            if cached_data:
+                try:
+                    results[cve_id] = CVE.model_validate_json(cached_data)
+                    continue
+                except Exception as e:
+                    logger.warning(f"Failed to parse cached CVE data: {e}")
+            missing.append(cve_id)
 
-        try:
-            params = {"cveId": cve_id_upper}
-            response = requests.get(self.NVD_API_BASE_URL, params=params, timeout=30)
-            response.raise_for_status()
+        if missing:
+            results.update(await self._run_db(self._load_cached_many, missing))
+            missing = [cve_id for cve_id in missing if cve_id not in results]
+
+        if missing:
+            # NVD çağrıları yine token bucket'tan geçiyor; semaphore aynı anda bekleyen isteği sınırlar
+            semaphore = asyncio.Semaphore(self.BULK_FETCH_CONCURRENCY)
+
+            async def fetch(cve_id: str) -> Optional[CVE]:
+                async with semaphore:
+                    return await self._fetch_uncached(cve_id)
+
+            fetched = await asyncio.gather(*(fetch(cve_id) for cve_id in missing))
+            results.update(zip(missing, fetched))
 
-            data = response.json()
-            vulnerabilities = data.get("vulnerabilities", [])
+        for cve_id in ids:
+            if results.get(cve_id) is not None:
+                _local_cve_put(results[cve_id])
+        return results
 
-            if not vulnerabilities:
+    def _load_cached_many(self, cve_ids: List[str]) -> Dict[str, CVE]:
+        """Load fresh DB cache rows for ``cve_ids`` and copy them to Redis (blocking)."""
+        from datetime import timedelta
+
+        cache_expiry = datetime.now(timezone.utc) - timedelta(hours=24)
+        rows = self.db.execute(
+            _CACHE_SELECT.where(CVECache.cve_id.in_(cve_ids), CVECache.cached_at >= cache_expiry)
+        ).all()
+        found = {}
+        for row in rows:
+            cve = self._cve_from_cache(row)
+            found[row.cve_id] = cve
+            redis_cache.set_bytes(f"cve:{row.cve_id}", cve.model_dump_json().encode(), ttl=86400)
+        return found
+
+    async def _fetch_uncached(self, cve_id_upper: str) -> Optional[CVE]:
+        """Fetch a CVE missing from Redis and the DB cache, honoring the negative cache."""
+        redis_key = f"cve:{cve_id_upper}"
+
+        # Negatif cache: yakın zamanda bulunamayan / hata veren ID için NVD'ye gidilmez
+        miss_key = f"cve:miss:{cve_id_upper}"
+        if await run_in_threadpool(redis_cache.exists, miss_key):
+            return None
+
+        # Aynı CVE için eşzamanlı istekler tek bir NVD çağrısını bekler
+        return await _single_flight(redis_key, lambda: self._fetch_cve(cve_id_upper, redis_key, miss_key))
+
+    async def _fetch_cve(self, cve_id_upper: str, redis_key: str, miss_key: str) -> Optional[CVE]:
+        """Fetch one CVE from NVD and populate the DB/Redis caches (or the miss key)."""
+        try:
+            data = NVD_RESPONSE_DECODER.decode(await self._nvd_get({"cveId": cve_id_upper}))
+            if not data.vulnerabilities:
+                await run_in_threadpool(redis_cache.set_bytes, miss_key, b"1", ttl=self.MISS_CACHE_TTL)
                 return None
 
-            cve = self._parse_nvd_response(vulnerabilities[0])
+            cve = self._parse_nvd_response(NVD_VULNERABILITY_DECODER.decode(data.vulnerabilities[0]))
             # Save to database cache
-            self._save_to_cache(cve)
+            await self._run_db(self._save_to_cache, cve)
             # Save to Redis cache
             try:
-                redis_cache.set(redis_key, cve.dict(), ttl=86400)  # 24 hours
+                await run_in_threadpool(
+                    redis_cache.set_bytes, redis_key, cve.model_dump_json().encode(), ttl=86400  # 24 hours
+                )
             except Exception as e:
                 logger.warning(f"Failed to save CVE to Redis cache: {e}")
 
             return cve
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"NIST NVD API request failed for {cve_id}: {e}")
+        except httpx.HTTPError as e:
+            logger.error(f"NIST NVD API request failed for {cve_id_upper}: {e}")
+            await run_in_threadpool(redis_cache.set_bytes, miss_key, b"1", ttl=self.ERROR_MISS_CACHE_TTL)
             return None
         except Exception as e:
-            logger.error(f"Error fetching CVE {cve_id}: {e}")
+            logger.error(f"Error fetching CVE {cve_id_upper}: {e}")
             return None
 
 
@@ -1,134 +1,265 @@
 """Dashboard service - statistics and metrics."""
 
-from datetime import datetime, timedelta, timezone
-from typing import List
-
-from sqlalchemy import and_, case, cast, Date, func, or_
-from sqlalchemy.orm import Session
-
-from app.models.api_source import APISource, APIKey
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Date, Float, and_, case, cast, event, exists, func, select, true
+from sqlalchemy.orm import Session, contains_eager, object_session
+
+from app.core.config import get_settings
+from app.db.base import SessionLocal
+from app.db.cve_stats import CVSS_BUCKETS, cvss_hist, daily_stats
+from app.models.api_source import APISource, APIKey, TestStatus
 from app.models.cve import CVECache
 from app.models.ioc_query import IOCQuery, ThreatIntelligenceData
 from app.models.report import Report
 from app.models.watchlist import AssetWatchlist, AssetWatchlistItem, AssetCheckHistory, IOCStatus
+from app.schemas.base import iso_timestamp
 from app.schemas.dashboard import (
-    APIDistribution,
+    APIDistributionSeries,
     APIStatus,
     CVESummary,
-    CVETrend,
-    CVSSDistribution,
+    CVSSDistributionSeries,
     DashboardResponse,
     DashboardStats,
-    IOCTypeDistribution,
-    QueryTrend,
+    IOCTypeDistributionSeries,
     RecentActivity,
     RiskDistribution,
+    TrendSeries,
     WatchlistSummary,
 )
+from app.services.redis_cache import redis_cache
 from loguru import logger
 
+# Dashboard bölümleri bu havuzda paralel hesaplanır; her bölüm DB pool'undan ayrı bir bağlantı tutar.
+# Havuz worker başına paylaşılır: eşzamanlı istek sayısından bağımsız olarak dashboard en fazla
+# dashboard_section_workers ek bağlantı kullanır (DB pool'u ve max_connections aşılmasın)
+_section_executor = ThreadPoolExecutor(
+    max_workers=get_settings().dashboard_section_workers, thread_name_prefix="dashboard"
+)
 
-class DashboardService:
-    """Dashboard service for statistics and metrics."""
+# API key test sonucu -> dashboard API durum rozeti (geçerli key'ler "active")
+_TEST_STATUS_TO_API_STATUS = {TestStatus.INVALID: "error", TestStatus.NOT_TESTED: "warning"}
 
-    def __init__(self, db: Session) -> None:
-        self.db = db
+# Commit'e kadar biriken, dashboard cache'i geçersizlenecek kullanıcılar (Session.info anahtarları)
+_DIRTY_USERS_KEY = "dashboard_dirty_users"
+_WATCHLIST_OWNERS_KEY = "dashboard_watchlist_owners"
 
-    def get_dashboard(self, user_id: str, is_admin: bool = False) -> DashboardResponse:
-        """Get complete dashboard data."""
-        try:
-            # Get statistics
-            stats = self._get_stats(user_id, is_admin)
-        except Exception as e:
-            logger.error(f"Error getting stats: {e}", exc_info=True)
-            stats = DashboardStats()
 
-        try:
-            # Get risk distribution
-            risk_distribution = self._get_risk_distribution(user_id, is_admin)
-        except Exception as e:
-            logger.error(f"Error getting risk distribution: {e}", exc_info=True)
-            risk_distribution = RiskDistribution()
+def _dashboard_cache_key(user_id: str, is_admin: bool) -> str:
+    return f"dash:{user_id}:{is_admin}"
 
-        try:
-            # Get API distribution
-            api_distribution = self._get_api_distribution(user_id, is_admin)
-        except Exception as e:
-            logger.error(f"Error getting API distribution: {e}", exc_info=True)
-            api_distribution = []
 
-        try:
-            # Get IOC type distribution
-            ioc_type_distribution = self._get_ioc_type_distribution(user_id, is_admin)
-        except Exception as e:
-            logger.error(f"Error getting IOC type distribution: {e}", exc_info=True)
-            ioc_type_distribution = []
+def _share_of_total():
+    """Percentage of the grouped row's count in all groups (window over the grouped result)."""
+    return cast(func.count() * 100.0 / func.sum(func.count()).over(), Float).label("percentage")
 
-        try:
-            # Get query trend
-            query_trend = self._get_query_trend(user_id, is_admin, days=7)
-        except Exception as e:
-            logger.error(f"Error getting query trend: {e}", exc_info=True)
-            query_trend = []
 
-        try:
-            # Get recent activities
-            recent_activities = self._get_recent_activities(user_id, is_admin)
-        except Exception as e:
-            logger.error(f"Error getting recent activities: {e}", exc_info=True)
-            recent_activities = []
+def warm_dashboard_queries() -> None:
+    """Compile the per-user dashboard statements into the engine's query cache.
 
-        try:
-            # Get watchlist summary
-            watchlist_summary = self._get_watchlist_summary(user_id, is_admin)
-        except Exception as e:
-            logger.error(f"Error getting watchlist summary: {e}", exc_info=True)
-            watchlist_summary = WatchlistSummary()
+    Hiç verisi olmayan bir kullanıcı için bölümler bir kez çalıştırılır (index'li, boş sonuçlar)
+    ve transaction geri alınır; gerçek trafikteki ilk istekler derleme maliyeti ödemez.
+    Admin görünümü tüm tabloları saydığı için burada ısıtılmaz.
+    """
+    db = SessionLocal()
+    try:
+        DashboardService(db)._build_dashboard(str(UUID(int=0)), is_admin=False)
+    finally:
+        db.rollback()
+        db.close()
 
-        try:
-            # Get API status
-            api_status = self._get_api_status(user_id)
-        except Exception as e:
-            logger.error(f"Error getting API status: {e}", exc_info=True)
-            api_status = []
 
-        try:
-            # Get CVE summary
-            cve_summary = self._get_cve_summary()
-        except Exception as e:
-            logger.error(f"Error getting CVE summary: {e}", exc_info=True)
-            cve_summary = None
+def invalidate_dashboard_cache(user_id: str) -> None:
+    """Drop the cached dashboards of a user (both admin and regular views)."""
+    for is_admin in (False, True):
+        redis_cache.delete(_dashboard_cache_key(user_id, is_admin))
+
+
+def _mark_dashboard_dirty(mapper, connection, target) -> None:
+    """Record the owner of a written row; the cache is dropped once the session commits."""
+    session = object_session(target)
+    if session is None:
+        return
+
+    user_id = getattr(target, "user_id", None)
+    if user_id is None:
+        # Watchlist item'ın sahibi parent watchlist'te; aynı session içinde watchlist başına bir kez sorgulanır
+        owners: Dict[str, str] = session.info.setdefault(_WATCHLIST_OWNERS_KEY, {})
+        watchlist_id = target.watchlist_id
+        if watchlist_id not in owners:
+            owners[watchlist_id] = connection.execute(
+                select(AssetWatchlist.user_id).where(AssetWatchlist.id == watchlist_id)
+            ).scalar()
+        user_id = owners[watchlist_id]
+    if user_id is not None:
+        session.info.setdefault(_DIRTY_USERS_KEY, set()).add(str(user_id))
+
+
+for _model in (IOCQuery, Report, AssetWatchlistItem):
+    for _event_name in ("after_insert", "after_update", "after_delete"):
+        event.listen(_model, _event_name, _mark_dashboard_dirty)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_dirty_dashboards(session: Session) -> None:
+    session.info.pop(_WATCHLIST_OWNERS_KEY, None)
+    for user_id in session.info.pop(_DIRTY_USERS_KEY, ()):
+        invalidate_dashboard_cache(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_dirty_dashboards(session: Session, previous_transaction) -> None:
+    session.info.pop(_WATCHLIST_OWNERS_KEY, None)
+    session.info.pop(_DIRTY_USERS_KEY, None)
+
+
+class DashboardService:
+    """Dashboard service for statistics and metrics."""
+
+    # Dashboard periyodik yenileniyor; birkaç saniyelik bayatlık kabul edilebilir.
+    # Kullanıcının kendi yazmaları cache'i commit anında düşürür; admin görünümü
+    # (tüm kullanıcıların verisi) başkalarının yazmalarında TTL ile tazelenir.
+    CACHE_TTL = 30
 
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def get_dashboard(self, user_id: str, is_admin: bool = False, refresh: bool = False) -> DashboardResponse:
+        """Get complete dashboard data, served from Redis unless ``refresh`` is set."""
+        cache_key = _dashboard_cache_key(user_id, is_admin)
+        if not refresh:
+            cached_data = redis_cache.get_bytes(cache_key)
+            if cached_data:
+                try:
+                    return DashboardResponse.model_validate_json(cached_data)
+                except Exception as e:
+                    logger.warning(f"Failed to parse cached dashboard: {e}")
+
+        dashboard, complete = self._build_dashboard(user_id, is_admin)
+        # Hata yüzünden boş varsayılana düşen bölüm varsa cache'lenmez: geçici bir DB hatası
+        # TTL boyunca kullanıcıya sıfır olarak sunulmasın
+        if complete:
+            redis_cache.set_bytes(cache_key, dashboard.model_dump_json().encode(), ttl=self.CACHE_TTL)
+        return dashboard
+
+    def _build_dashboard(self, user_id: str, is_admin: bool) -> Tuple[DashboardResponse, bool]:
+        """Compute every dashboard section from the database.
+
+        Sections touch disjoint data, so on a server database they run concurrently,
+        each on its own session. A failing section falls back to its empty default;
+        the returned flag is False when that happened.
+        """
+        # Tüm bölümler aynı ana göre hesaplanır (gece yarısı sınırında bölümler arası tutarsızlık olmasın)
+        now = datetime.now(timezone.utc)
+
+        # DashboardResponse alanı -> (log etiketi, hesaplama, hata durumunda varsayılan)
+        sections: Dict[str, Tuple[str, Callable[["DashboardService"], Any], Callable[[], Any]]] = {
+            "stats": ("stats", lambda svc: svc._get_stats(user_id, is_admin, now=now), DashboardStats),
+            "risk_distribution": (
+                "risk distribution",
+                lambda svc: svc._get_risk_distribution(user_id, is_admin),
+                RiskDistribution,
+            ),
+            "api_distribution": (
+                "API distribution",
+                lambda svc: svc._get_api_distribution(user_id, is_admin),
+                APIDistributionSeries,
+            ),
+            "ioc_type_distribution": (
+                "IOC type distribution",
+                lambda svc: svc._get_ioc_type_distribution(user_id, is_admin),
+                IOCTypeDistributionSeries,
+            ),
+            "query_trend": (
+                "query trend",
+                lambda svc: svc._get_query_trend(user_id, is_admin, days=7, now=now),
+                TrendSeries,
+            ),
+            "recent_activities": ("recent activities", lambda svc: svc._get_recent_activities(user_id, is_admin), list),
+            "watchlist_summary": (
+                "watchlist summary",
+                lambda svc: svc._get_watchlist_summary(user_id, is_admin),
+                WatchlistSummary,
+            ),
+            "api_status": ("API status", lambda svc: svc._get_api_status(user_id, now=now), list),
+            "cve_summary": ("CVE summary", lambda svc: svc._get_cve_summary(now=now), lambda: None),
+            "cve_trend": ("CVE trend", lambda svc: svc._get_cve_trend(now=now), lambda: None),
+            "cvss_distribution": ("CVSS distribution", lambda svc: svc._get_cvss_distribution(), lambda: None),
+        }
+
+        # Verisi olmayan (yeni) kullanıcıda boş çıkacağı belli bölümler hiç sorgulanmaz
+        skipped = {} if is_admin else self._empty_sections(user_id, now)
+        for field in skipped:
+            del sections[field]
+
+        # SQLite'ta paralellik kazandırmaz (tek dosya, in-memory DB bağlantı başına ayrı); sırayla çalışır
+        if self.db.get_bind().dialect.name == "sqlite":
+            outcomes = {field: self._run_section(*section) for field, section in sections.items()}
+        else:
+            futures = {
+                field: _section_executor.submit(self._run_isolated_section, *section)
+                for field, section in sections.items()
+            }
+            outcomes = {field: future.result() for field, future in futures.items()}
+
+        results = {field: value for field, (value, _) in outcomes.items()}
+        complete = all(ok for _, ok in outcomes.values())
+        return DashboardResponse(**results, **skipped, generated_at=now), complete
+
+    def _empty_sections(self, user_id: str, now: datetime) -> Dict[str, Any]:
+        """Return ready-made values for sections a user has no rows for, probed with one EXISTS query."""
         try:
-            # Get CVE trend
-            cve_trend = self._get_cve_trend()
+            has_queries, has_watchlists, has_reports = self.db.execute(
+                select(
+                    exists().where(IOCQuery.user_id == user_id),
+                    exists().where(AssetWatchlist.user_id == user_id),
+                    exists().where(Report.user_id == user_id),
+                )
+            ).one()
         except Exception as e:
-            logger.error(f"Error getting CVE trend: {e}", exc_info=True)
-            cve_trend = None
-
+            logger.warning(f"Error probing dashboard data: {e}")
+            return {}
+
+        empty: Dict[str, Any] = {}
+        if not has_queries:
+            empty["api_distribution"] = APIDistributionSeries()
+            empty["ioc_type_distribution"] = IOCTypeDistributionSeries()
+            empty["query_trend"] = self._fill_trend({}, days=7, now=now)
+            if not has_reports:
+                empty["recent_activities"] = []
+        if not has_watchlists:
+            empty["watchlist_summary"] = WatchlistSummary()
+            if not has_queries:
+                empty["risk_distribution"] = RiskDistribution()
+        return empty
+
+    def _run_section(
+        self, label: str, compute: Callable[["DashboardService"], Any], default: Callable[[], Any]
+    ) -> Tuple[Any, bool]:
+        """Compute one section on this service's session; on failure log and return (default, False)."""
         try:
-            # Get CVSS distribution
-            cvss_distribution = self._get_cvss_distribution()
+            return compute(self), True
         except Exception as e:
-            logger.error(f"Error getting CVSS distribution: {e}", exc_info=True)
-            cvss_distribution = None
-
-        return DashboardResponse(
-            stats=stats,
-            risk_distribution=risk_distribution,
-            api_distribution=api_distribution,
-            ioc_type_distribution=ioc_type_distribution,
-            query_trend=query_trend,
-            recent_activities=recent_activities,
-            watchlist_summary=watchlist_summary,
-            api_status=api_status,
-            cve_summary=cve_summary,
-            cve_trend=cve_trend,
-            cvss_distribution=cvss_distribution,
-            generated_at=datetime.now(timezone.utc),
-        )
+            logger.error(f"Error getting {label}: {e}", exc_info=True)
+            return default(), False
+
+    def _run_isolated_section(
+        self, label: str, compute: Callable[["DashboardService"], Any], default: Callable[[], Any]
+    ) -> Tuple[Any, bool]:
+        """Compute one section on a private session (Session nesneleri thread-safe değil)."""
+        db = Session(bind=self.db.get_bind(), autoflush=False)
+        try:
+            return DashboardService(db)._run_section(label, compute, default)
+        finally:
+            db.close()
 
-    def _get_stats(self, user_id: str, is_admin: bool) -> DashboardStats:
+    def _get_stats(self, user_id: str, is_admin: bool, now: Optional[datetime] = None) -> DashboardStats:
         """Get dashboard statistics."""
         # Base query filter
         if is_admin:
@@ -136,46 +267,61 @@ class DashboardService:
         else:
             query_filter = IOCQuery.user_id == user_id
 
-        # Total queries
-        total_queries = self.db.query(func.count(IOCQuery.id)).filter(query_filter).scalar() or 0
-
-        # Queries today
-        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-        queries_today = (
-            self.db.query(func.count(IOCQuery.id))
-            .filter(and_(query_filter, IOCQuery.query_date >= today_start))
-            .scalar()
-            or 0
-        )
+        now = now or datetime.now(timezone.utc)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        watchlist_filter = AssetWatchlist.user_id == user_id if not is_admin else True
+        report_filter = Report.user_id == user_id if not is_admin else True
 
-        # Active APIs
-        active_apis = (
-            self.db.query(func.count(APIKey.id))
-            .join(APISource, APIKey.api_source_id == APISource.id)
-            .filter(APIKey.is_active == True)
-            .filter(APISource.is_active == True)
-            .filter(APIKey.user_id == user_id if not is_admin else True)
-            .scalar()
-            or 0
+        # Total queries / queries today: ioc_queries üzerinde tek tarama
+        ioc_counts = (
+            select(
+                func.count().label("total"),
+                func.count().filter(IOCQuery.query_date >= today_start).label("today"),
+            )
+            .select_from(IOCQuery)
+            .where(query_filter)
+            .subquery()
         )
-
-        # Total APIs
-        total_apis = (
-            self.db.query(func.count(APISource.id))
-            .filter(APISource.is_active == True)
-            .scalar()
-            or 0
+        # Active APIs / total APIs: aktif kaynaklar, kullanıcının aktif key'leriyle outer join
+        api_counts = (
+            select(
+                func.count(APIKey.id).label("active"),
+                func.count(func.distinct(APISource.id)).label("total"),
+            )
+            .select_from(APISource)
+            .outerjoin(
+                APIKey,
+                and_(
+                    APIKey.api_source_id == APISource.id,
+                    APIKey.is_active == True,
+                    APIKey.user_id == user_id if not is_admin else True,
+                ),
+            )
+            .where(APISource.is_active == True)
+            .subquery()
         )
 
-        # Watchlist assets
-        watchlist_filter = AssetWatchlist.user_id == user_id if not is_admin else True
-        watchlist_assets = (
-            self.db.query(func.count(AssetWatchlistItem.id))
-            .join(AssetWatchlist, AssetWatchlistItem.watchlist_id == AssetWatchlist.id)
-            .filter(watchlist_filter)
-            .filter(AssetWatchlistItem.is_active == True)
-            .scalar()
-            or 0
+        # Tüm sayaçlar tek SELECT'te: altı round-trip yerine bir
+        row = self.db.execute(
+            select(
+                ioc_counts.c.total,
+                ioc_counts.c.today,
+                api_counts.c.active,
+                api_counts.c.total,
+                # Watchlist assets
+                select(func.count())
+                .select_from(AssetWatchlistItem)
+                .join(AssetWatchlist, AssetWatchlistItem.watchlist_id == AssetWatchlist.id)
+                .where(watchlist_filter, AssetWatchlistItem.is_active == True)
+                .scalar_subquery(),
+                # Total reports
+                select(func.count()).select_from(Report).where(report_filter).scalar_subquery(),
+            )
+            # İki tek satırlık subquery: açık ON TRUE join (cartesian product uyarısı olmasın)
+            .select_from(ioc_counts.join(api_counts, true()))
+        ).one()
+        total_queries, queries_today, active_apis, total_apis, watchlist_assets, total_reports = (
+            value or 0 for value in row
         )
 
         # Watchlist alerts (high risk items)
@@ -186,10 +332,6 @@ class DashboardService:
         # For now, return 0
         critical_cves = 0
 
-        # Total reports
-        report_filter = Report.user_id == user_id if not is_admin else True
-        total_reports = self.db.query(func.count(Report.id)).filter(report_filter).scalar() or 0
-
         return DashboardStats(
             total_queries=total_queries,
             queries_today=queries_today,
@@ -203,238 +345,138 @@ class DashboardService:
 
     def _get_risk_distribution(self, user_id: str, is_admin: bool) -> RiskDistribution:
         """Get risk level distribution from both IOC queries and watchlist items."""
-        from app.models.watchlist import AssetWatchlistItem, AssetWatchlist
-        
         query_filter = IOCQuery.user_id == user_id if not is_admin else True
 
-        # Count by risk score ranges from IOC queries
-        low_ioc = (
-            self.db.query(func.count(IOCQuery.id))
-            .filter(query_filter)
-            .filter(and_(IOCQuery.risk_score >= 0.0, IOCQuery.risk_score < 0.2))
-            .scalar()
-            or 0
-        )
-
-        medium_ioc = (
-            self.db.query(func.count(IOCQuery.id))
-            .filter(query_filter)
-            .filter(and_(IOCQuery.risk_score >= 0.2, IOCQuery.risk_score < 0.5))
-            .scalar()
-            or 0
-        )
-
-        high_ioc = (
-            self.db.query(func.count(IOCQuery.id))
-            .filter(query_filter)
-            .filter(and_(IOCQuery.risk_score >= 0.5, IOCQuery.risk_score < 0.8))
-            .scalar()
-            or 0
-        )
-
-        critical_ioc = (
-            self.db.query(func.count(IOCQuery.id))
-            .filter(query_filter)
-            .filter(IOCQuery.risk_score >= 0.8)
-            .scalar()
-            or 0
-        )
-
-        unknown_ioc = (
-            self.db.query(func.count(IOCQuery.id))
-            .filter(query_filter)
-            .filter(IOCQuery.risk_score.is_(None))
-            .scalar()
-            or 0
-        )
+        # Kova başına ayrı COUNT yerine kaynak başına tek GROUP BY
+        ioc_bucket = case(
+            (IOCQuery.risk_score.is_(None), "unknown"),
+            (IOCQuery.risk_score < 0.2, "low"),
+            (IOCQuery.risk_score < 0.5, "medium"),
+            (IOCQuery.risk_score < 0.8, "high"),
+            else_="critical",
+        ).label("bucket")
+        counts = dict.fromkeys(("low", "medium", "high", "critical", "unknown"), 0)
+        for bucket, count in self.db.execute(
+            select(ioc_bucket, func.count()).where(query_filter).group_by(ioc_bucket)
+        ):
+            counts[bucket] += count
 
         # Also count from watchlist items (for alert context)
+        # Watchlist items don't have "critical" risk level; diğer değerler sayılmaz
         watchlist_filter = AssetWatchlist.user_id == user_id if not is_admin else True
-        
-        # Count watchlist items by risk level
-        low_watchlist = (
-            self.db.query(func.count(AssetWatchlistItem.id))
+        watchlist_bucket = case(
+            (AssetWatchlistItem.last_risk_score.is_(None), "unknown"),
+            (AssetWatchlistItem.last_risk_score.in_(("low", "clean")), "low"),
+            (AssetWatchlistItem.last_risk_score == "medium", "medium"),
+            (AssetWatchlistItem.last_risk_score == "high", "high"),
+            (AssetWatchlistItem.last_risk_score == "unknown", "unknown"),
+            else_=None,
+        ).label("bucket")
+        for bucket, count in self.db.execute(
+            select(watchlist_bucket, func.count())
             .join(AssetWatchlist, AssetWatchlistItem.watchlist_id == AssetWatchlist.id)
-            .filter(watchlist_filter)
-            .filter(AssetWatchlistItem.is_active == True)
-            .filter(
-                or_(
-                    AssetWatchlistItem.last_risk_score == "low",
-                    AssetWatchlistItem.last_risk_score == "clean",
-                )
-            )
-            .scalar()
-            or 0
-        )
-
-        medium_watchlist = (
-            self.db.query(func.count(AssetWatchlistItem.id))
-            .join(AssetWatchlist, AssetWatchlistItem.watchlist_id == AssetWatchlist.id)
-            .filter(watchlist_filter)
-            .filter(AssetWatchlistItem.is_active == True)
-            .filter(AssetWatchlistItem.last_risk_score == "medium")
-            .scalar()
-            or 0
-        )
-
-        high_watchlist = (
-            self.db.query(func.count(AssetWatchlistItem.id))
-            .join(AssetWatchlist, AssetWatchlistItem.watchlist_id == AssetWatchlist.id)
-            .filter(watchlist_filter)
-            .filter(AssetWatchlistItem.is_active == True)
-            .filter(AssetWatchlistItem.last_risk_score == "high")
-            .scalar()
-            or 0
-        )
-
-        critical_watchlist = 0  # Watchlist items don't have "critical" risk level
-
-        unknown_watchlist = (
-            self.db.query(func.count(AssetWatchlistItem.id))
-            .join(AssetWatchlist, AssetWatchlistItem.watchlist_id == AssetWatchlist.id)
-            .filter(watchlist_filter)
-            .filter(AssetWatchlistItem.is_active == True)
-            .filter(
-                or_(
-                    AssetWatchlistItem.last_risk_score.is_(None),
-                    AssetWatchlistItem.last_risk_score == "unknown",
-                )
-            )
-            .scalar()
-            or 0
-        )
+            .where(watchlist_filter, AssetWatchlistItem.is_active == True)
+            .group_by(watchlist_bucket)
+        ):
+            if bucket is not None:
+                counts[bucket] += count
 
         # Combine both sources (IOC queries are the primary source, watchlist items are additional context)
-        return RiskDistribution(
-            low=low_ioc + low_watchlist,
-            medium=medium_ioc + medium_watchlist,
-            high=high_ioc + high_watchlist,
-            critical=critical_ioc + critical_watchlist,
-            unknown=unknown_ioc + unknown_watchlist
-        )
+        return RiskDistribution(**counts)
 
-    def _get_api_distribution(self, user_id: str, is_admin: bool) -> List[APIDistribution]:
+    def _get_api_distribution(self, user_id: str, is_admin: bool) -> APIDistributionSeries:
         """Get API usage distribution."""
         # Get threat intelligence data grouped by source
-        query = (
-            self.db.query(
-                ThreatIntelligenceData.source_api,
-                func.count(ThreatIntelligenceData.id).label("count"),
-            )
+        stmt = (
+            select(ThreatIntelligenceData.source_api, func.count(), _share_of_total())
             .join(IOCQuery, ThreatIntelligenceData.ioc_query_id == IOCQuery.id)
             .group_by(ThreatIntelligenceData.source_api)
         )
 
         if not is_admin:
-            query = query.filter(IOCQuery.user_id == user_id)
+            stmt = stmt.where(IOCQuery.user_id == user_id)
 
-        results = query.all()
+        results = self.db.execute(stmt).all()
 
-        # Calculate total for percentage
-        total = sum(r.count for r in results) or 1
-
-        return [
-            APIDistribution(
-                source=r.source_api,
-                count=r.count,
-                percentage=(r.count / total * 100) if total > 0 else 0.0,
-            )
-            for r in results
-        ]
+        # Satır başına model yerine grafiklerin kullandığı paralel diziler
+        return APIDistributionSeries(
+            sources=[source_api for source_api, _, _ in results],
+            counts=[count for _, count, _ in results],
+            percentages=[percentage for _, _, percentage in results],
+        )
 
-    def _get_ioc_type_distribution(self, user_id: str, is_admin: bool) -> List[IOCTypeDistribution]:
+    def _get_ioc_type_distribution(self, user_id: str, is_admin: bool) -> IOCTypeDistributionSeries:
         """Get IOC type distribution."""
         query_filter = IOCQuery.user_id == user_id if not is_admin else True
 
         # Get IOC queries grouped by type
-        results = (
-            self.db.query(
-                IOCQuery.ioc_type,
-                func.count(IOCQuery.id).label("count"),
-            )
-            .filter(query_filter)
-            .group_by(IOCQuery.ioc_type)
-            .all()
+        results = self.db.execute(
+            select(IOCQuery.ioc_type, func.count(), _share_of_total()).where(query_filter).group_by(IOCQuery.ioc_type)
+        ).all()
+
+        return IOCTypeDistributionSeries(
+            ioc_types=[ioc_type for ioc_type, _, _ in results],
+            counts=[count for _, count, _ in results],
+            percentages=[percentage for _, _, percentage in results],
         )
 
-        # Calculate total for percentage
-        total = sum(r.count for r in results) or 1
-
-        return [
-            IOCTypeDistribution(
-                ioc_type=r.ioc_type,
-                count=r.count,
-                percentage=(r.count / total * 100) if total > 0 else 0.0,
-            )
-            for r in results
-        ]
-
-    def _get_query_trend(self, user_id: str, is_admin: bool, days: int = 7) -> List[QueryTrend]:
+    def _get_query_trend(
+        self, user_id: str, is_admin: bool, days: int = 7, now: Optional[datetime] = None
+    ) -> TrendSeries:
         """Get IOC query trend for last N days."""
-        start_date = datetime.now(timezone.utc) - timedelta(days=days)
+        now = now or datetime.now(timezone.utc)
+        start_date = now - timedelta(days=days)
         start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
 
         query_filter = IOCQuery.user_id == user_id if not is_admin else True
 
-        # Group by date - use created_at if query_date is None
+        # query_date NOT NULL (server default); filtre doğrudan kolonda kalınca
+        # ix_ioc_queries_query_date ile range scan yapılabilir (CASE ifadesi bunu engelliyordu)
+        day = func.date(IOCQuery.query_date, type_=Date).label("day")
         try:
-            date_field = case(
-                (IOCQuery.query_date.isnot(None), IOCQuery.query_date),
-                else_=IOCQuery.created_at
-            )
-            results = (
-                self.db.query(
-                    cast(date_field, Date).label("date"),
-                    func.count(IOCQuery.id).label("count"),
-                )
-                .filter(and_(query_filter, date_field >= start_date))
-                .group_by(cast(date_field, Date))
-                .order_by(cast(date_field, Date))
-                .all()
-            )
+            results = self.db.execute(
+                select(day, func.count()).where(query_filter, IOCQuery.query_date >= start_date).group_by(day)
+            ).all()
         except Exception as e:
             logger.warning(f"Error getting query trend: {e}")
             results = []
 
-        # Create date range and fill missing dates with 0
-        date_range = []
-        for i in range(days):
-            date = (datetime.now(timezone.utc) - timedelta(days=days - 1 - i)).date()
-            date_range.append(date)
-
-        trend_dict = {r.date: r.count for r in results}
+        return self._fill_trend(dict(results), days=days, now=now)
 
-        return [
-            QueryTrend(
-                date=date.strftime("%Y-%m-%d"),
-                count=trend_dict.get(date, 0),
-            )
-            for date in date_range
-        ]
+    @staticmethod
+    def _fill_trend(counts_by_day: Dict[date, int], days: int, now: datetime) -> TrendSeries:
+        """Build a trend for the last ``days`` days, filling missing dates with 0."""
+        today = now.date()
+        date_range = [today - timedelta(days=days - 1 - i) for i in range(days)]
+        return TrendSeries(
+            dates=[day.isoformat() for day in date_range],
+            counts=[counts_by_day.get(day, 0) for day in date_range],
+        )
 
     def _get_recent_activities(self, user_id: str, is_admin: bool, limit: int = 10) -> List[RecentActivity]:
         """Get recent activities."""
-        activities = []
+        query_activities: List[RecentActivity] = []
+        report_activities: List[RecentActivity] = []
 
         try:
             # Recent IOC queries
             query_filter = IOCQuery.user_id == user_id if not is_admin else True
-            recent_queries = (
-                self.db.query(IOCQuery)
-                .filter(query_filter)
-                .order_by(IOCQuery.query_date.desc() if IOCQuery.query_date else IOCQuery.created_at.desc())
+            # Yalnızca gösterilen kolonlar; results_json gibi büyük alanlar yüklenmez
+            recent_queries = self.db.execute(
+                select(IOCQuery.ioc_type, IOCQuery.ioc_value, IOCQuery.status, IOCQuery.query_date, IOCQuery.created_at)
+                .where(query_filter)
+                .order_by(IOCQuery.query_date.desc())  # query_date NOT NULL (server default)
                 .limit(limit)
-                .all()
-            )
+            ).all()
 
             for query in recent_queries:
                 timestamp = query.query_date if query.query_date else (query.created_at if query.created_at else datetime.now(timezone.utc))
-                activities.append(
+                query_activities.append(
                     RecentActivity(
                         type="ioc_query",
                         title=f"IOC Query: {query.ioc_type} - {query.ioc_value}",
                         description=f"Risk: {query.status or 'Unknown'}",
-                        timestamp=timestamp,
+                        timestamp=iso_timestamp(timestamp),
                     )
                 )
         except Exception as e:
@@ -443,208 +485,144 @@ class DashboardService:
         try:
             # Recent reports
             report_filter = Report.user_id == user_id if not is_admin else True
-            recent_reports = (
-                self.db.query(Report)
-                .filter(report_filter)
+            recent_reports = self.db.execute(
+                select(Report.title, Report.format, Report.created_at)
+                .where(report_filter)
                 .order_by(Report.created_at.desc())
                 .limit(5)
-                .all()
-            )
+            ).all()
 
             for report in recent_reports:
                 format_str = report.format.value if hasattr(report.format, 'value') else str(report.format)
                 timestamp = report.created_at if report.created_at else datetime.now(timezone.utc)
-                activities.append(
+                report_activities.append(
                     RecentActivity(
                         type="report",
                         title=f"Report: {report.title}",
                         description=f"Format: {format_str}",
-                        timestamp=timestamp,
+                        timestamp=iso_timestamp(timestamp),
                     )
                 )
         except Exception as e:
             logger.warning(f"Error getting recent reports: {e}")
 
-        # Sort by timestamp and return top N
-        activities.sort(key=lambda x: x.timestamp, reverse=True)
-        return activities[:limit]
+        # İki liste de DB'den yeniden eskiye sıralı geliyor: yeniden sıralamak yerine birleştir
+        merged = heapq.merge(query_activities, report_activities, key=attrgetter("timestamp"), reverse=True)
+        return list(islice(merged, limit))
 
     def _get_watchlist_summary(self, user_id: str, is_admin: bool) -> WatchlistSummary:
         """Get watchlist summary."""
         watchlist_filter = AssetWatchlist.user_id == user_id if not is_admin else True
 
-        # Active watchlists
-        active_watchlists = (
-            self.db.query(func.count(AssetWatchlist.id))
-            .filter(watchlist_filter)
-            .filter(AssetWatchlist.is_active == True)
-            .scalar()
-            or 0
-        )
-
-        # Total assets
-        total_assets = (
-            self.db.query(func.count(AssetWatchlistItem.id))
-            .join(AssetWatchlist, AssetWatchlistItem.watchlist_id == AssetWatchlist.id)
-            .filter(watchlist_filter)
-            .filter(AssetWatchlistItem.is_active == True)
-            .scalar()
-            or 0
-        )
-
-        # Alerts
-        alerts = (
-            self.db.query(func.count(AssetWatchlistItem.id))
-            .join(AssetWatchlist, AssetWatchlistItem.watchlist_id == AssetWatchlist.id)
-            .filter(watchlist_filter)
-            .filter(AssetWatchlistItem.is_active == True)
-            .filter(
-                or_(
-                    AssetWatchlistItem.last_status == IOCStatus.MALICIOUS,
-                    AssetWatchlistItem.last_status == IOCStatus.SUSPICIOUS,
+        # Item sayaçları tek join üzerinde FILTER'lı aggregate; last_check pasif item'ları da kapsar
+        item_stats = (
+            select(
+                func.count().filter(AssetWatchlistItem.is_active == True).label("total_assets"),
+                func.count()
+                .filter(
+                    AssetWatchlistItem.is_active == True,
+                    AssetWatchlistItem.last_status.in_((IOCStatus.MALICIOUS, IOCStatus.SUSPICIOUS)),
                 )
+                .label("alerts"),
+                func.max(AssetWatchlistItem.last_check_date).label("last_check"),
             )
-            .scalar()
-            or 0
-        )
-
-        # Last check
-        last_check = (
-            self.db.query(func.max(AssetWatchlistItem.last_check_date))
             .join(AssetWatchlist, AssetWatchlistItem.watchlist_id == AssetWatchlist.id)
-            .filter(watchlist_filter)
-            .scalar()
+            .where(watchlist_filter)
+            .subquery()
+        )
+        active_watchlists = (
+            select(func.count())
+            .select_from(AssetWatchlist)
+            .where(watchlist_filter, AssetWatchlist.is_active == True)
+            .scalar_subquery()
         )
+        row = self.db.execute(
+            select(active_watchlists, item_stats.c.total_assets, item_stats.c.alerts, item_stats.c.last_check)
+        ).one()
 
         return WatchlistSummary(
-            active_watchlists=active_watchlists,
-            total_assets=total_assets,
-            alerts=alerts,
-            last_check=last_check,
+            active_watchlists=row[0] or 0,
+            total_assets=row.total_assets or 0,
+            alerts=row.alerts or 0,
+            last_check=row.last_check,
         )
 
-    def _get_api_status(self, user_id: str) -> List[APIStatus]:
+    def _get_api_status(self, user_id: str, now: Optional[datetime] = None) -> List[APIStatus]:
         """Get API status information."""
-        # Get user's API keys
+        # Get user's API keys; kaynak zaten join'de, ayrıca sorgulanmadan doldurulur
         api_keys = (
             self.db.query(APIKey)
             .join(APISource, APIKey.api_source_id == APISource.id)
+            .options(contains_eager(APIKey.api_source))
             .filter(APIKey.user_id == user_id)
             .filter(APIKey.is_active == True)
             .filter(APISource.is_active == True)
             .all()
         )
+        if not api_keys:
+            return []
+
+        # Get usage today - tüm kaynaklar için tek GROUP BY
+        today_start = (now or datetime.now(timezone.utc)).replace(hour=0, minute=0, second=0, microsecond=0)
+        usage_today = dict(
+            self.db.execute(
+                select(ThreatIntelligenceData.source_api, func.count())
+                .join(IOCQuery, ThreatIntelligenceData.ioc_query_id == IOCQuery.id)
+                .where(
+                    IOCQuery.user_id == user_id,
+                    IOCQuery.query_date >= today_start,
+                    ThreatIntelligenceData.source_api.in_({api_key.api_source.name for api_key in api_keys}),
+                )
+                .group_by(ThreatIntelligenceData.source_api)
+            ).all()
+        )
 
         api_status_list = []
 
         for api_key in api_keys:
-            # Get API source - relationship is commented out, so query directly
-            api_source = (
-                self.db.query(APISource)
-                .filter(APISource.id == api_key.api_source_id)
-                .first()
-            )
-            
-            if not api_source:
-                continue  # Skip if API source not found
-
-            # Get usage today
-            today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-            usage_today = (
-                self.db.query(func.count(ThreatIntelligenceData.id))
-                .join(IOCQuery, ThreatIntelligenceData.ioc_query_id == IOCQuery.id)
-                .filter(IOCQuery.user_id == user_id)
-                .filter(ThreatIntelligenceData.source_api == api_source.name)
-                .filter(IOCQuery.query_date >= today_start)
-                .scalar()
-                or 0
-            )
+            api_source = api_key.api_source
 
             # Determine status
-            status = "active"
-            if api_key.test_status.value == "invalid":
-                status = "error"
-            elif api_key.test_status.value == "not_tested":
-                status = "warning"
+            status = _TEST_STATUS_TO_API_STATUS.get(api_key.test_status, "active")
 
             api_status_list.append(
                 APIStatus(
                     source=api_source.display_name or api_source.name,
                     is_active=api_key.is_active,
-                    usage_today=usage_today,
+                    usage_today=usage_today.get(api_source.name, 0),
                     limit=None,  # Would need to get from rate_limit_config
                     status=status,
-                    last_used=api_key.last_used,
+                    last_used=iso_timestamp(api_key.last_used),
                 )
             )
 
         return api_status_list
 
-    def _get_cve_summary(self) -> CVESummary:
+    def _get_cve_summary(self, now: Optional[datetime] = None) -> CVESummary:
         """Get CVE summary information."""
-        from datetime import timedelta
-
-        now = datetime.now(timezone.utc)
+        now = now or datetime.now(timezone.utc)
         last_24h = now - timedelta(hours=24)
         last_7_days = now - timedelta(days=7)
 
-        # CVEs published in last 24 hours
+        # Yayın/critical/high sayaçları günlük ön-aggregate'ten (cve_daily_stats) tek sorguda
         # Note: published_date is a Date column, so we compare with date() part
-        published_last_24h = (
-            self.db.query(func.count(CVECache.id))
-            .filter(CVECache.published_date.isnot(None))
-            .filter(CVECache.published_date >= last_24h.date())
-            .scalar()
-            or 0
-        )
-
-        # Critical CVEs (last 7 days)
-        # Critical = CVSS v3 CRITICAL or CVSS v2 HIGH (which is the highest in v2)
-        critical_count = (
-            self.db.query(func.count(CVECache.id))
-            .filter(CVECache.published_date.isnot(None))
-            .filter(CVECache.published_date >= last_7_days.date())
-            .filter(
-                or_(
-                    CVECache.cvss_v3_severity == "CRITICAL",
-                    and_(
-                        CVECache.cvss_v3_severity.is_(None),
-                        CVECache.cvss_v2_severity == "HIGH",
-                    ),
-                )
-            )
-            .scalar()
-            or 0
-        )
-
-        # High CVEs (last 7 days)
-        # High = CVSS v3 HIGH (but not CRITICAL) or CVSS v2 MEDIUM (when v3 is None)
-        high_count = (
-            self.db.query(func.count(CVECache.id))
-            .filter(CVECache.published_date.isnot(None))
-            .filter(CVECache.published_date >= last_7_days.date())
-            .filter(
-                or_(
-                    and_(
-                        CVECache.cvss_v3_severity == "HIGH",
-                        CVECache.cvss_v3_severity != "CRITICAL",
-                    ),
-                    and_(
-                        CVECache.cvss_v3_severity.is_(None),
-                        CVECache.cvss_v2_severity == "MEDIUM",
-                    ),
-                )
+        daily = daily_stats()
+        published_last_24h, critical_count, high_count = self.db.execute(
+            select(
+                func.sum(case((daily.c.day >= last_24h.date(), daily.c.total))),
+                # Critical CVEs (last 7 days)
+                func.sum(case((daily.c.day >= last_7_days.date(), daily.c.critical))),
+                # High CVEs (last 7 days)
+                func.sum(case((daily.c.day >= last_7_days.date(), daily.c.high))),
             )
-            .scalar()
-            or 0
-        )
+        ).one()
 
         # Last updated CVE
-        last_updated_cve = (
-            self.db.query(CVECache)
+        last_updated_cve = self.db.execute(
+            select(CVECache.modified_date, CVECache.published_date)
             .order_by(CVECache.modified_date.desc().nulls_last(), CVECache.published_date.desc().nulls_last())
-            .first()
-        )
+            .limit(1)
+        ).first()
         last_updated = None
         if last_updated_cve:
             if last_updated_cve.modified_date:
@@ -657,92 +635,47 @@ class DashboardService:
                 ).replace(tzinfo=timezone.utc)
 
         # Recent CVEs (last 5)
-        recent_cves = (
-            self.db.query(CVECache.cve_id)
-            .order_by(CVECache.published_date.desc().nulls_last(), CVECache.cached_at.desc())
-            .limit(5)
-            .all()
+        recent_cve_ids = list(
+            self.db.scalars(
+                select(CVECache.cve_id)
+                .order_by(CVECache.published_date.desc().nulls_last(), CVECache.cached_at.desc())
+                .limit(5)
+            )
         )
-        recent_cve_ids = [cve[0] for cve in recent_cves]
 
         return CVESummary(
-            published_last_24h=published_last_24h,
-            critical_count=critical_count,
-            high_count=high_count,
+            published_last_24h=published_last_24h or 0,
+            critical_count=critical_count or 0,
+            high_count=high_count or 0,
             last_updated=last_updated,
             recent_cves=recent_cve_ids,
         )
 
-    def _get_cve_trend(self, days: int = 7) -> List[CVETrend]:
+    def _get_cve_trend(self, days: int = 7, now: Optional[datetime] = None) -> TrendSeries:
         """Get CVE publication trend for the last N days."""
-        from datetime import timedelta
-
-        now = datetime.now(timezone.utc)
+        now = now or datetime.now(timezone.utc)
         start_date = (now - timedelta(days=days)).date()
 
         # Get CVE counts by date
-        trend_data = (
-            self.db.query(
-                cast(CVECache.published_date, Date).label("date"),
-                func.count(CVECache.id).label("count"),
-            )
-            .filter(CVECache.published_date >= start_date)
-            .filter(CVECache.published_date.isnot(None))
-            .group_by(cast(CVECache.published_date, Date))
-            .order_by(cast(CVECache.published_date, Date))
-            .all()
-        )
+        daily = daily_stats()
+        trend_data = self.db.execute(
+            select(daily.c.day, daily.c.total).where(daily.c.day >= start_date)
+        ).all()
 
         # Create a dictionary for easy lookup
-        trend_dict = {str(item.date): item.count for item in trend_data}
+        trend_dict = {str(item.day): item.total for item in trend_data}
 
         # Fill in missing dates with 0
-        trend_list = []
-        for i in range(days):
-            date = (now - timedelta(days=days - 1 - i)).date()
-            date_str = str(date)
-            count = trend_dict.get(date_str, 0)
-            trend_list.append(CVETrend(date=date_str, count=count))
-
-        return trend_list
+        dates = [str((now - timedelta(days=days - 1 - i)).date()) for i in range(days)]
+        return TrendSeries(dates=dates, counts=[trend_dict.get(date, 0) for date in dates])
 
-    def _get_cvss_distribution(self) -> List[CVSSDistribution]:
+    def _get_cvss_distribution(self) -> CVSSDistributionSeries:
         """Get CVSS score distribution."""
-        # Define score ranges
-        ranges = [
-            ("0.0-2.0", 0.0, 2.0),
-            ("2.1-4.0", 2.1, 4.0),
-            ("4.1-6.0", 4.1, 6.0),
-            ("6.1-8.0", 6.1, 8.0),
-            ("8.1-10.0", 8.1, 10.0),
-        ]
-
-        distribution = []
-
-        for range_name, min_score, max_score in ranges:
-            # Count CVEs in this range (prefer CVSS v3, fallback to v2)
-            count = (
-                self.db.query(func.count(CVECache.id))
-                .filter(
-                    or_(
-                        and_(
-                            CVECache.cvss_v3_score.isnot(None),
-                            CVECache.cvss_v3_score >= min_score,
-                            CVECache.cvss_v3_score <= max_score,
-                        ),
-                        and_(
-                            CVECache.cvss_v3_score.is_(None),
-                            CVECache.cvss_v2_score.isnot(None),
-                            CVECache.cvss_v2_score >= min_score,
-                            CVECache.cvss_v2_score <= max_score,
-                        ),
-                    )
-                )
-                .scalar()
-                or 0
-            )
-
-            distribution.append(CVSSDistribution(score_range=range_name, count=count))
-
-        return distribution
+        # Count CVEs per range (prefer CVSS v3, fallback to v2), pre-aggregated in cve_cvss_hist
+        hist = cvss_hist()
+        bucket_counts = dict(self.db.execute(select(hist.c.bucket, hist.c.count)).all())
 
+        return CVSSDistributionSeries(
+            ranges=[range_name for range_name, _, _ in CVSS_BUCKETS],
+            counts=[bucket_counts.get(index, 0) for index in range(len(CVSS_BUCKETS))],
+        )
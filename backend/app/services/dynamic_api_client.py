@@ -1,110 +1,244 @@
 """Dynamic API client for custom threat intelligence APIs."""
 
-import json
-from typing import Any, Optional
+import re
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Callable, Optional
 
+import orjson
 import requests
 from jsonpath_ng import parse
+from jsonpath_ng.jsonpath import JSONPath
 from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.models.api_source import APISource, AuthenticationType
 
 
+# "$", "$.data.score" veya (seed'lerdeki gibi) "$"sız "data.score" düz alan zincirleri: jsonpath_ng'ye gerek yok
+_DOTTED_PATH_RE = re.compile(r"^(?:\$|(?:\$\.)?([A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*))$")
+
+
+def _dotted_getter(keys: tuple[str, ...]) -> Callable[[Any], Any]:
+    def get(data: Any) -> Any:
+        for key in keys:
+            data = data[key]
+        return data
+
+    return get
+
+
+def _jsonpath_getter(expr: JSONPath) -> Callable[[Any], Any]:
+    def get(data: Any) -> Any:
+        matches = expr.find(data)
+        return matches[0].value if matches else None
+
+    return get
+
+
+@lru_cache(maxsize=512)
+def _compile_extractor(json_path: str) -> Callable[[Any], Any]:
+    """Compile a JSONPath into a getter for its first match, shared per process.
+
+    Plain dotted paths become direct dict lookups; wildcards, filters and
+    indexes go through jsonpath_ng.
+    """
+    match = _DOTTED_PATH_RE.match(json_path)
+    if match:
+        keys = match.group(1)
+        return _dotted_getter(tuple(keys.split(".")) if keys else ())
+    return _jsonpath_getter(parse(json_path))
+
+
+_PLACEHOLDER_RE = re.compile(r"\{(api_key|username|password|ioc_type|ioc_value)\}")
+
+
+def _substitute(template: str, values: dict[str, str]) -> str:
+    """Fill placeholders in a single pass; ones without a value are left as-is."""
+    return _PLACEHOLDER_RE.sub(lambda match: values.get(match.group(1), match.group(0)), template)
+
+
+def _has_ioc_placeholder(template: str) -> bool:
+    return "{ioc_type}" in template or "{ioc_value}" in template
+
+
+def _fill_ioc(template: str, ioc_type: str, ioc_value: str) -> str:
+    return _substitute(template, {"ioc_type": ioc_type, "ioc_value": ioc_value})
+
+
+def _split_templates(templates: dict[str, Any]) -> tuple[dict[str, Any], list[tuple[str, str]]]:
+    """Split templates into values fixed for the client and (key, template) pairs that need the IOC."""
+    static: dict[str, Any] = {}
+    dynamic: list[tuple[str, str]] = []
+    for key, template in templates.items():
+        if isinstance(template, str) and _has_ioc_placeholder(template):
+            dynamic.append((key, template))
+        else:
+            static[key] = template
+    return static, dynamic
+
+
+def _encode_body(body_str: str) -> Optional[bytes]:
+    """Encode a filled string body template; valid JSON is sent as-is, anything else is wrapped."""
+    try:
+        # Parse yalnızca doğrulama için: metin yeniden serialize edilmez
+        decoded = orjson.loads(body_str)
+    except orjson.JSONDecodeError:
+        return orjson.dumps({"value": body_str})
+    return None if decoded is None else body_str.encode()
+
+
+# Tüm kaynaklar için ortak HTTP session (client sorgu başına oluşturuluyor, keep-alive process içinde kalır)
+_http_session: Optional[requests.Session] = None
+
+
+def get_http_session() -> requests.Session:
+    """Return the shared pooled HTTP session, creating it on first use."""
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        # Session farklı kullanıcıların anahtarlarıyla paylaşılıyor: sunucu cookie'leri saklanmaz
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        # 429 retry'lanmaz: kaynağın rate limit'i tekrar denemelerle daha da tüketilmesin
+        retry = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _http_session = session
+    return _http_session
+
+
+def close_http_session() -> None:
+    """Close the shared HTTP session (application shutdown)."""
+    global _http_session
+    if _http_session is not None:
+        _http_session.close()
+        _http_session = None
+
+
 class DynamicAPIClient:
     """Dynamic API client that uses template-based configuration."""
 
-    def __init__(self, api_source: APISource, api_key: str, username: Optional[str] = None, password: Optional[str] = None, api_url_override: Optional[str] = None) -> None:
+    def __init__(self, api_source: APISource, api_key: str, username: Optional[str] = None, password: Optional[str] = None, api_url_override: Optional[str] = None, session: Optional[requests.Session] = None) -> None:
         self.api_source = api_source
+        self._session = session or get_http_session()
         self.api_key = api_key
         self.username = username
         self.password = password
         self.base_url = api_url_override or api_source.base_url
         self.request_config = api_source.request_config or {}
         self.response_config = api_source.response_config or {}
+        # Response path'leri bir kez derlenir; query() başına yalnızca getter çalışır
+        self._risk_score_getter = self._compile_path(self.response_config.get("risk_score_path"))
+        self._status_getter = self._compile_path(self.response_config.get("status_path"))
+        data_path = self.response_config.get("data_path", "$")
+        # Geçersiz data_path'te ham response döner (önceki davranış)
+        self._data_getter = self._compile_path(data_path) or (_compile_extractor("$") if data_path else None)
+
+        # Boş username/password placeholder'ı olduğu gibi bırakır (önceki davranış)
+        self._credentials = {"api_key": self.api_key}
+        if username:
+            self._credentials["username"] = username
+        if password:
+            self._credentials["password"] = password
+        # Kimlik bilgileri client ömrü boyunca sabit: template'lere bir kez yerleştirilir,
+        # sorgu başına yalnızca {ioc_type}/{ioc_value} içeren değerler doldurulur
+        self._headers = {
+            # Header değerleri string olmak zorunda (requests)
+            key: self._fill_credentials(str(value)) for key, value in self.request_config.get("headers", {}).items()
+        }
+        self._static_params, self._dynamic_params = _split_templates(
+            {
+                key: self._fill_credentials(value) if isinstance(value, str) else value
+                for key, value in self.request_config.get("query_params", {}).items()
+            }
+        )
+        # Body JSON olarak encode edilmiş bytes gider; IOC içermeyen body bir kez encode edilir
+        self._body_json: Optional[bytes] = None
+        self._body_text: Optional[str] = None
+        self._static_body: dict[str, Any] = {}
+        self._dynamic_body: list[tuple[str, str]] = []
+        body_template = self.request_config.get("body_template")
+        if body_template and isinstance(body_template, str):
+            body_text = self._fill_credentials(body_template)
+            if _has_ioc_placeholder(body_text):
+                self._body_text = body_text
+            else:
+                self._body_json = _encode_body(body_text)
+        elif body_template and isinstance(body_template, dict):
+            # Dict template'te (önceki davranış) yalnızca {api_key} ve IOC değerleri doldurulur
+            self._static_body, self._dynamic_body = _split_templates({
+                key: _substitute(value, {"api_key": self.api_key}) if isinstance(value, str) else value
+                for key, value in body_template.items()
+            })
+            if not self._dynamic_body:
+                self._body_json = orjson.dumps(self._static_body)
+        self._has_content_type = any(key.lower() == "content-type" for key in self._headers)
+
+        # Auth da client ömrü boyunca sabit (requests (user, pass) tuple'ını basic auth sayar)
+        self._auth: Optional[tuple[str, str]] = None
+        if api_source.authentication_type == AuthenticationType.BASIC_AUTH:
+            if username and password:
+                self._auth = (username, password)
+        elif api_source.authentication_type == AuthenticationType.BEARER_TOKEN:
+            self._headers["Authorization"] = f"Bearer {api_key}"
+
+    @staticmethod
+    def _compile_path(json_path: Optional[str]) -> Optional[Callable[[Any], Any]]:
+        """Compile a configured JSONPath (None when unset or invalid)."""
+        if not json_path:
+            return None
+
+        try:
+            return _compile_extractor(json_path)
+        except Exception as e:
+            logger.warning(f"Invalid JSONPath {json_path}: {e}")
+            return None
 
     def _build_url(self, ioc_type: str, ioc_value: str) -> str:
         """Build the full URL from template."""
         endpoint_template = self.request_config.get("endpoint_template", "/{ioc_type}/{ioc_value}")
-        endpoint = endpoint_template.replace("{ioc_type}", ioc_type).replace("{ioc_value}", ioc_value)
+        endpoint = _fill_ioc(endpoint_template, ioc_type, ioc_value)
         return f"{self.base_url.rstrip('/')}{endpoint}"
 
+    def _fill_credentials(self, template: str) -> str:
+        """Substitute the client's fixed credentials into a template."""
+        return _substitute(template, self._credentials)
+
     def _build_headers(self) -> dict[str, str]:
         """Build request headers from template."""
-        headers = self.request_config.get("headers", {})
-        processed_headers = {}
-        for key, value_template in headers.items():
-            value = value_template.replace("{api_key}", self.api_key)
-            if self.username:
-                value = value.replace("{username}", self.username)
-            if self.password:
-                value = value.replace("{password}", self.password)
-            processed_headers[key] = value
-        return processed_headers
+        # Kopya: _prepare_request Content-Type ekleyebilir
+        return dict(self._headers)
 
     def _build_params(self, ioc_type: str, ioc_value: str) -> dict[str, str]:
         """Build query parameters from template."""
-        params = self.request_config.get("query_params", {})
-        processed_params = {}
-        for key, value_template in params.items():
-            value = (
-                value_template.replace("{api_key}", self.api_key)
-                .replace("{ioc_type}", ioc_type)
-                .replace("{ioc_value}", ioc_value)
-            )
-            if self.username:
-                value = value.replace("{username}", self.username)
-            if self.password:
-                value = value.replace("{password}", self.password)
-            processed_params[key] = value
-        return processed_params
-
-    def _build_body(self, ioc_type: str, ioc_value: str) -> Optional[dict[str, Any]]:
-        """Build request body from template."""
-        body_template = self.request_config.get("body_template")
-        if not body_template:
-            return None
+        return {
+            **self._static_params,
+            **{key: _fill_ioc(template, ioc_type, ioc_value) for key, template in self._dynamic_params},
+        }
 
-        # Simple template replacement for body
-        if isinstance(body_template, str):
-            body_str = (
-                body_template.replace("{api_key}", self.api_key)
-                .replace("{ioc_type}", ioc_type)
-                .replace("{ioc_value}", ioc_value)
-            )
-            if self.username:
-                body_str = body_str.replace("{username}", self.username)
-            if self.password:
-                body_str = body_str.replace("{password}", self.password)
-            try:
-                return json.loads(body_str)
-            except json.JSONDecodeError:
-                return {"value": body_str}
-        elif isinstance(body_template, dict):
-            # Recursively replace placeholders in dict
-            body = {}
-            for key, value in body_template.items():
-                if isinstance(value, str):
-                    body[key] = (
-                        value.replace("{api_key}", self.api_key)
-                        .replace("{ioc_type}", ioc_type)
-                        .replace("{ioc_value}", ioc_value)
-                    )
-                else:
-                    body[key] = value
-            return body
-        return None
-
-    def _extract_value(self, data: dict[str, Any], json_path: str) -> Any:
-        """Extract value from JSON using JSONPath."""
-        if not json_path:
-            return None
+    def _build_body(self, ioc_type: str, ioc_value: str) -> Optional[bytes]:
+        """Build the JSON-encoded request body from template."""
+        if self._body_text is not None:
+            return _encode_body(_fill_ioc(self._body_text, ioc_type, ioc_value))
+        if self._dynamic_body:
+            return orjson.dumps({
+                **self._static_body,
+                **{key: _fill_ioc(template, ioc_type, ioc_value) for key, template in self._dynamic_body},
+            })
+        return self._body_json
 
+    @staticmethod
+    def _extract_value(data: dict[str, Any], getter: Callable[[Any], Any]) -> Any:
+        """Extract the first value matched by a compiled JSONPath."""
         try:
-            jsonpath_expr = parse(json_path)
-            matches = [match.value for match in jsonpath_expr.find(data)]
-            return matches[0] if matches else None
+            return getter(data)
+        except (KeyError, IndexError, TypeError):
+            # Düz path'te eksik alan: jsonpath_ng'deki "eşleşme yok" ile aynı
+            return None
         except Exception as e:
-            logger.warning(f"Failed to extract value from path {json_path}: {e}")
+            logger.warning(f"Failed to extract value with {getter}: {e}")
             return None
 
     def _parse_response(self, response_data: dict[str, Any]) -> dict[str, Any]:
@@ -114,24 +248,21 @@ class DynamicAPIClient:
         }
 
         # Extract risk score
-        risk_score_path = self.response_config.get("risk_score_path")
-        if risk_score_path:
-            parsed["risk_score"] = self._extract_value(response_data, risk_score_path)
+        if self._risk_score_getter is not None:
+            parsed["risk_score"] = self._extract_value(response_data, self._risk_score_getter)
 
         # Extract status
-        status_path = self.response_config.get("status_path")
-        if status_path:
-            parsed["status"] = self._extract_value(response_data, status_path)
+        if self._status_getter is not None:
+            parsed["status"] = self._extract_value(response_data, self._status_getter)
 
         # Extract main data
-        data_path = self.response_config.get("data_path", "$")
-        if data_path:
-            parsed["data"] = self._extract_value(response_data, data_path) or response_data
+        if self._data_getter is not None:
+            parsed["data"] = self._extract_value(response_data, self._data_getter) or response_data
 
         return parsed
 
-    def query(self, ioc_type: str, ioc_value: str, timeout: int = 30) -> dict[str, Any]:
-        """Query the API with given IOC."""
+    def _prepare_request(self, ioc_type: str, ioc_value: str) -> tuple[str, dict[str, Any]]:
+        """Build the method and request kwargs for a query."""
         method = self.request_config.get("method", "GET").upper()
 
         url = self._build_url(ioc_type, ioc_value)
@@ -139,74 +270,52 @@ class DynamicAPIClient:
         params = self._build_params(ioc_type, ioc_value) if method == "GET" else None
         body = self._build_body(ioc_type, ioc_value) if method in ["POST", "PUT", "PATCH"] else None
 
-        # Handle authentication
-        if self.api_source.authentication_type == AuthenticationType.BASIC_AUTH:
-            if self.username and self.password:
-                from requests.auth import HTTPBasicAuth
-                auth = HTTPBasicAuth(self.username, self.password)
-            else:
-                auth = None
-        elif self.api_source.authentication_type == AuthenticationType.BEARER_TOKEN:
-            headers["Authorization"] = f"Bearer {self.api_key}"
-            auth = None
-        else:
-            auth = None
+        # json= ile aynı: template'te Content-Type yoksa eklenir
+        if body is not None and not self._has_content_type:
+            headers["Content-Type"] = "application/json"
+
+        return method, {"url": url, "headers": headers, "params": params, "data": body, "auth": self._auth}
+
+    def _success_result(self, response_data: Any, status_code: int, ioc_type: str, ioc_value: str) -> dict[str, Any]:
+        parsed = self._parse_response(response_data)
+        parsed["source"] = self.api_source.name
+        parsed["ioc_type"] = ioc_type
+        parsed["ioc_value"] = ioc_value
+        parsed["status"] = "success"
+        parsed["http_status"] = status_code
+        return parsed
+
+    def _error_result(self, ioc_type: str, ioc_value: str, status: str, error: str) -> dict[str, Any]:
+        return {
+            "source": self.api_source.name,
+            "ioc_type": ioc_type,
+            "ioc_value": ioc_value,
+            "status": status,
+            "error": error,
+        }
+
+    def query(self, ioc_type: str, ioc_value: str, timeout: int = 30) -> dict[str, Any]:
+        """Query the API with given IOC."""
+        method, request_kwargs = self._prepare_request(ioc_type, ioc_value)
 
         try:
-            response = requests.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=body,
-                auth=auth,
-                timeout=timeout,
-            )
+            response = self._session.request(method=method, timeout=timeout, **request_kwargs)
             response.raise_for_status()
 
-            # Parse response
+            # Parse response (bytes doğrudan orjson'a: ara str oluşmaz; UTF-8 olmayan gövde text olarak döner)
             try:
-                response_data = response.json()
-            except ValueError:
+                response_data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
                 response_data = {"text": response.text}
 
-            parsed = self._parse_response(response_data)
-            parsed["source"] = self.api_source.name
-            parsed["ioc_type"] = ioc_type
-            parsed["ioc_value"] = ioc_value
-            parsed["status"] = "success"
-            parsed["http_status"] = response.status_code
-
-            return parsed
+            return self._success_result(response_data, response.status_code, ioc_type, ioc_value)
 
         except requests.exceptions.Timeout:
-            return {
-                "source": self.api_source.name,
-                "ioc_type": ioc_type,
-                "ioc_value": ioc_value,
-                "status": "timeout",
-                "error": "Request timeout",
-            }
+            return self._error_result(ioc_type, ioc_value, "timeout", "Request timeout")
         except requests.exceptions.RequestException as e:
             logger.error(f"API request failed for {self.api_source.name}: {e}")
-            return {
-                "source": self.api_source.name,
-                "ioc_type": ioc_type,
-                "ioc_value": ioc_value,
-                "status": "error",
-                "error": str(e),
-            }
+            return self._error_result(ioc_type, ioc_value, "error", str(e))
         except Exception as e:
             logger.error(f"Unexpected error in API client for {self.api_source.name}: {e}")
-            return {
-                "source": self.api_source.name,
-                "ioc_type": ioc_type,
-                "ioc_value": ioc_value,
-                "status": "error",
-                "error": str(e),
-            }
-
-
-
-
+            return self._error_result(ioc_type, ioc_value, "error", str(e))
 
@@ -10,9 +10,9 @@ from sqlalchemy.orm import Session
 from app.core.encryption import decrypt_value
 from app.models.api_source import APISource, APIKey, UpdateMode, AuthenticationType
 from app.models.ioc_query import IOCQuery, ThreatIntelligenceData
+from app.schemas.base import iso_timestamp
 from app.schemas.ioc import IOCQueryRequest, IOCQueryResponse, IOCSourceResult
 from app.services.cache import ioc_cache
-from app.services.redis_cache import redis_cache
 from app.services.dynamic_api_client import DynamicAPIClient
 from loguru import logger
 
@@ -320,25 +320,10 @@ class IOCService:
             auto_mode_only: If True, only use API keys with update_mode='auto'. 
                           Used for scheduled/automatic queries to respect user preferences.
         """
-        # Check Redis cache first
-        redis_key = f"ioc:{payload.ioc_type.lower()}:{payload.ioc_value.lower()}"
-        cached_data = redis_cache.get(redis_key)
-        if cached_data:
-            logger.info(f"Redis cache hit for {payload.ioc_type}:{payload.ioc_value}")
-            try:
-                return IOCQueryResponse(**cached_data)
-            except Exception as e:
-                logger.warning(f"Failed to parse cached IOC data: {e}")
-        
-        # Check in-memory cache as fallback
+        # In-process cache, then Redis (shared by all workers)
         cached_response = ioc_cache.get(payload.ioc_type, payload.ioc_value)
         if cached_response:
-            logger.info(f"In-memory cache hit for {payload.ioc_type}:{payload.ioc_value}")
-            # Save to Redis cache for future use
-            try:
-                redis_cache.set(redis_key, cached_response.dict(), ttl=300)  # 5 minutes
-            except Exception as e:
-                logger.warning(f"Failed to save IOC to Redis cache: {e}")
+            logger.info(f"Cache hit for {payload.ioc_type}:{payload.ioc_value}")
             return cached_response
 
         # Get active API keys for requested sources
@@ -402,13 +387,8 @@ class IOCService:
             queried_at=datetime.now(timezone.utc),
         )
 
-        # Cache the response
+        # Cache the response (in-process + Redis)
         ioc_cache.set(response)
-        # Save to Redis cache
-        try:
-            redis_cache.set(redis_key, response.dict(), ttl=300)  # 5 minutes
-        except Exception as e:
-            logger.warning(f"Failed to save IOC to Redis cache: {e}")
 
         # Save to database
         self._save_query_to_db(user_id, payload, response)
@@ -550,7 +530,6 @@ class IOCService:
                             "total": 0,
                             "page": page,
                             "page_size": page_size,
-                            "total_pages": 0,
                         }
                 else:
                     # No watchlist items, return empty result
@@ -559,7 +538,6 @@ class IOCService:
                         "total": 0,
                         "page": page,
                         "page_size": page_size,
-                        "total_pages": 0,
                     }
             else:
                 # No shared watchlists, return empty result
@@ -568,7 +546,6 @@ class IOCService:
                     "total": 0,
                     "page": page,
                     "page_size": page_size,
-                    "total_pages": 0,
                 }
         else:
             # For admin/analyst, use existing logic - only user's own queries
@@ -620,7 +597,6 @@ class IOCService:
                         "total": 0,
                         "page": page,
                         "page_size": page_size,
-                        "total_pages": 0,
                     }
                 
                 # Check if watchlist is shared with viewer
@@ -645,7 +621,6 @@ class IOCService:
                         "total": 0,
                         "page": page,
                         "page_size": page_size,
-                        "total_pages": 0,
                     }
             
             query = (
@@ -733,18 +708,15 @@ class IOCService:
         offset = (page - 1) * page_size
         queries = query.order_by(IOCQuery.query_date.desc()).offset(offset).limit(page_size).all()
 
-        # Calculate total pages
-        total_pages = (total + page_size - 1) // page_size if total > 0 else 0
-
         # Convert to response format
         items = []
         for q in queries:
-            # Extract queried_sources from results_json
+            # Extract queried_sources from results_json (plain dicts; the route picks the fields it needs)
             queried_sources = None
             if q.results_json and isinstance(q.results_json, dict):
                 sources_data = q.results_json.get("queried_sources", [])
                 if sources_data:
-                    queried_sources = [IOCSourceResult(**source) for source in sources_data if isinstance(source, dict)]
+                    queried_sources = [source for source in sources_data if isinstance(source, dict)]
             
             items.append({
                 "id": q.id,
@@ -752,8 +724,8 @@ class IOCService:
                 "ioc_value": q.ioc_value,
                 "risk_score": q.risk_score,
                 "status": q.status,
-                "query_date": q.query_date,
-                "created_at": q.created_at,
+                "query_date": iso_timestamp(q.query_date),
+                "created_at": iso_timestamp(q.created_at),
                 "queried_sources": queried_sources,
             })
 
@@ -762,7 +734,6 @@ class IOCService:
             "total": total,
             "page": page,
             "page_size": page_size,
-            "total_pages": total_pages,
         }
 
     def get_query_detail(self, query_id: str, user_id: str) -> Optional[dict]:
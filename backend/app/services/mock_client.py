@@ -1,4 +1,4 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from app.services.base_client import BaseThreatClient
 
@@ -6,7 +6,9 @@ from app.services.base_client import BaseThreatClient
 class MockThreatClient(BaseThreatClient):
     """Simple mock client until real integrations are implemented."""
 
-    async def query(self, ioc_type: str, ioc_value: str) -> Dict[str, Any]:
+    async def query(
+        self, ioc_type: str, ioc_value: str, ctx: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         return {
             "ioc_type": ioc_type,
             "ioc_value": ioc_value,
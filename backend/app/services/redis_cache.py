@@ -1,18 +1,70 @@
 """Redis cache service for CVE and IOC data."""
 
 import json
+import threading
 from datetime import timedelta
-from typing import Optional
+from typing import List, Optional
 
 import redis
+import zstandard
 from loguru import logger
 
 from app.core.config import get_settings
 
 settings = get_settings()
 
-# Global Redis client instance
+# Byte payload'ları 1 byte'lık başlıkla saklanır: b"z" zstd sıkıştırılmış, b"r" ham
+_COMPRESS_MIN_BYTES = 4096
+_ZSTD_LEVEL = 3
+# Compressor/decompressor nesneleri thread-safe değil; threadpool'daki her thread kendi örneğini kullanır
+_zstd_local = threading.local()
+
+
+def _pack(value: bytes) -> bytes:
+    if len(value) <= _COMPRESS_MIN_BYTES:
+        return b"r" + value
+    compressor = getattr(_zstd_local, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_local.compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+    return b"z" + compressor.compress(value)
+
+
+def _unpack(value: Optional[bytes]) -> Optional[bytes]:
+    if not value:
+        return value
+    marker = value[:1]
+    if marker == b"z":
+        decompressor = getattr(_zstd_local, "decompressor", None)
+        if decompressor is None:
+            decompressor = _zstd_local.decompressor = zstandard.ZstdDecompressor()
+        return decompressor.decompress(value[1:])
+    if marker == b"r":
+        return value[1:]
+    # Başlıksız eski kayıtlar olduğu gibi döner
+    return value
+
+
+# Global Redis client instances
 _redis_client: Optional[redis.Redis] = None
+# decode_responses=False: önceden serialize edilmiş payload'lar str'ye decode edilmeden döner
+_redis_bytes_client: Optional[redis.Redis] = None
+
+
+def _connect(decode_responses: bool) -> Optional[redis.Redis]:
+    try:
+        client = redis.from_url(
+            settings.redis_url or "redis://localhost:6379/0",
+            decode_responses=decode_responses,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+        )
+        # Test connection
+        client.ping()
+        logger.info("Redis connection established")
+        return client
+    except Exception as e:
+        logger.warning(f"Redis connection failed: {e}. Falling back to in-memory cache.")
+        return None
 
 
 def get_redis_client() -> Optional[redis.Redis]:
@@ -23,23 +75,24 @@ def get_redis_client() -> Optional[redis.Redis]:
         return None
 
     if _redis_client is None:
-        try:
-            _redis_client = redis.from_url(
-                settings.redis_url or "redis://localhost:6379/0",
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-            )
-            # Test connection
-            _redis_client.ping()
-            logger.info("Redis connection established")
-        except Exception as e:
-            logger.warning(f"Redis connection failed: {e}. Falling back to in-memory cache.")
-            _redis_client = None
+        _redis_client = _connect(decode_responses=True)
 
     return _redis_client
 
 
+def get_redis_bytes_client() -> Optional[redis.Redis]:
+    """Get or create the Redis client that returns raw bytes."""
+    global _redis_bytes_client
+
+    if not settings.redis_enabled:
+        return None
+
+    if _redis_bytes_client is None:
+        _redis_bytes_client = _connect(decode_responses=False)
+
+    return _redis_bytes_client
+
+
 class RedisCache:
     """Redis cache wrapper for CVE and IOC data."""
 
@@ -47,6 +100,7 @@ class RedisCache:
         """Initialize Redis cache with default TTL in seconds."""
         self.default_ttl = default_ttl
         self.client = get_redis_client()
+        self.bytes_client = get_redis_bytes_client()
 
     def get(self, key: str) -> Optional[dict]:
         """Get value from cache."""
@@ -76,6 +130,43 @@ class RedisCache:
             logger.warning(f"Redis set error for key {key}: {e}")
             return False
 
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get the stored payload as bytes (caller decodes/validates it directly)."""
+        if not self.bytes_client:
+            return None
+
+        try:
+            return _unpack(self.bytes_client.get(key))
+        except Exception as e:
+            logger.warning(f"Redis get error for key {key}: {e}")
+            return None
+
+    def get_many_bytes(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Get payloads for ``keys`` with a single MGET (None for misses)."""
+        if not self.bytes_client or not keys:
+            return [None] * len(keys)
+
+        try:
+            return [_unpack(value) for value in self.bytes_client.mget(keys)]
+        except Exception as e:
+            logger.warning(f"Redis mget error for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+
+    def set_bytes(self, key: str, value: bytes, ttl: Optional[int] = None) -> bool:
+        """Set an already serialized payload in cache with optional TTL.
+
+        Payloads over 4 KiB are zstd-compressed; get_bytes/get_many_bytes undo it.
+        """
+        if not self.bytes_client:
+            return False
+
+        try:
+            self.bytes_client.setex(key, ttl or self.default_ttl, _pack(value))
+            return True
+        except Exception as e:
+            logger.warning(f"Redis set error for key {key}: {e}")
+            return False
+
     def delete(self, key: str) -> bool:
         """Delete key from cache."""
         if not self.client:
@@ -114,6 +205,68 @@ class RedisCache:
             return 0
 
 
+# Token bucket durumu (tokens, ts) tek hash'te; okuma-doldurma-harcama atomik.
+# Token'lar eksiye düşebilir: çağıran dönen süre kadar bekleyip devam eder (rezervasyon).
+# ARGV: rate (token/sn), burst, istenen token, ceza süresi (sn, Retry-After)
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local penalty = tonumber(ARGV[4])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+if penalty > 0 then
+    tokens = math.min(tokens, -penalty * rate)
+end
+tokens = tokens - requested
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+class TokenBucket:
+    """Token bucket shared by all workers through Redis.
+
+    ``acquire`` returns how long the caller must wait before proceeding, or None
+    when Redis is unavailable (caller falls back to a process-local limit).
+    """
+
+    def __init__(self, key: str, rate: float, burst: int) -> None:
+        self.key = key
+        self.rate = rate
+        self.burst = burst
+        self._script = None
+
+    def _run(self, requested: int, penalty: float) -> Optional[float]:
+        client = get_redis_client()
+        if not client:
+            return None
+
+        try:
+            if self._script is None:
+                self._script = client.register_script(_TOKEN_BUCKET_LUA)
+            return float(self._script(keys=[self.key], args=[self.rate, self.burst, requested, penalty]))
+        except Exception as e:
+            logger.warning(f"Redis token bucket error for key {self.key}: {e}")
+            return None
+
+    def acquire(self, tokens: int = 1) -> Optional[float]:
+        """Take ``tokens`` and return the wait in seconds before using them."""
+        return self._run(tokens, 0)
+
+    def penalize(self, seconds: float) -> None:
+        """Block the bucket for ``seconds`` (e.g. upstream Retry-After)."""
+        self._run(0, seconds)
+
+
 # Global Redis cache instance
 redis_cache = RedisCache(default_ttl=3600)  # 1 hour default TTL
 
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 
 from app.models.ioc_query import IOCQuery, ThreatIntelligenceData
 from app.models.report import Report, ReportFormat
+from app.schemas.base import iso_timestamp
 from app.schemas.report import ReportCreate, ReportUpdate
 from loguru import logger
 
@@ -195,14 +196,12 @@ class ReportService:
             total = len(reports)
             offset = (page - 1) * page_size
             paginated_reports = reports[offset:offset + page_size]
-            total_pages = (total + page_size - 1) // page_size
             
             return {
                 "items": [self._to_response(r) for r in paginated_reports],
                 "total": total,
                 "page": page,
                 "page_size": page_size,
-                "total_pages": total_pages,
             }
         else:
             # For admin/analyst, only show their own reports
@@ -224,15 +223,11 @@ class ReportService:
         offset = (page - 1) * page_size
         reports = query.order_by(Report.created_at.desc()).offset(offset).limit(page_size).all()
 
-        # Calculate total pages
-        total_pages = (total + page_size - 1) // page_size if total > 0 else 0
-
         return {
             "items": [self._to_response(r) for r in reports],
             "total": total,
             "page": page,
             "page_size": page_size,
-            "total_pages": total_pages,
         }
 
     def update_report(self, report_id: str, user_id: str, report_data: ReportUpdate) -> Optional[Report]:
@@ -400,8 +395,8 @@ class ReportService:
             "format": report.format.value,
             "shared_link": report.shared_link,
             "ioc_query_ids": report.ioc_query_ids or [],
-            "created_at": report.created_at,
-            "updated_at": report.updated_at,
+            "created_at": iso_timestamp(report.created_at),
+            "updated_at": iso_timestamp(report.updated_at),
         }
 
     def export_report(self, report_id: str, user_id: str, format: str, include_raw_data: bool = False) -> dict:
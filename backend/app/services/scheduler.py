@@ -1,25 +1,45 @@
-"""Background job scheduler for watchlist monitoring."""
+"""Background job schedulers for watchlist monitoring and database maintenance."""
 
 import threading
 from datetime import datetime, timezone, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from loguru import logger
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.db.base import SessionLocal
-from app.models.watchlist import AssetWatchlist, AssetWatchlistItem
+from app.db.base import IS_POSTGRESQL, SessionLocal
+from app.db.cve_stats import refresh_cve_stat_views
+from app.db.partitions import drop_expired_check_history_partitions, ensure_check_history_partitions
+from app.models.watchlist import AssetCheckHistory, AssetWatchlist, AssetWatchlistItem, IOCStatus, RiskThreshold
 from app.services.alert_service import AlertService
 from app.services.ioc_service import IOCService
+from app.schemas.alert import AlertCreate
 from app.schemas.ioc import IOCQueryRequest
-from app.utils.logger import get_logger
 
-logger = get_logger(__name__)
 settings = get_settings()
 
+# Bir tick'te kaç check history satırı birikince INSERT + commit yapılacağı
+HISTORY_BATCH_SIZE = 100
+
+
+class _PendingChecks:
+    """Item updates, check history rows and alerts collected during a scheduler tick."""
+
+    def __init__(self) -> None:
+        self.item_updates: List[Dict[str, Any]] = []
+        self.history_rows: List[Dict[str, Any]] = []
+        self.alerts: List[Tuple[str, AlertCreate]] = []
+
+    def clear(self) -> None:
+        self.item_updates.clear()
+        self.history_rows.clear()
+        self.alerts.clear()
+
 
 class WatchlistScheduler:
     """Scheduler for automatic watchlist checks."""
@@ -71,19 +91,53 @@ class WatchlistScheduler:
                 .all()
             )
 
+            # Item güncellemeleri ve check history satırları toplanıp HISTORY_BATCH_SIZE'lık
+            # batch'ler halinde tek transaction'da yazılır; alert'ler ancak kendi history
+            # satırları commit edildikten sonra oluşturulur
+            pending = _PendingChecks()
             for watchlist in watchlists:
+                watchlist_id = watchlist.id
                 try:
-                    self._check_watchlist(watchlist, db)
+                    self._check_watchlist(watchlist, db, pending)
                 except Exception as e:
-                    logger.error(f"Error checking watchlist {watchlist.id}: {e}")
+                    logger.error(f"Error checking watchlist {watchlist_id}: {e}")
+                    db.rollback()
+
+            self._flush_checks(db, pending)
 
         except Exception as e:
             logger.error(f"Error in watchlist scheduler: {e}")
         finally:
             db.close()
 
-    def _check_watchlist(self, watchlist: AssetWatchlist, db: Session) -> None:
-        """Check a single watchlist."""
+    def _flush_checks(self, db: Session, pending: _PendingChecks) -> None:
+        """Write collected item updates and check history rows, then create the alerts they triggered."""
+        item_updates, history_rows, alerts = pending.item_updates[:], pending.history_rows[:], pending.alerts[:]
+        pending.clear()
+
+        try:
+            if item_updates:
+                db.execute(update(AssetWatchlistItem), item_updates)
+            if history_rows:
+                db.execute(insert(AssetCheckHistory), history_rows)
+            db.commit()
+        except Exception as e:
+            logger.error(
+                f"Failed to write {len(history_rows)} check history rows, "
+                f"dropping {len(alerts)} alerts: {e}"
+            )
+            db.rollback()
+            return
+
+        for user_id, alert_data in alerts:
+            try:
+                AlertService(db).create_alert(user_id, alert_data)
+            except Exception as e:
+                logger.error(f"Failed to create watchlist alert for asset {alert_data.asset_id}: {e}")
+                db.rollback()
+
+    def _check_watchlist(self, watchlist: AssetWatchlist, db: Session, pending: _PendingChecks) -> None:
+        """Check a single watchlist, collecting its item updates, history rows and alerts in ``pending``."""
         # Skip watchlists with check_interval less than minimum configured interval
         # This prevents excessive API usage for frequently checked watchlists
         min_interval = settings.watchlist_scheduler_min_check_interval
@@ -121,18 +175,35 @@ class WatchlistScheduler:
                 if time_since_last_check >= interval_minutes:
                     should_check = True
 
-            if should_check:
-                try:
-                    self._check_watchlist_item(item, watchlist, db)
-                except Exception as e:
-                    logger.error(f"Error checking watchlist item {item.id}: {e}")
+            if not should_check:
+                continue
+
+            # Hata sonrası expire olmuş instance'a dokunmadan loglayabilmek için
+            item_id = item.id
+            try:
+                item_update, check_history, alert_data = self._check_watchlist_item(item, watchlist, db)
+            except Exception as e:
+                logger.error(f"Error checking watchlist item {item_id}: {e}")
+                # Yarım kalan transaction sonraki item'ları da düşürmesin; bu tick'in
+                # kendi yazacakları pending'de durduğu için rollback onları kaybettirmez
+                db.rollback()
+                continue
+
+            pending.item_updates.append(item_update)
+            pending.history_rows.append(check_history)
+            if alert_data is not None:
+                pending.alerts.append((watchlist.user_id, alert_data))
+            if len(pending.history_rows) >= HISTORY_BATCH_SIZE:
+                self._flush_checks(db, pending)
 
     def _check_watchlist_item(
         self, item: AssetWatchlistItem, watchlist: AssetWatchlist, db: Session
-    ) -> None:
-        """Check a single watchlist item."""
-        from app.models.watchlist import AssetCheckHistory, IOCStatus, RiskThreshold
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[AlertCreate]]:
+        """Check a single watchlist item.
 
+        Returns the item update, the check history row and the alert to raise (if any);
+        all of them are written by ``_flush_checks``.
+        """
         logger.info(f"Checking watchlist item: {item.ioc_type} - {item.ioc_value}")
 
         # Query IOC using IOC service
@@ -140,35 +211,38 @@ class WatchlistScheduler:
         # This respects user preferences and prevents API quota exhaustion
         ioc_service = IOCService(db)
         ioc_request = IOCQueryRequest(ioc_type=item.ioc_type, ioc_value=item.ioc_value)
+        # query_ioc kendi commit/rollback'ini yapar; bu item'ın yazacakları ona karışmaz
         ioc_response = ioc_service.query_ioc(watchlist.user_id, ioc_request, auto_mode_only=True)
 
-        # Update watchlist item
-        item.last_check_date = datetime.now(timezone.utc)
-        item.last_risk_score = ioc_response.overall_risk
-        item.last_status = self._convert_risk_to_status(ioc_response.overall_risk)
-        db.flush()
-
-        # Create check history
-        check_history = AssetCheckHistory(
-            id=str(uuid4()),
-            watchlist_item_id=item.id,
-            check_date=datetime.now(timezone.utc),
-            risk_score=ioc_response.overall_risk,
-            status=self._convert_risk_to_status(ioc_response.overall_risk),
-            threat_intelligence_data={
+        # Update watchlist item (bulk UPDATE _flush_checks içinde)
+        check_date = datetime.now(timezone.utc)
+        status = self._convert_risk_to_status(ioc_response.overall_risk)
+        item_update = {
+            "id": item.id,
+            "last_check_date": check_date,
+            "last_risk_score": ioc_response.overall_risk,
+            "last_status": status,
+        }
+
+        # Check history row (bulk insert _flush_checks içinde)
+        check_history = {
+            "id": str(uuid4()),
+            "watchlist_item_id": item.id,
+            "check_date": check_date,
+            "risk_score": ioc_response.overall_risk,
+            "status": status,
+            "threat_intelligence_data": {
                 "overall_risk": ioc_response.overall_risk,
                 "queried_sources": [r.dict() for r in ioc_response.queried_sources],
             },
-            sources_checked=[r.source for r in ioc_response.queried_sources],
-            alert_triggered=self._should_trigger_alert(item.risk_threshold, ioc_response.overall_risk),
-        )
-        db.add(check_history)
-        db.flush()
+            "sources_checked": [r.source for r in ioc_response.queried_sources],
+            "alert_triggered": self._should_trigger_alert(item.risk_threshold, ioc_response.overall_risk),
+        }
 
-        # Create alert if threshold is exceeded
-        if check_history.alert_triggered:
+        # Create alert if threshold is exceeded (history satırı yazıldıktan sonra oluşturulur)
+        alert_data: Optional[AlertCreate] = None
+        if check_history["alert_triggered"]:
             from app.models.alert import AlertSeverity, AlertType
-            from app.schemas.alert import AlertCreate
 
             # Determine severity based on risk level
             severity_map = {
@@ -180,7 +254,6 @@ class WatchlistScheduler:
             risk_level_for_alert = (ioc_response.overall_risk or "unknown").lower()
             alert_severity = severity_map.get(risk_level_for_alert, AlertSeverity.MEDIUM)
 
-            alert_service = AlertService(db)
             alert_data = AlertCreate(
                 alert_type=AlertType.WATCHLIST,
                 severity=alert_severity,
@@ -192,13 +265,12 @@ class WatchlistScheduler:
                     "ioc_type": item.ioc_type,
                     "ioc_value": item.ioc_value,
                     "risk_score": ioc_response.overall_risk,
-                    "status": item.last_status.value if item.last_status else None,
+                    "status": status.value if status else None,
                 },
             )
-            alert_service.create_alert(watchlist.user_id, alert_data)
 
-        db.commit()
         logger.info(f"Checked watchlist item {item.id}: {ioc_response.overall_risk}")
+        return item_update, check_history, alert_data
 
     def _convert_risk_to_status(self, risk_level: Optional[str]) -> Optional[IOCStatus]:
         """Convert risk level to IOC status."""
@@ -232,8 +304,93 @@ class WatchlistScheduler:
         return risk_level.lower() in trigger_levels
 
 
-# Global scheduler instance
+class MaintenanceScheduler:
+    """Scheduler for database housekeeping jobs.
+
+    Watchlist scheduler'dan bağımsızdır ve her zaman çalışır: partition'lar,
+    retention, CVE cache temizliği ve CVE sayaçları watchlist kontrolleri
+    kapalıyken de ilerlemek zorunda.
+    """
+
+    def __init__(self) -> None:
+        self.scheduler: Optional[BackgroundScheduler] = None
+        self.is_running = False
+
+    def start(self) -> None:
+        """Start the scheduler."""
+        if self.is_running:
+            logger.warning("Maintenance scheduler is already running")
+            return
+
+        self.scheduler = BackgroundScheduler()
+        self.scheduler.add_job(
+            self._prune_cve_cache,
+            trigger=IntervalTrigger(hours=6),
+            id="prune_cve_cache",
+            name="Delete expired CVE cache rows",
+            replace_existing=True,
+        )
+        if IS_POSTGRESQL:
+            self.scheduler.add_job(
+                self._maintain_check_history_partitions,
+                trigger=IntervalTrigger(hours=24),
+                id="maintain_check_history_partitions",
+                name="Create upcoming and drop expired check history partitions",
+                replace_existing=True,
+                next_run_time=datetime.now(timezone.utc),
+            )
+            self.scheduler.add_job(
+                self._refresh_cve_stats,
+                trigger=IntervalTrigger(minutes=15),
+                id="refresh_cve_stats",
+                name="Refresh CVE dashboard stat views",
+                replace_existing=True,
+            )
+        self.scheduler.start()
+        self.is_running = True
+        logger.info("Maintenance scheduler started")
+
+    def stop(self) -> None:
+        """Stop the scheduler."""
+        if self.scheduler and self.is_running:
+            self.scheduler.shutdown()
+            self.is_running = False
+            logger.info("Maintenance scheduler stopped")
+
+    def _maintain_check_history_partitions(self) -> None:
+        """Roll asset_check_history partitions forward and drop expired ones."""
+        try:
+            ensure_check_history_partitions()
+            drop_expired_check_history_partitions(settings.check_history_retention_days)
+        except Exception as e:
+            logger.error(f"Error maintaining check history partitions: {e}")
+
+    def _refresh_cve_stats(self) -> None:
+        """Recompute the pre-aggregated CVE counters the dashboard reads."""
+        try:
+            refresh_cve_stat_views()
+        except Exception as e:
+            logger.error(f"Error refreshing CVE stat views: {e}")
+
+    def _prune_cve_cache(self) -> None:
+        """Remove expired NVD cache rows so cve_cache only holds live entries."""
+        from app.services.cve_service import CVEService
+
+        db: Session = SessionLocal()
+        try:
+            removed = CVEService(db).prune_expired_cache()
+            if removed:
+                logger.info(f"Pruned {removed} expired CVE cache rows")
+        except Exception as e:
+            logger.error(f"Error pruning CVE cache: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+
+# Global scheduler instances
 _scheduler_instance: Optional[WatchlistScheduler] = None
+_maintenance_instance: Optional[MaintenanceScheduler] = None
 
 
 def get_scheduler() -> WatchlistScheduler:
@@ -257,3 +414,17 @@ def stop_scheduler() -> None:
         _scheduler_instance.stop()
 
 
+
+
+def start_maintenance_scheduler() -> None:
+    """Start the global maintenance scheduler."""
+    global _maintenance_instance
+    if _maintenance_instance is None:
+        _maintenance_instance = MaintenanceScheduler()
+    _maintenance_instance.start()
+
+
+def stop_maintenance_scheduler() -> None:
+    """Stop the global maintenance scheduler."""
+    if _maintenance_instance:
+        _maintenance_instance.stop()
@@ -86,15 +86,11 @@ class UserService:
         offset = (page - 1) * page_size
         users = query.order_by(User.created_at.desc()).offset(offset).limit(page_size).all()
 
-        # Calculate total pages
-        total_pages = (total + page_size - 1) // page_size
-
         return {
             "items": [self.to_response(user) for user in users],
             "total": total,
             "page": page,
             "page_size": page_size,
-            "total_pages": total_pages,
         }
 
     def create_user_admin(self, user_data: UserCreate) -> User:
@@ -234,13 +230,14 @@ class UserService:
         if user.profile_json and isinstance(user.profile_json, dict):
             full_name = user.profile_json.get("full_name")
 
-        return UserResponse(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            full_name=full_name,
-            role=user.role.value,
-            is_active=user.is_active,
-            language_preference=user.language_preference,
-        )
+        # DB satırı yazılırken doğrulandı; okuma yolunda yeniden validation yapma
+        return UserResponse.from_orm_trusted({
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "full_name": full_name,
+            "role": user.role.value,
+            "is_active": user.is_active,
+            "language_preference": user.language_preference,
+        })
 
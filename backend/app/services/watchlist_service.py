@@ -4,9 +4,10 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.models.watchlist import AssetWatchlist, AssetWatchlistItem, AssetCheckHistory as AssetCheckHistoryModel, IOCStatus, RiskThreshold
+from app.schemas.base import iso_timestamp
 from app.schemas.watchlist import Watchlist, WatchlistCreate, WatchlistListResponse, WatchlistAsset, AssetCheckHistoryListResponse, AssetCheckHistory
 from loguru import logger
 
@@ -230,12 +231,17 @@ class WatchlistService:
         from app.schemas.ioc import IOCQueryRequest
 
         # Get watchlist item
-        item = self.db.query(AssetWatchlistItem).filter(AssetWatchlistItem.id == item_id).first()
+        item = (
+            self.db.query(AssetWatchlistItem)
+            .options(joinedload(AssetWatchlistItem.watchlist))
+            .filter(AssetWatchlistItem.id == item_id)
+            .first()
+        )
         if not item:
             return None
 
-        # Check if user has access to the watchlist
-        watchlist = self.db.query(AssetWatchlist).filter(AssetWatchlist.id == item.watchlist_id).first()
+        # Check if user has access to the watchlist (parent item ile aynı sorguda geldi)
+        watchlist = item.watchlist
         if not watchlist:
             return None
         
@@ -511,11 +517,16 @@ class WatchlistService:
         For viewer: Returns history for items in watchlists shared with them.
         """
         # Verify item exists and user has access
-        item = self.db.query(AssetWatchlistItem).filter(AssetWatchlistItem.id == item_id).first()
+        item = (
+            self.db.query(AssetWatchlistItem)
+            .options(joinedload(AssetWatchlistItem.watchlist))
+            .filter(AssetWatchlistItem.id == item_id)
+            .first()
+        )
         if not item:
             return AssetCheckHistoryListResponse(items=[], total=0)
         
-        watchlist = self.db.query(AssetWatchlist).filter(AssetWatchlist.id == item.watchlist_id).first()
+        watchlist = item.watchlist
         if not watchlist:
             return AssetCheckHistoryListResponse(items=[], total=0)
         
@@ -563,7 +574,7 @@ class WatchlistService:
         items = [
             AssetCheckHistory(
                 id=history.id,
-                check_date=history.check_date,
+                check_date=iso_timestamp(history.check_date),
                 risk_score=history.risk_score,
                 status=history.status.value if history.status else None,
                 threat_intelligence_data=history.threat_intelligence_data,
@@ -585,31 +596,32 @@ class WatchlistService:
             .all()
         )
 
+        # DB satırları yazılırken doğrulandı; okuma yolunda yeniden validation yapma
         assets = [
-            WatchlistAsset(
-                id=UUID(item.id),
-                ioc_type=item.ioc_type,
-                ioc_value=item.ioc_value,
-                description=item.description,
-                risk_threshold=item.risk_threshold.value if item.risk_threshold else None,
-                is_active=item.is_active,
-                created_at=item.created_at,
-            )
+            WatchlistAsset.from_orm_trusted({
+                "id": UUID(item.id),
+                "ioc_type": item.ioc_type,
+                "ioc_value": item.ioc_value,
+                "description": item.description,
+                "risk_threshold": item.risk_threshold.value if item.risk_threshold else None,
+                "is_active": item.is_active,
+                "created_at": item.created_at,
+            })
             for item in items
         ]
 
-        return Watchlist(
-            id=UUID(watchlist.id),
-            name=watchlist.name,
-            description=watchlist.description,
-            check_interval=watchlist.check_interval,
-            notification_enabled=watchlist.notification_enabled,
-            is_active=watchlist.is_active,
-            created_at=watchlist.created_at,
-            updated_at=watchlist.updated_at,
-            assets=assets,
-            shared_with_user_ids=watchlist.shared_with_user_ids if watchlist.shared_with_user_ids else None,
-        )
+        return Watchlist.from_orm_trusted({
+            "id": UUID(watchlist.id),
+            "name": watchlist.name,
+            "description": watchlist.description,
+            "check_interval": watchlist.check_interval,
+            "notification_enabled": watchlist.notification_enabled,
+            "is_active": watchlist.is_active,
+            "created_at": watchlist.created_at,
+            "updated_at": watchlist.updated_at,
+            "assets": assets,
+            "shared_with_user_ids": watchlist.shared_with_user_ids if watchlist.shared_with_user_ids else None,
+        })
 
     def share_watchlist(self, watchlist_id: str, user_id: str, shared_user_ids: list[str]) -> Watchlist:
         """Share a watchlist with specified users (viewers).
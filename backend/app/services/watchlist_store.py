@@ -20,7 +20,7 @@ class WatchlistStore:
     def create_watchlist(self, payload: WatchlistCreate) -> Watchlist:
         now = datetime.utcnow()
         watchlist_id = uuid4()
-        assets = [self._prepare_asset(asset) for asset in payload.assets]
+        assets = [self._prepare_asset(asset, now) for asset in payload.assets]
         watchlist = Watchlist(
             id=watchlist_id,
             name=payload.name,
@@ -41,7 +41,7 @@ class WatchlistStore:
             return None
 
         now = datetime.utcnow()
-        assets = [self._prepare_asset(asset) for asset in payload.assets]
+        assets = [self._prepare_asset(asset, now) for asset in payload.assets]
         updated = Watchlist(
             id=existing.id,
             name=payload.name,
@@ -62,16 +62,11 @@ class WatchlistStore:
             return True
         return False
 
-    def _prepare_asset(self, asset: WatchlistAsset) -> WatchlistAsset:
-        return WatchlistAsset(
-            id=asset.id or uuid4(),
-            ioc_type=asset.ioc_type,
-            ioc_value=asset.ioc_value,
-            description=asset.description,
-            risk_threshold=asset.risk_threshold,
-            is_active=asset.is_active,
-            created_at=asset.created_at or datetime.utcnow(),
-        )
+    def _prepare_asset(self, asset: WatchlistAsset, now: datetime) -> WatchlistAsset:
+        # Payload zaten doğrulanmış ve id default_factory ile atanmış; yeniden validate etme
+        if asset.created_at is not None:
+            return asset
+        return asset.model_copy(update={"created_at": now})
 
 
 def get_watchlist_store() -> WatchlistStore:
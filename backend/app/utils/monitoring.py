@@ -73,6 +73,8 @@ class RequestTimer:
         self.endpoint = endpoint
         self.method = method
         self.start_time: Optional[float] = None
+        # Response status, set by the caller once known
+        self.status_code: Optional[int] = None
 
     def __enter__(self):
         self.start_time = time.time()
@@ -81,7 +83,7 @@ class RequestTimer:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.start_time:
             response_time = time.time() - self.start_time
-            status_code = 500 if exc_type else 200
+            status_code = 500 if exc_type else (self.status_code or 200)
             metrics_collector.record_request(self.endpoint, self.method, status_code, response_time)
         return False
 
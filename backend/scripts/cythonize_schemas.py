@@ -0,0 +1,61 @@
+"""Compile app/schemas modules to C extensions with Cython (optional build step).
+
+Usage (from backend/):
+    pip install cython
+    python scripts/cythonize_schemas.py
+
+The .py sources stay in place as the interpreted fallback; Python's import
+system prefers the compiled extension module when both exist.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# __init__ paket olarak kalsın
+EXCLUDE = {"__init__.py"}
+
+
+def cythonize_schemas() -> None:
+    """Build the schema extension modules in place."""
+    try:
+        from Cython.Build import cythonize
+        from setuptools import Extension, setup
+    except ImportError:
+        print("Cython/setuptools not installed; skipping schema compilation.")
+        return
+
+    sources = sorted(
+        path.relative_to(BACKEND_DIR).as_posix()
+        for path in (BACKEND_DIR / "app" / "schemas").glob("*.py")
+        if path.name not in EXCLUDE
+    )
+    extensions = [
+        Extension(source[:-3].replace("/", "."), [source])
+        for source in sources
+    ]
+
+    setup(
+        name="threat-intel-schemas",
+        script_args=["build_ext", "--inplace"],
+        ext_modules=cythonize(
+            extensions,
+            language_level=3,
+            compiler_directives={
+                # Pydantic annotation'ları runtime'da okuyor: C tipine çevrilmemeli
+                "annotation_typing": False,
+                "binding": True,
+                "boundscheck": False,
+                "wraparound": False,
+            },
+        ),
+    )
+    print(f"Compiled {len(extensions)} schema modules.")
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.chdir(BACKEND_DIR)
+    cythonize_schemas()
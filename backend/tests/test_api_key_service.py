@@ -0,0 +1,66 @@
+"""Unit tests for API Key service."""
+
+from uuid import uuid4
+
+import pytest
+
+from app.models.api_source import APISource, AuthenticationType, TestStatus
+from app.models.user import User, UserRole
+from app.schemas.api_key import APIKeyCreate, APIKeyUpdate
+from app.services.api_key_service import APIKeyService
+
+
+@pytest.fixture
+def seeded(db_session):
+    """A user and an API source stored in the test database."""
+    user = User(
+        id=str(uuid4()),
+        username="analyst",
+        email="analyst@example.com",
+        password_hash="x",
+        role=UserRole.ANALYST,
+    )
+    api_source = APISource(
+        id=str(uuid4()),
+        name="virustotal",
+        display_name="VirusTotal",
+        base_url="https://www.virustotal.com/api/v3",
+        authentication_type=AuthenticationType.API_KEY,
+    )
+    db_session.add_all([user, api_source])
+    db_session.commit()
+    return user, api_source
+
+
+def test_api_key_create_get_update_list(db_session, seeded):
+    """Keys returned by create/get/update/list come with api_source loaded."""
+    user, api_source = seeded
+    service = APIKeyService(db_session)
+
+    created = service.create_api_key(
+        user.id, APIKeyCreate(api_source_id=api_source.id, api_key="secret", username="bob")
+    )
+    response = service.to_response(created)
+    assert response["api_source_name"] == "VirusTotal"
+    assert response["username"] == "bob"
+    assert response["test_status"] == TestStatus.NOT_TESTED
+
+    fetched = service.get_api_key(created.id, user.id)
+    assert service.to_response(fetched)["api_source_name"] == "VirusTotal"
+
+    updated = service.update_api_key(created.id, user.id, APIKeyUpdate(is_active=False))
+    response = service.to_response(updated)
+    assert response["is_active"] is False
+    assert response["api_source_name"] == "VirusTotal"
+
+    listed = service.to_responses(service.list_api_keys(user.id))
+    assert [item["id"] for item in listed] == [created.id]
+    assert listed[0]["api_source_name"] == "VirusTotal"
+    assert service.get_decrypted_key(created.id) is None  # inactive
+
+
+def test_api_key_create_requires_key(db_session, seeded):
+    """Sources with authentication reject an empty key."""
+    user, api_source = seeded
+    with pytest.raises(ValueError):
+        APIKeyService(db_session).create_api_key(user.id, APIKeyCreate(api_source_id=api_source.id))
@@ -0,0 +1,46 @@
+"""Unit tests for in-process caches."""
+
+import threading
+
+from app.services.cache import CountCache
+
+
+def test_count_cache_expires_and_invalidates_per_user():
+    """Entries expire after the TTL and invalidate_user only drops that user's keys."""
+    cache = CountCache(ttl_seconds=30)
+    cache.set(("user-1", None), 3)
+    cache.set(("user-1", True), 1)
+    cache.set(("user-2", None), 7)
+
+    cache.invalidate_user("user-1")
+    assert cache.get(("user-1", None)) is None
+    assert cache.get(("user-1", True)) is None
+    assert cache.get(("user-2", None)) == 7
+
+    expired = CountCache(ttl_seconds=0)
+    expired.set(("user-1", None), 3)
+    assert expired.get(("user-1", None)) is None
+
+
+def test_count_cache_is_bounded_and_thread_safe():
+    """Concurrent writers and invalidations neither raise nor grow the cache past maxsize."""
+    cache = CountCache(maxsize=100)
+    errors = []
+
+    def writer(user: str) -> None:
+        try:
+            for index in range(2_000):
+                cache.set((user, index), index)
+                if index % 50 == 0:
+                    cache.invalidate_user(user)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(f"user-{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(cache._store) <= 100
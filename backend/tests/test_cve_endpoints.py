@@ -1,10 +1,21 @@
 """Integration tests for CVE API endpoints."""
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch
 from datetime import datetime, timezone
 
+import orjson
+
 from app.schemas.cve import CVE, CVSSv3
+from app.services.cve_service import clear_local_cve_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """Each test controls the cache tiers through mocks; start without local entries."""
+    clear_local_cve_cache()
+    yield
+    clear_local_cve_cache()
 
 
 @pytest.fixture
@@ -27,17 +38,15 @@ def mock_cve_data():
     )
 
 
-@patch('app.services.cve_service.requests')
+@patch('app.services.cve_service.CVEService._nvd_get', new_callable=AsyncMock)
 @patch('app.services.cve_service.redis_cache')
-def test_search_cves_endpoint(mock_redis_cache, mock_requests, client, mock_cve_data):
+def test_search_cves_endpoint(mock_redis_cache, mock_nvd_get, client, mock_cve_data):
     """Test CVE search endpoint."""
     # Mock Redis cache miss
-    mock_redis_cache.get.return_value = None
+    mock_redis_cache.get_bytes.return_value = None
     
     # Mock API response
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
+    nvd_body = orjson.dumps({
         "vulnerabilities": [{
             "cve": {
                 "id": "CVE-2024-1234",
@@ -57,10 +66,9 @@ def test_search_cves_endpoint(mock_redis_cache, mock_requests, client, mock_cve_
             }
         }],
         "totalResults": 1
-    }
-    mock_response.raise_for_status = MagicMock()
-    mock_requests.get.return_value = mock_response
-    mock_redis_cache.set.return_value = True
+    })
+    mock_nvd_get.return_value = nvd_body
+    mock_redis_cache.set_bytes.return_value = True
     
     response = client.post(
         "/api/v1/cves/search",
@@ -97,7 +105,7 @@ def test_get_cve_endpoint_cached(client, mock_redis_cache, mock_cve_data):
         "references": [],
         "nvd_url": "https://nvd.nist.gov/vuln/detail/CVE-2024-1234",
     }
-    mock_redis_cache.get.return_value = cached_data
+    mock_redis_cache.get_bytes.return_value = orjson.dumps(cached_data)
     
     response = client.get("/api/v1/cves/CVE-2024-1234")
     
@@ -107,22 +115,36 @@ def test_get_cve_endpoint_cached(client, mock_redis_cache, mock_cve_data):
     assert data["cve"]["cve_id"] == "CVE-2024-1234"
 
 
-@patch('app.services.cve_service.requests')
+@patch('app.services.cve_service.CVEService._nvd_get', new_callable=AsyncMock)
 @patch('app.services.cve_service.redis_cache')
-def test_get_cve_endpoint_not_found(mock_redis_cache, mock_requests, client):
+def test_get_cve_endpoint_not_found(mock_redis_cache, mock_nvd_get, client):
     """Test getting non-existent CVE."""
     # Mock Redis cache miss
-    mock_redis_cache.get.return_value = None
+    mock_redis_cache.get_bytes.return_value = None
     
+    mock_redis_cache.exists.return_value = False
+
     # Mock API response - no vulnerabilities
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"vulnerabilities": []}
-    mock_response.raise_for_status = MagicMock()
-    mock_requests.get.return_value = mock_response
+    nvd_body = orjson.dumps({"vulnerabilities": []})
+    mock_nvd_get.return_value = nvd_body
     
     response = client.get("/api/v1/cves/CVE-9999-9999")
     
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
 
+
+
+@patch('app.services.cve_service.redis_cache')
+def test_get_cve_endpoint_not_modified(mock_redis_cache, client, mock_cve_data):
+    """Test conditional CVE request returns 304 when ETag matches."""
+    mock_redis_cache.get_bytes.return_value = mock_cve_data.model_dump_json().encode()
+
+    response = client.get("/api/v1/cves/CVE-2024-1234")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "public, max-age=3600"
+
+    response = client.get("/api/v1/cves/CVE-2024-1234", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
@@ -1,11 +1,26 @@
 """Unit tests for CVE service."""
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
+import asyncio
 from datetime import datetime, timezone
+import time
 
-from app.services.cve_service import CVEService
+import msgspec
+import orjson
+
+from app.services import cve_service as cve_service_module
+from app.services.cve_service import CVEService, clear_local_cve_cache
 from app.schemas.cve import CVESearchRequest, CVE, CVSSv3
+from app.schemas.nvd import NvdVulnerability
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """Worker-local CVE cache is module state; isolate tests from each other."""
+    clear_local_cve_cache()
+    yield
+    clear_local_cve_cache()
 
 
 @pytest.fixture
@@ -23,31 +38,28 @@ def cve_service(mock_db):
 def test_cve_service_init(cve_service):
     """Test CVE service initialization."""
     assert cve_service.db is not None
-    assert cve_service._last_request_time == 0.0
 
 
 def test_rate_limit(cve_service):
     """Test rate limiting mechanism."""
     import time
-    
-    start_time = time.time()
-    cve_service._rate_limit()
-    end_time = time.time()
-    
-    # First call should not delay
-    assert (end_time - start_time) < 0.1
-    
-    # Second call should respect rate limit
-    start_time = time.time()
-    cve_service._rate_limit()
-    end_time = time.time()
-    # Should have minimal delay (less than rate limit delay)
-    assert (end_time - start_time) < 0.7
+
+    async def two_calls():
+        await cve_service._rate_limit()
+
+        # Second call should respect rate limit
+        start_time = time.time()
+        await cve_service._rate_limit()
+        return start_time, time.time()
+
+    start_time, end_time = asyncio.run(two_calls())
+    # Should wait roughly RATE_LIMIT_DELAY, not more
+    assert 0.5 <= (end_time - start_time) < 0.7
 
 
 @patch('app.services.cve_service.redis_cache')
-@patch('app.services.cve_service.requests')
-def test_get_cve_from_redis_cache(mock_requests, mock_redis_cache, cve_service):
+@patch('app.services.cve_service.CVEService._nvd_get', new_callable=AsyncMock)
+def test_get_cve_from_redis_cache(mock_nvd_get, mock_redis_cache, cve_service):
     """Test getting CVE from Redis cache."""
     # Mock Redis cache hit
     cached_cve_data = {
@@ -63,31 +75,30 @@ def test_get_cve_from_redis_cache(mock_requests, mock_redis_cache, cve_service):
         "references": [],
         "nvd_url": "https://nvd.nist.gov/vuln/detail/CVE-2024-1234",
     }
-    mock_redis_cache.get.return_value = cached_cve_data
+    mock_redis_cache.get_bytes.return_value = orjson.dumps(cached_cve_data)
     
-    result = cve_service.get_cve("CVE-2024-1234")
+    result = asyncio.run(cve_service.get_cve("CVE-2024-1234"))
     
     assert result is not None
     assert result.cve_id == "CVE-2024-1234"
-    mock_redis_cache.get.assert_called_once_with("cve:CVE-2024-1234")
+    mock_redis_cache.get_bytes.assert_called_once_with("cve:CVE-2024-1234")
     # Should not make API call
-    mock_requests.get.assert_not_called()
+    mock_nvd_get.assert_not_called()
 
 
 @patch('app.services.cve_service.redis_cache')
-@patch('app.services.cve_service.requests')
-def test_get_cve_from_api(mock_requests, mock_redis_cache, cve_service):
+@patch('app.services.cve_service.CVEService._nvd_get', new_callable=AsyncMock)
+def test_get_cve_from_api(mock_nvd_get, mock_redis_cache, cve_service):
     """Test getting CVE from API when cache misses."""
     # Mock Redis cache miss
-    mock_redis_cache.get.return_value = None
+    mock_redis_cache.get_bytes.return_value = None
     
     # Mock database cache miss
     cve_service._check_cache = Mock(return_value=None)
+    mock_redis_cache.exists.return_value = False
     
     # Mock API response
-    mock_response = Mock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {
+    nvd_body = orjson.dumps({
         "vulnerabilities": [{
             "cve": {
                 "id": "CVE-2024-1234",
@@ -106,25 +117,71 @@ def test_get_cve_from_api(mock_requests, mock_redis_cache, cve_service):
                 "references": []
             }
         }]
-    }
-    mock_response.raise_for_status = Mock()
-    mock_requests.get.return_value = mock_response
+    })
+    mock_nvd_get.return_value = nvd_body
     
     # Mock save to cache
     cve_service._save_to_cache = Mock()
-    mock_redis_cache.set.return_value = True
+    mock_redis_cache.set_bytes.return_value = True
     
-    result = cve_service.get_cve("CVE-2024-1234")
+    result = asyncio.run(cve_service.get_cve("CVE-2024-1234"))
     
     assert result is not None
     assert result.cve_id == "CVE-2024-1234"
-    mock_requests.get.assert_called_once()
+    mock_nvd_get.assert_awaited_once()
     cve_service._save_to_cache.assert_called_once()
 
 
 @patch('app.services.cve_service.redis_cache')
-@patch('app.services.cve_service.requests')
-def test_search_cves_from_redis_cache(mock_requests, mock_redis_cache, cve_service):
+@patch('app.services.cve_service.CVEService._nvd_get', new_callable=AsyncMock)
+def test_get_cve_concurrent_requests_share_one_nvd_call(mock_nvd_get, mock_redis_cache, cve_service):
+    """Concurrent lookups of the same CVE are coalesced into a single NVD request."""
+    mock_redis_cache.get_bytes.return_value = None
+    mock_redis_cache.exists.return_value = False
+    cve_service._check_cache = Mock(return_value=None)
+    cve_service._save_to_cache = Mock()
+
+    nvd_body = orjson.dumps({"vulnerabilities": [{"cve": {"id": "CVE-2024-1234"}}]})
+
+    async def slow_get(params):
+        await asyncio.sleep(0.05)
+        return nvd_body
+
+    mock_nvd_get.side_effect = slow_get
+
+    async def lookups():
+        return await asyncio.gather(*(cve_service.get_cve("CVE-2024-1234") for _ in range(5)))
+
+    results = asyncio.run(lookups())
+
+    assert all(result.cve_id == "CVE-2024-1234" for result in results)
+    mock_nvd_get.assert_awaited_once()
+
+
+@patch('app.services.cve_service.redis_cache')
+def test_get_cve_blocking_cache_reads_do_not_serialize_requests(mock_redis_cache, mock_db):
+    """Blocking Redis reads run in the threadpool, so concurrent lookups overlap."""
+    def slow_get_bytes(key):
+        time.sleep(0.2)
+        return CVE(cve_id=key.split(":", 1)[1], affected_products=[], references=[]).model_dump_json().encode()
+
+    mock_redis_cache.get_bytes.side_effect = slow_get_bytes
+
+    async def lookups():
+        return await asyncio.gather(*(CVEService(mock_db).get_cve(f"CVE-2024-{index:04d}") for index in range(5)))
+
+    start = time.monotonic()
+    results = asyncio.run(lookups())
+    elapsed = time.monotonic() - start
+
+    assert [result.cve_id for result in results] == [f"CVE-2024-{index:04d}" for index in range(5)]
+    # Event loop üzerinde sırayla çalışsalardı ~1 saniye sürerdi
+    assert elapsed < 0.6
+
+
+@patch('app.services.cve_service.redis_cache')
+@patch('app.services.cve_service.CVEService._nvd_get', new_callable=AsyncMock)
+def test_search_cves_from_redis_cache(mock_nvd_get, mock_redis_cache, cve_service):
     """Test searching CVEs from Redis cache."""
     # Mock Redis cache hit
     cached_search_data = {
@@ -140,15 +197,17 @@ def test_search_cves_from_redis_cache(mock_requests, mock_redis_cache, cve_servi
             "references": [],
         }]
     }
-    mock_redis_cache.get.return_value = cached_search_data
+    mock_redis_cache.get_bytes.return_value = orjson.dumps(
+        {"soft_expires_at": time.time() + 900, "data": cached_search_data}
+    )
     
     request = CVESearchRequest(keyword="test", limit=20, offset=0)
-    result = cve_service.search_cves(request)
+    result = asyncio.run(cve_service.search_cves(request))
     
     assert result.total == 1
     assert len(result.cves) == 1
     # Should not make API call
-    mock_requests.get.assert_not_called()
+    mock_nvd_get.assert_not_called()
 
 
 def test_parse_nvd_response(cve_service):
@@ -176,7 +235,7 @@ def test_parse_nvd_response(cve_service):
         }
     }
     
-    cve = cve_service._parse_nvd_response(nvd_data)
+    cve = cve_service._parse_nvd_response(msgspec.convert(nvd_data, NvdVulnerability))
     
     assert cve.cve_id == "CVE-2024-1234"
     assert cve.description == "Test CVE description"
@@ -193,3 +252,63 @@ def test_parse_nvd_response(cve_service):
 
 
 
+
+
+@patch('app.services.cve_service.redis_cache')
+@patch('app.services.cve_service.CVEService._nvd_get', new_callable=AsyncMock)
+def test_get_cves_bulk(mock_nvd_get, mock_redis_cache, cve_service, mock_db):
+    """Bulk lookup serves Redis hits directly and fetches only the rest from NVD."""
+    cached = CVE(cve_id="CVE-2024-0001", affected_products=[], references=[])
+    mock_redis_cache.get_many_bytes.return_value = [cached.model_dump_json().encode(), None]
+    mock_redis_cache.exists.return_value = False
+    mock_db.execute.return_value.all.return_value = []
+    cve_service._save_to_cache = Mock()
+
+    nvd_body = orjson.dumps({"vulnerabilities": [{"cve": {"id": "CVE-2024-0002"}}]})
+    mock_nvd_get.return_value = nvd_body
+
+    results = asyncio.run(cve_service.get_cves_bulk(["cve-2024-0001", "CVE-2024-0002", "CVE-2024-0001"]))
+
+    assert set(results) == {"CVE-2024-0001", "CVE-2024-0002"}
+    assert results["CVE-2024-0001"].cve_id == "CVE-2024-0001"
+    assert results["CVE-2024-0002"].cve_id == "CVE-2024-0002"
+    mock_redis_cache.get_many_bytes.assert_called_once_with(["cve:CVE-2024-0001", "cve:CVE-2024-0002"])
+    mock_nvd_get.assert_awaited_once()
+
+
+def test_save_to_cache_upserts_existing_row(db_session):
+    """Saving a CVE twice updates the cached row in place instead of inserting a duplicate."""
+    from app.models.cve import CVECache
+
+    service = CVEService(db_session)
+    service._save_to_cache(CVE(cve_id="CVE-2024-1234", description="first"))
+    service._save_to_cache(CVE(cve_id="cve-2024-1234", description="second"))
+
+    rows = db_session.query(CVECache).filter(CVECache.cve_id == "CVE-2024-1234").all()
+    assert len(rows) == 1
+    assert rows[0].description == "second"
+
+
+def test_parse_nvd_response_caps_affected_products(cve_service, monkeypatch):
+    """Unique CPE products beyond the configured cap are dropped and flagged."""
+    monkeypatch.setattr(cve_service_module.settings, "cve_max_affected_products", 2)
+    nvd_data = {
+        "cve": {
+            "id": "CVE-2024-1234",
+            "configurations": [{
+                "nodes": [{
+                    "cpeMatch": [
+                        {"criteria": "cpe:2.3:a:vendor:product:1.0:*:*:*:*:*:*:*"},
+                        {"criteria": "cpe:2.3:a:vendor:product:1.0:*:*:*:*:*:*:*"},
+                        {"criteria": "cpe:2.3:a:vendor:product:2.0:*:*:*:*:*:*:*"},
+                        {"criteria": "cpe:2.3:a:vendor:product:3.0:*:*:*:*:*:*:*"},
+                    ]
+                }]
+            }],
+        }
+    }
+
+    cve = cve_service._parse_nvd_response(msgspec.convert(nvd_data, NvdVulnerability))
+
+    assert [p.version for p in cve.affected_products] == ["1.0", "2.0"]
+    assert cve.truncated_products is True
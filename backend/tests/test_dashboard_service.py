@@ -0,0 +1,141 @@
+"""Unit tests for Dashboard service caching."""
+
+import warnings
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+from sqlalchemy.exc import SAWarning
+
+from app.models.cve import CVECache
+from app.models.watchlist import AssetWatchlist, AssetWatchlistItem
+from app.schemas.dashboard import (
+    APIDistributionSeries,
+    DashboardResponse,
+    DashboardStats,
+    IOCTypeDistributionSeries,
+    RiskDistribution,
+    TrendSeries,
+    WatchlistSummary,
+)
+from app.core.config import get_settings
+from app.services import dashboard_service as dashboard_service_module
+from app.services.dashboard_service import DashboardService
+
+
+def _empty_dashboard() -> DashboardResponse:
+    return DashboardResponse(
+        stats=DashboardStats(),
+        risk_distribution=RiskDistribution(),
+        api_distribution=APIDistributionSeries(),
+        ioc_type_distribution=IOCTypeDistributionSeries(),
+        query_trend=TrendSeries(),
+        recent_activities=[],
+        watchlist_summary=WatchlistSummary(),
+        api_status=[],
+        generated_at=datetime.now(timezone.utc),
+    )
+
+
+def test_get_dashboard_served_from_cache():
+    """A cached dashboard is returned without touching the database."""
+    cached = _empty_dashboard()
+    service = DashboardService(Mock())
+
+    with patch("app.services.dashboard_service.redis_cache") as mock_cache:
+        mock_cache.get_bytes.return_value = cached.model_dump_json().encode()
+        with patch.object(service, "_build_dashboard") as mock_build:
+            result = service.get_dashboard("user-1", is_admin=False)
+
+    assert result == cached
+    mock_build.assert_not_called()
+    mock_cache.get_bytes.assert_called_once_with("dash:user-1:False")
+
+
+def test_get_dashboard_refresh_bypasses_cache():
+    """refresh=True recomputes the dashboard and overwrites the cached copy."""
+    fresh = _empty_dashboard()
+    service = DashboardService(Mock())
+
+    with patch("app.services.dashboard_service.redis_cache") as mock_cache:
+        with patch.object(service, "_build_dashboard", return_value=(fresh, True)):
+            result = service.get_dashboard("user-1", is_admin=True, refresh=True)
+
+    assert result is fresh
+    mock_cache.get_bytes.assert_not_called()
+    mock_cache.set_bytes.assert_called_once()
+    assert mock_cache.set_bytes.call_args.args[0] == "dash:user-1:True"
+
+
+def test_get_dashboard_with_failed_section_not_cached(db_session):
+    """A dashboard with a section that fell back to its default after an error is not cached."""
+    service = DashboardService(db_session)
+
+    with patch("app.services.dashboard_service.redis_cache") as mock_cache, patch.object(
+        DashboardService, "_get_stats", side_effect=RuntimeError("pool exhausted")
+    ):
+        mock_cache.get_bytes.return_value = None
+        result = service.get_dashboard("user-1", is_admin=True)
+
+    assert result.stats == DashboardStats()
+    mock_cache.set_bytes.assert_not_called()
+
+    with patch("app.services.dashboard_service.redis_cache") as mock_cache:
+        mock_cache.get_bytes.return_value = None
+        service.get_dashboard("user-1", is_admin=True)
+
+    mock_cache.set_bytes.assert_called_once()
+
+
+def test_watchlist_item_write_invalidates_owner_dashboard(db_session):
+    """Committing a watchlist item change drops the watchlist owner's cached dashboards."""
+    user_id = str(uuid4())
+    watchlist = AssetWatchlist(id=str(uuid4()), user_id=user_id, name="Test Watchlist")
+    db_session.add(watchlist)
+    db_session.commit()
+
+    with patch("app.services.dashboard_service.invalidate_dashboard_cache") as mock_invalidate:
+        db_session.add(
+            AssetWatchlistItem(
+                id=str(uuid4()), watchlist_id=watchlist.id, ioc_type="ip", ioc_value="1.2.3.4"
+            )
+        )
+        db_session.flush()
+        mock_invalidate.assert_not_called()
+        db_session.commit()
+
+    mock_invalidate.assert_called_once_with(user_id)
+
+
+def test_cvss_distribution_single_grouped_aggregate(db_session):
+    """CVSS ranges come from one grouped query, preferring v3 over v2 scores."""
+    scores = [(9.8, None), (None, 5.0), (2.0, 9.0), (7.5, None), (None, None)]
+    for index, (v3, v2) in enumerate(scores):
+        db_session.add(CVECache(id=str(uuid4()), cve_id=f"CVE-2024-{index:04d}", cvss_v3_score=v3, cvss_v2_score=v2))
+    db_session.commit()
+
+    with patch.object(db_session, "execute", wraps=db_session.execute) as mock_execute:
+        result = DashboardService(db_session)._get_cvss_distribution()
+
+    assert mock_execute.call_count == 1
+    assert result.ranges == ["0.0-2.0", "2.1-4.0", "4.1-6.0", "6.1-8.0", "8.1-10.0"]
+    assert result.counts == [1, 0, 1, 1, 1]
+
+
+def test_stats_single_statement_without_cartesian_warning(db_session):
+    """Counters come from one statement that joins its subqueries explicitly."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", SAWarning)
+        stats = DashboardService(db_session)._get_stats(str(uuid4()), is_admin=False)
+
+    assert stats.total_queries == 0
+    assert stats.total_reports == 0
+
+
+def test_section_fan_out_fits_in_connection_pool():
+    """Parallel dashboard sections share one bounded executor that leaves pool room for requests."""
+    settings = get_settings()
+    executor = dashboard_service_module._section_executor
+
+    assert executor._max_workers == settings.dashboard_section_workers
+    assert settings.dashboard_section_workers < settings.database_pool_size + settings.database_max_overflow
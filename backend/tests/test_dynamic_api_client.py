@@ -0,0 +1,130 @@
+"""Unit tests for the dynamic threat intelligence API client."""
+
+from unittest.mock import Mock
+
+import orjson
+import requests
+from jsonpath_ng import parse
+
+from app.models.api_source import APISource, AuthenticationType
+from app.schemas.api_source import RequestConfig
+from app.services.dynamic_api_client import DynamicAPIClient, _compile_extractor
+
+
+def _api_source(**overrides) -> APISource:
+    api_source = Mock(spec=APISource)
+    api_source.name = "test_source"
+    api_source.base_url = "https://api.example.com"
+    api_source.authentication_type = AuthenticationType.BEARER_TOKEN
+    api_source.request_config = {"endpoint_template": "/{ioc_type}/{ioc_value}"}
+    api_source.response_config = {"risk_score_path": "$.data.score"}
+    for key, value in overrides.items():
+        setattr(api_source, key, value)
+    return api_source
+
+
+def test_query_parses_response():
+    """query() sends the templated request through the shared session and parses the JSON body."""
+    session = Mock()
+    session.request.return_value = Mock(status_code=200, content=b'{"data": {"score": 87}}')
+    client = DynamicAPIClient(_api_source(), "secret", session=session)
+
+    result = client.query("ip", "1.2.3.4")
+
+    assert result["status"] == "success"
+    assert result["risk_score"] == 87
+    assert result["http_status"] == 200
+    kwargs = session.request.call_args.kwargs
+    assert kwargs["method"] == "GET"
+    assert kwargs["url"] == "https://api.example.com/ip/1.2.3.4"
+    assert kwargs["headers"]["Authorization"] == "Bearer secret"
+
+
+def test_query_reports_http_errors():
+    """HTTP error statuses become an error result instead of raising."""
+    session = Mock()
+    session.request.return_value.raise_for_status.side_effect = requests.HTTPError("503 Server Error")
+    client = DynamicAPIClient(_api_source(), "secret", session=session)
+
+    result = client.query("ip", "1.2.3.4")
+
+    assert result["status"] == "error"
+    assert result["source"] == "test_source"
+
+
+def test_templates_bind_credentials_once():
+    """Credential placeholders are filled at construction; only IOC placeholders vary per query."""
+    api_source = _api_source(
+        request_config={
+            "method": "POST",
+            "headers": {"X-Key": "{api_key}"},
+            "query_params": {"key": "{api_key}", "q": "{ioc_type}:{ioc_value}"},
+            "body_template": {"apikey": "{api_key}", "indicator": "{ioc_value}", "limit": 10},
+        }
+    )
+    client = DynamicAPIClient(api_source, "secret", session=Mock())
+
+    assert client._build_headers() == {"X-Key": "secret", "Authorization": "Bearer secret"}
+    assert client._build_params("ip", "1.2.3.4") == {"key": "secret", "q": "ip:1.2.3.4"}
+    assert client._build_params("domain", "example.com")["q"] == "domain:example.com"
+    assert orjson.loads(client._build_body("ip", "1.2.3.4")) == {"apikey": "secret", "limit": 10, "indicator": "1.2.3.4"}
+
+
+def test_static_string_body_sent_without_reserializing():
+    """A body template without IOC placeholders is encoded once and sent as JSON bytes."""
+    api_source = _api_source(request_config={"method": "POST", "body_template": '{"key": "{api_key}", "all": true}'})
+    client = DynamicAPIClient(api_source, "secret", session=Mock())
+
+    method, request_kwargs = client._prepare_request("ip", "1.2.3.4")
+
+    assert method == "POST"
+    assert request_kwargs["data"] == b'{"key": "secret", "all": true}'
+    assert request_kwargs["headers"]["Content-Type"] == "application/json"
+    assert client._build_body("ip", "5.6.7.8") is request_kwargs["data"]
+
+
+def test_response_paths_dotted_and_jsonpath():
+    """Dotted paths use direct lookups; other expressions still go through jsonpath_ng."""
+    api_source = _api_source(
+        response_config={"risk_score_path": "$.data.attributes.score", "status_path": "$.results[0].verdict"}
+    )
+    client = DynamicAPIClient(api_source, "secret", session=Mock())
+
+    parsed = client._parse_response({"data": {"attributes": {"score": 42}}, "results": [{"verdict": "malicious"}]})
+    assert parsed["risk_score"] == 42
+    assert parsed["status"] == "malicious"
+
+    parsed = client._parse_response({"data": ["not", "a", "dict"]})
+    assert parsed["risk_score"] is None
+    assert parsed["status"] is None
+
+
+def test_seeded_paths_without_dollar_use_dotted_lookup():
+    """Seed-style paths without a leading "$." take the direct lookup path and match jsonpath_ng."""
+    path = "data.abuseConfidencePercentage"
+    assert _compile_extractor(path).__qualname__.startswith("_dotted_getter")
+
+    api_source = _api_source(
+        response_config={"risk_score_path": path, "status_path": "query_status", "data_path": "data"}
+    )
+    client = DynamicAPIClient(api_source, "secret", session=Mock())
+    response = {"data": {"abuseConfidencePercentage": 75}, "query_status": "ok"}
+
+    parsed = client._parse_response(response)
+    assert parsed["risk_score"] == 75 == parse(path).find(response)[0].value
+    assert parsed["status"] == "ok"
+    assert parsed["data"] == {"abuseConfidencePercentage": 75}
+
+
+def test_non_string_params_accepted_and_sent():
+    """Numeric and boolean params/headers are valid config and pass through the client."""
+    config = RequestConfig.model_validate(
+        {"query_params": {"limit": 100, "verbose": True, "q": "{ioc_value}"}, "headers": {"X-Version": 2}}
+    )
+    api_source = _api_source(
+        authentication_type=AuthenticationType.API_KEY, request_config=config.model_dump(exclude_unset=True)
+    )
+    client = DynamicAPIClient(api_source, "secret", session=Mock())
+
+    assert client._build_params("ip", "1.2.3.4") == {"limit": 100, "verbose": True, "q": "1.2.3.4"}
+    assert client._build_headers() == {"X-Version": "2"}
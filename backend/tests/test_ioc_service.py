@@ -81,27 +81,18 @@ def test_calculate_overall_risk(ioc_service):
     assert ioc_service._calculate_overall_risk(results) is None
 
 
-@patch('app.services.ioc_service.redis_cache')
 @patch('app.services.ioc_service.ioc_cache')
-def test_query_ioc_from_redis_cache(mock_ioc_cache, mock_redis_cache, ioc_service):
-    """Test querying IOC from Redis cache."""
-    # Mock Redis cache hit
-    cached_response_data = {
-        "ioc_type": "ip",
-        "ioc_value": "1.2.3.4",
-        "overall_risk": "high",
-        "queried_sources": [
-            {
-                "source": "test",
-                "status": "success",
-                "risk_score": 0.9,
-                "description": "Test",
-                "raw": None
-            }
+def test_query_ioc_from_cache(mock_ioc_cache, ioc_service):
+    """Test querying IOC from cache."""
+    mock_ioc_cache.get.return_value = IOCQueryResponse(
+        ioc_type="ip",
+        ioc_value="1.2.3.4",
+        overall_risk="high",
+        queried_sources=[
+            IOCSourceResult(source="test", status="success", risk_score=0.9, description="Test", raw=None)
         ],
-        "queried_at": datetime.now(timezone.utc).isoformat(),
-    }
-    mock_redis_cache.get.return_value = cached_response_data
+        queried_at=datetime.now(timezone.utc),
+    )
     
     payload = IOCQueryRequest(ioc_type="ip", ioc_value="1.2.3.4")
     user_id = str(uuid4())
@@ -112,17 +103,41 @@ def test_query_ioc_from_redis_cache(mock_ioc_cache, mock_redis_cache, ioc_servic
     assert result.ioc_type == "ip"
     assert result.ioc_value == "1.2.3.4"
     assert result.overall_risk == "high"
-    mock_redis_cache.get.assert_called_once()
+    mock_ioc_cache.get.assert_called_once()
+
+
+def test_redis_ioc_cache_falls_back_to_redis():
+    """Test two-tier IOC cache reading through to Redis and filling the local tier."""
+    from app.services.cache import IOCResponseCache, RedisIOCResponseCache
+
+    response = IOCQueryResponse(
+        ioc_type="ip",
+        ioc_value="1.2.3.4",
+        overall_risk="low",
+        queried_sources=[],
+        queried_at=datetime.now(timezone.utc),
+    )
+    cache = RedisIOCResponseCache(IOCResponseCache())
+    cache.client = Mock()
+    cache.client.get.return_value = response.model_dump_json()
+    cache.client.mget.return_value = [response.model_dump_json(), None]
+
+    assert cache.get("IP", "1.2.3.4") == response
+    cache.client.get.assert_called_once_with("ioc:ip:1.2.3.4")
+    # İkinci okuma local tier'dan gelir
+    assert cache.local.get("ip", "1.2.3.4") == response
+
+    cache.local = IOCResponseCache()
+    found = cache.get_many([("ip", "1.2.3.4"), ("domain", "example.com")])
+    assert found == {("ip", "1.2.3.4"): response}
+    cache.client.mget.assert_called_once_with(["ioc:ip:1.2.3.4", "ioc:domain:example.com"])
 
 
-@patch('app.services.ioc_service.redis_cache')
 @patch('app.services.ioc_service.ioc_cache')
 @patch('app.services.ioc_service.DynamicAPIClient')
-def test_query_ioc_from_api(mock_dynamic_client, mock_ioc_cache, mock_redis_cache, ioc_service):
+def test_query_ioc_from_api(mock_dynamic_client, mock_ioc_cache, ioc_service):
     """Test querying IOC from API when cache misses."""
-    # Mock Redis cache miss
-    mock_redis_cache.get.return_value = None
-    # Mock in-memory cache miss
+    # Mock cache miss
     mock_ioc_cache.get.return_value = None
     
     # Mock API source and key
@@ -164,7 +179,7 @@ def test_query_ioc_from_api(mock_dynamic_client, mock_ioc_cache, mock_redis_cach
         assert result.ioc_value == "1.2.3.4"
         assert result.overall_risk is not None
         assert len(result.queried_sources) > 0
-        mock_redis_cache.set.assert_called_once()
+        mock_ioc_cache.set.assert_called_once()
 
 
 def test_list_query_history(ioc_service):
@@ -0,0 +1,86 @@
+"""Unit tests for asset_check_history partition maintenance."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from app.db import partitions
+from app.models.watchlist import AssetCheckHistory
+
+
+def _recording_engine(existing=(), stranded_months=()):
+    """Mock engine whose connection answers to_regclass/EXISTS probes from the given sets."""
+    engine = MagicMock()
+    conn = engine.begin.return_value.__enter__.return_value
+
+    def execute(statement, params=None):
+        sql = str(statement)
+        result = MagicMock()
+        if "to_regclass" in sql:
+            result.scalar.return_value = params["name"] in existing
+        elif sql.startswith("SELECT EXISTS"):
+            result.scalar.return_value = params["start"] in stranded_months
+        return result
+
+    conn.execute.side_effect = execute
+    return engine, conn
+
+
+def _executed_sql(conn) -> list[str]:
+    return [
+        str(call.args[0])
+        for call in conn.execute.call_args_list
+        if not str(call.args[0]).startswith("SELECT")
+    ]
+
+
+def test_ensure_partitions_targets_check_history_model():
+    """On PostgreSQL, monthly and default partitions are created for the model's table."""
+    table = AssetCheckHistory.__table__
+    assert partitions.CHECK_HISTORY_TABLE == table.name
+    assert "check_date" in table.columns
+
+    engine, conn = _recording_engine()
+    with patch.object(partitions, "IS_POSTGRESQL", True):
+        partitions.ensure_check_history_partitions(months_ahead=2, bind=engine)
+
+    statements = _executed_sql(conn)
+    assert len(statements) == 4
+    assert all(f"PARTITION OF {table.name}" in sql for sql in statements)
+    assert statements[-1].endswith("DEFAULT")
+
+    month = partitions._month_start(datetime.now(timezone.utc).date())
+    assert partitions.partition_name(month) in statements[0]
+
+
+def test_ensure_partitions_noop_on_sqlite():
+    """Without PostgreSQL nothing is executed."""
+    engine, conn = _recording_engine()
+    with patch.object(partitions, "IS_POSTGRESQL", False):
+        partitions.ensure_check_history_partitions(bind=engine)
+
+    engine.begin.assert_not_called()
+
+
+def test_ensure_partitions_moves_rows_out_of_default():
+    """A month whose rows already landed in the default partition is split out of it."""
+    month = partitions._month_start(datetime.now(timezone.utc).date())
+    engine, conn = _recording_engine(existing={partitions.DEFAULT_PARTITION}, stranded_months={month})
+    with patch.object(partitions, "IS_POSTGRESQL", True):
+        partitions.ensure_check_history_partitions(months_ahead=0, bind=engine)
+
+    statements = _executed_sql(conn)
+    assert statements[0].endswith(f"DETACH PARTITION {partitions.DEFAULT_PARTITION}")
+    assert statements[1].startswith(f"CREATE TABLE {partitions.partition_name(month)} PARTITION OF")
+    assert statements[2].startswith(f"INSERT INTO {partitions.CHECK_HISTORY_TABLE} SELECT")
+    assert statements[3].startswith(f"DELETE FROM {partitions.DEFAULT_PARTITION}")
+    assert statements[4].endswith(f"ATTACH PARTITION {partitions.DEFAULT_PARTITION} DEFAULT")
+
+
+def test_ensure_partitions_skips_existing_months():
+    """Existing monthly partitions are left untouched."""
+    month = partitions._month_start(datetime.now(timezone.utc).date())
+    engine, conn = _recording_engine(existing={partitions.partition_name(month)})
+    with patch.object(partitions, "IS_POSTGRESQL", True):
+        partitions.ensure_check_history_partitions(months_ahead=0, bind=engine)
+
+    assert len(_executed_sql(conn)) == 1  # yalnızca default partition
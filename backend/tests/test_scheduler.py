@@ -0,0 +1,117 @@
+"""Unit tests for the background schedulers."""
+
+from datetime import datetime, timezone
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from app.models.alert import Alert
+from app.models.user import User, UserRole
+from app.models.watchlist import AssetCheckHistory, AssetWatchlist, AssetWatchlistItem, RiskThreshold
+from app.schemas.ioc import IOCQueryResponse
+from app.services import scheduler as scheduler_module
+from app.services.scheduler import MaintenanceScheduler, WatchlistScheduler
+
+
+def _job_ids(maintenance: MaintenanceScheduler) -> set[str]:
+    return {job.id for job in maintenance.scheduler.get_jobs()}
+
+
+def test_maintenance_jobs_run_without_watchlist_scheduler():
+    """Maintenance jobs are scheduled even when watchlist checks are disabled."""
+    assert scheduler_module.settings.watchlist_scheduler_enabled is False
+
+    maintenance = MaintenanceScheduler()
+    with patch.object(scheduler_module, "IS_POSTGRESQL", True):
+        maintenance.start()
+    try:
+        assert maintenance.is_running
+        assert {"maintain_check_history_partitions", "refresh_cve_stats", "prune_cve_cache"} <= _job_ids(
+            maintenance
+        )
+    finally:
+        maintenance.stop()
+    assert not maintenance.is_running
+
+
+def test_maintenance_prunes_cve_cache_on_sqlite():
+    """Expired CVE cache rows are pruned on every backend, not only PostgreSQL."""
+    maintenance = MaintenanceScheduler()
+    with patch.object(scheduler_module, "IS_POSTGRESQL", False):
+        maintenance.start()
+    try:
+        assert _job_ids(maintenance) == {"prune_cve_cache"}
+    finally:
+        maintenance.stop()
+
+
+@pytest.fixture
+def watchlist_items(db_session):
+    """A watchlist with three IPs due for checking; alerts fire on high risk."""
+    user = User(id=str(uuid4()), username="owner", email="owner@example.com", password_hash="x", role=UserRole.ANALYST)
+    watchlist = AssetWatchlist(id=str(uuid4()), user_id=user.id, name="Edge", check_interval=60)
+    items = [
+        AssetWatchlistItem(
+            id=str(uuid4()),
+            watchlist_id=watchlist.id,
+            ioc_type="ip",
+            ioc_value=value,
+            risk_threshold=RiskThreshold.HIGH,
+        )
+        for value in ("1.1.1.1", "2.2.2.2", "3.3.3.3")
+    ]
+    db_session.add_all([user, watchlist, *items])
+    db_session.commit()
+    return [item.id for item in items]
+
+
+def _run_tick(db_session, query_ioc):
+    with patch.object(scheduler_module, "SessionLocal", lambda: db_session), patch.object(
+        scheduler_module.IOCService, "query_ioc", query_ioc
+    ):
+        WatchlistScheduler()._check_all_watchlists()
+
+
+def _high_risk(service, user_id, payload, auto_mode_only=False):
+    return IOCQueryResponse(
+        ioc_type=payload.ioc_type,
+        ioc_value=payload.ioc_value,
+        overall_risk="high",
+        queried_sources=[],
+        queried_at=datetime.now(timezone.utc),
+    )
+
+
+def test_failed_item_does_not_lose_the_rest_of_the_tick(db_session, watchlist_items):
+    """A DB error while checking one item is rolled back; other items keep history and alerts."""
+
+    def query_ioc(service, user_id, payload, auto_mode_only=False):
+        if payload.ioc_value == "2.2.2.2":
+            # Session'ı başarısız flush durumunda bırak
+            service.db.add(AssetCheckHistory(id=str(uuid4()), watchlist_item_id=None))
+            service.db.flush()
+        return _high_risk(service, user_id, payload, auto_mode_only)
+
+    _run_tick(db_session, query_ioc)
+
+    history = db_session.query(AssetCheckHistory).all()
+    assert sorted(row.watchlist_item_id for row in history) == sorted([watchlist_items[0], watchlist_items[2]])
+    assert all(row.alert_triggered for row in history)
+    assert db_session.query(Alert).count() == 2
+    checked = {item.id: item for item in db_session.query(AssetWatchlistItem).all()}
+    assert checked[watchlist_items[0]].last_check_date is not None
+    assert checked[watchlist_items[0]].last_risk_score == "high"
+    assert checked[watchlist_items[1]].last_check_date is None
+    assert checked[watchlist_items[2]].last_check_date is not None
+
+
+def test_alerts_not_created_when_history_write_fails(db_session, watchlist_items):
+    """Alerts are only committed after their check history rows are."""
+    with patch.object(scheduler_module, "insert", lambda table: text("INSERT INTO missing_table VALUES (1)")):
+        _run_tick(db_session, _high_risk)
+
+    assert db_session.query(Alert).count() == 0
+    assert db_session.query(AssetCheckHistory).count() == 0
+    assert all(item.last_check_date is None for item in db_session.query(AssetWatchlistItem).all())
@@ -1,6 +1,14 @@
 """Test utilities and helper functions."""
 
+from datetime import datetime, timedelta, timezone
+
+import msgspec
 import pytest
+from pydantic import BaseModel
+
+from app.schemas._fast import build_history_page
+from app.schemas.base import iso_timestamp
+from app.schemas.ioc import IOCQueryRequest
 from app.utils.ioc_detector import detect_ioc_type
 
 
@@ -42,6 +50,13 @@ def test_detect_ioc_type_email():
     assert detect_ioc_type("user.name@domain.co.uk") == "email"
 
 
+def test_detected_ioc_types_are_valid_query_types():
+    """Every type the detector returns (except unknown) is accepted by IOCQueryRequest."""
+    for value in ("8.8.8.8", "example.com", "https://example.com", "a" * 32, "test@example.com"):
+        request = IOCQueryRequest(ioc_type=detect_ioc_type(value), ioc_value=value)
+        assert request.ioc_type == detect_ioc_type(value)
+
+
 def test_detect_ioc_type_unknown():
     """Test IOC type detection for unknown types."""
     assert detect_ioc_type("random_string") == "unknown"
@@ -49,10 +64,33 @@ def test_detect_ioc_type_unknown():
     assert detect_ioc_type("") == "unknown"
 
 
-
-
-
-
-
-
-
+def test_iso_timestamp_matches_pydantic_datetime_serialization():
+    """Pre-formatted timestamps keep the wire format Pydantic used for datetime fields."""
+
+    class Stamp(BaseModel):
+        value: datetime
+
+    values = [
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=3))),
+        datetime(2024, 1, 2, 3, 4, 5),
+    ]
+    for value in values:
+        assert iso_timestamp(value) == Stamp(value=value).model_dump(mode="json")["value"]
+    assert iso_timestamp(None) is None
+
+
+def test_history_page_allows_missing_timestamps():
+    """History rows without timestamps encode as null instead of failing."""
+    page = build_history_page(
+        {
+            "items": [{"id": "1", "ioc_type": "ip", "ioc_value": "8.8.8.8", "query_date": None, "created_at": None}],
+            "total": 1,
+            "page": 1,
+            "page_size": 20,
+        }
+    )
+    item = msgspec.json.decode(msgspec.json.encode(page))["items"][0]
+    assert item["query_date"] is None
+    assert item["created_at"] is None
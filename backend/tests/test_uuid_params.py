@@ -0,0 +1,43 @@
+"""Tests for UUID id parameters on routes backed by native uuid columns."""
+
+from typing import Optional
+
+from fastapi import FastAPI, Query
+from fastapi.testclient import TestClient
+
+from app.middleware.error_handler import ErrorHandlerMiddleware
+from app.schemas.types import UUIDStr
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ErrorHandlerMiddleware)
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: UUIDStr, watchlist_id: Optional[UUIDStr] = Query(None)):
+        return {"item_id": item_id, "watchlist_id": watchlist_id}
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def test_malformed_uuid_rejected_before_reaching_the_database():
+    """A non-UUID path or query id is a validation error, not a server error."""
+    client = _client()
+
+    assert client.get("/items/not-a-uuid").status_code == 422
+    assert client.get(
+        "/items/00000000-0000-0000-0000-000000000001", params={"watchlist_id": "x"}
+    ).status_code == 422
+
+
+def test_uuid_params_are_canonicalized():
+    """Valid ids are passed on in the lower-case dashed form the database stores."""
+    response = _client().get(
+        "/items/A1B2C3D4E5F60718293A4B5C6D7E8F90", params={"watchlist_id": "00000000-0000-0000-0000-000000000001"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "item_id": "a1b2c3d4-e5f6-0718-293a-4b5c6d7e8f90",
+        "watchlist_id": "00000000-0000-0000-0000-000000000001",
+    }
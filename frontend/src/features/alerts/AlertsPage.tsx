@@ -37,6 +37,8 @@ const AlertsPage = () => {
         if (typeFilter) params.set("alert_type", typeFilter);
         params.set("page", String(page));
         params.set("page_size", String(pageSize));
+        // Numbered pagination below needs total/total_pages
+        params.set("include_total", "true");
         
         const response = await apiClient.get(`/alerts/?${params.toString()}`);
         return response.data;
@@ -385,7 +387,7 @@ const AlertsPage = () => {
       )}
 
       {/* Pagination */}
-      {data && data.total_pages > 1 && (
+      {data && (data.total_pages ?? 0) > 1 && (
         <div className="flex items-center justify-between">
           <p className="text-sm text-slate-400 dark:text-slate-400 light:text-slate-600">
             Page {page} of {data.total_pages} | Total: {data.total}
@@ -400,7 +402,7 @@ const AlertsPage = () => {
             </button>
             <button
               onClick={() => setPage((p) => p + 1)}
-              disabled={page >= data.total_pages}
+              disabled={!data.has_next}
               className="rounded-lg border border-slate-700 dark:border-slate-700 light:border-slate-300 bg-slate-900 dark:bg-slate-900 light:bg-white px-4 py-2 text-sm text-white dark:text-white light:text-slate-900 transition hover:bg-slate-800 dark:hover:bg-slate-800 light:hover:bg-slate-100 disabled:cursor-not-allowed disabled:opacity-50"
             >
               Next
@@ -28,10 +28,12 @@ export interface Alert {
 
 export interface AlertListResponse {
   items: Alert[];
-  total: number;
+  total: number | null;  // null unless include_total=true
   page: number;
   page_size: number;
-  total_pages: number;
+  total_pages: number | null;
+  has_next: boolean;
+  next_cursor?: string | null;
 }
 
 export interface AlertStatsResponse {
@@ -14,7 +14,8 @@ import APIDistributionChart from "@/components/charts/APIDistributionChart";
 import CVEDetailModal from "@/features/cve/CVEDetailModal";
 import DashboardEditModal from "./DashboardEditModal";
 import { getWidgetVisibility, isWidgetVisible } from "./widgetConfig";
-import type { DashboardResponse } from "@/features/dashboard/types";
+import { fromDashboardPayload } from "@/features/dashboard/types";
+import type { DashboardPayload, DashboardResponse } from "@/features/dashboard/types";
 
 const DashboardPage = () => {
   const navigate = useNavigate();
@@ -55,8 +56,8 @@ const DashboardPage = () => {
     queryKey: ["dashboard"],
     queryFn: async () => {
       try {
-        const response = await apiClient.get<DashboardResponse>("/dashboard/");
-        return response.data;
+        const response = await apiClient.get<DashboardPayload>("/dashboard/");
+        return fromDashboardPayload(response.data);
       } catch (err: any) {
         console.error("Dashboard error:", err);
         throw err;
@@ -89,3 +89,60 @@ export interface DashboardResponse {
   cvss_distribution?: CVSSDistribution[];
   generated_at: string;
 }
+
+// Wire format: chart series are sent as parallel arrays (one array per field)
+export interface APIDistributionSeries {
+  sources: string[];
+  counts: number[];
+  percentages: number[];
+}
+
+export interface IOCTypeDistributionSeries {
+  ioc_types: string[];
+  counts: number[];
+  percentages: number[];
+}
+
+export interface TrendSeries {
+  dates: string[];
+  counts: number[];
+}
+
+export interface CVSSDistributionSeries {
+  ranges: string[];
+  counts: number[];
+}
+
+export interface DashboardPayload
+  extends Omit<DashboardResponse, "api_distribution" | "ioc_type_distribution" | "query_trend" | "cve_trend" | "cvss_distribution"> {
+  api_distribution: APIDistributionSeries;
+  ioc_type_distribution: IOCTypeDistributionSeries;
+  query_trend: TrendSeries;
+  cve_trend?: TrendSeries | null;
+  cvss_distribution?: CVSSDistributionSeries | null;
+}
+
+const trendRows = (series: TrendSeries) =>
+  series.dates.map((date, i) => ({ date, count: series.counts[i] }));
+
+export const fromDashboardPayload = (payload: DashboardPayload): DashboardResponse => ({
+  ...payload,
+  api_distribution: payload.api_distribution.sources.map((source, i) => ({
+    source,
+    count: payload.api_distribution.counts[i],
+    percentage: payload.api_distribution.percentages[i],
+  })),
+  ioc_type_distribution: payload.ioc_type_distribution.ioc_types.map((ioc_type, i) => ({
+    ioc_type,
+    count: payload.ioc_type_distribution.counts[i],
+    percentage: payload.ioc_type_distribution.percentages[i],
+  })),
+  query_trend: trendRows(payload.query_trend),
+  cve_trend: payload.cve_trend ? trendRows(payload.cve_trend) : undefined,
+  cvss_distribution: payload.cvss_distribution
+    ? payload.cvss_distribution.ranges.map((score_range, i) => ({
+        score_range,
+        count: payload.cvss_distribution!.counts[i],
+      }))
+    : undefined,
+});